@@ -0,0 +1,175 @@
+# analytics.py  – weekly competitor price-gap summary, vectorised with NumPy
+#
+# Loads the last WINDOW_WEEKS of observations as flat arrays (product_id,
+# day, price_cents), reduces them to one price per product per week, then
+# computes per article – in sorted-group passes, no Python loop over rows –
+#   min / median / max competitor price, % gap to our own price,
+#   week-over-week change and volatility of the competitor prices,
+# and upserts the latest week into the `price_summary` table.
+#
+#   python analytics.py [--db prices.sqlite] [--own-prices ours.csv]
+
+import argparse
+import csv
+import sqlite3
+import time
+
+import numpy as np
+
+import price_tracker
+from price_tracker import from_day
+
+WINDOW_WEEKS = 8          # weeks of history behind WoW change and volatility
+
+SUMMARY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS price_summary (
+        art_no         TEXT    NOT NULL,
+        week           TEXT    NOT NULL,     -- Monday of the ISO week
+        competitors    INTEGER NOT NULL,
+        min_price      REAL,
+        median_price   REAL,
+        max_price      REAL,
+        own_price      REAL,
+        gap_min_pct    REAL,                 -- own vs cheapest competitor
+        gap_median_pct REAL,                 -- own vs median competitor
+        wow_pct        REAL,                 -- mean competitor change vs last week
+        volatility_pct REAL,                 -- stdev of weekly changes in window
+        PRIMARY KEY (art_no, week)
+    )
+"""
+
+def read_own_prices(path) -> dict:
+    """art_no → our price, from a CSV with art_no + price/own_price columns."""
+    own = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for raw in csv.DictReader(f):
+            row   = {k.strip().lower(): (v or "").strip() for k, v in raw.items()}
+            art   = row.get("art_no") or row.get("article")
+            price = row.get("own_price") or row.get("our_price") or row.get("price")
+            try:
+                own[art] = float(price.replace("$", "").replace(",", ""))
+            except (AttributeError, ValueError):
+                continue
+    return own
+
+def _week(day):
+    """Day number of the Monday starting `day`'s week (1970-01-05 was one)."""
+    return day - (day + 3) % 7
+
+def _group_starts(*keys):
+    """Start index of each run of equal keys in already-sorted arrays."""
+    change = np.zeros(len(keys[0]), dtype=bool)
+    change[0] = True
+    for k in keys:
+        change[1:] |= k[1:] != k[:-1]
+    return np.flatnonzero(change)
+
+def load_snapshot(conn, weeks=WINDOW_WEEKS):
+    """
+    (art_nos, art_of_product, obs) for the last `weeks` weeks, where obs is
+    an int64 array of (product_id, day, price_cents) rows.
+    """
+    last = conn.execute("SELECT max(day) FROM observations").fetchone()[0]
+    if last is None:
+        return [], np.zeros(0, np.int64), np.zeros((0, 3), np.int64)
+    since = _week(last) - 7 * (weeks - 1)
+    obs = np.array(conn.execute(
+        "SELECT product_id, day, price_cents FROM observations "
+        "WHERE day >= ? AND price_cents IS NOT NULL", (since,)).fetchall(),
+        dtype=np.int64).reshape(-1, 3)
+    products = conn.execute("SELECT product_id, art_no FROM products").fetchall()
+    art_nos  = sorted({art for _, art in products})
+    index    = {art: i for i, art in enumerate(art_nos)}
+    art_of   = np.full(max((pid for pid, _ in products), default=0) + 1, -1, np.int64)
+    for pid, art in products:
+        art_of[pid] = index[art]
+    return art_nos, art_of, obs
+
+def summarise(art_nos, art_of, obs, own=None) -> list:
+    """
+    Summary rows (see SUMMARY_SCHEMA column order) for the latest week in
+    `obs`, one per article that has a competitor price that week.
+    """
+    if not len(obs):
+        return []
+    own = own or {}
+    pid, day, cents = obs[:, 0], obs[:, 1], obs[:, 2]
+    week = _week(day)
+
+    # 1) one price per (product, week): the last observation in that week
+    order = np.lexsort((day, week, pid))
+    pid, week, price = pid[order], week[order], cents[order] / 100.0
+    last = np.r_[_group_starts(pid, week)[1:] - 1, len(pid) - 1]
+    pid, week, price = pid[last], week[last], price[last]
+
+    # 2) week-over-week change per product (rows are sorted by pid, week)
+    ret = np.full(len(pid), np.nan)
+    consecutive = (pid[1:] == pid[:-1]) & (week[1:] - week[:-1] == 7)
+    ret[1:][consecutive] = price[1:][consecutive] / price[:-1][consecutive] - 1.0
+    art = art_of[pid]
+
+    # 3) volatility: stdev of every product return per article, whole window
+    ok   = ~np.isnan(ret)
+    n_r  = np.bincount(art[ok], minlength=len(art_nos))
+    s_r  = np.bincount(art[ok], weights=ret[ok], minlength=len(art_nos))
+    s_r2 = np.bincount(art[ok], weights=ret[ok] ** 2, minlength=len(art_nos))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol = np.sqrt(np.maximum(s_r2 - s_r ** 2 / n_r, 0) / (n_r - 1))
+    vol[n_r < 2] = np.nan
+
+    # 4) latest week only: min / median / max and mean return per article
+    latest = week == week.max()
+    art, price, ret = art[latest], price[latest], ret[latest]
+    order  = np.lexsort((price, art))
+    art, price, ret = art[order], price[order], ret[order]
+    starts = _group_starts(art)
+    counts = np.diff(np.r_[starts, len(art)])
+    lo     = price[starts]
+    hi     = price[starts + counts - 1]
+    median = (price[starts + (counts - 1) // 2] + price[starts + counts // 2]) / 2
+    ok     = ~np.isnan(ret)
+    n_w    = np.add.reduceat(ok.astype(np.int64), starts)
+    s_w    = np.add.reduceat(np.where(ok, ret, 0.0), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        wow = np.where(n_w > 0, s_w / n_w, np.nan)
+
+    arts     = art[starts]
+    ours     = np.array([own.get(art_nos[a], np.nan) for a in arts], dtype=float)
+    gap_min  = (ours / lo - 1.0) * 100
+    gap_med  = (ours / median - 1.0) * 100
+    week_iso = from_day(int(week.max()))
+
+    def num(x):
+        return None if np.isnan(x) else round(float(x), 4)
+
+    return [
+        (art_nos[a], week_iso, int(n), float(l), float(m), float(h),
+         num(o), num(gm), num(gd), num(w * 100), num(vol[a] * 100))
+        for a, n, l, m, h, o, gm, gd, w in
+        zip(arts, counts, lo, median, hi, ours, gap_min, gap_med, wow)
+    ]
+
+def run(path=None, own_prices=None, weeks=WINDOW_WEEKS) -> int:
+    """Compute and store this week's summary; returns the rows written."""
+    t0   = time.perf_counter()
+    own  = read_own_prices(own_prices) if own_prices else {}
+    conn = sqlite3.connect(path or price_tracker.DB, timeout=30)
+    try:
+        rows = summarise(*load_snapshot(conn, weeks), own=own)
+        with conn:
+            conn.execute(SUMMARY_SCHEMA)
+            conn.executemany(
+                "INSERT OR REPLACE INTO price_summary VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+    finally:
+        conn.close()
+    print(f"[ANALYTICS] {len(rows)} articles summarised "
+          f"in {time.perf_counter() - t0:.3f}s")
+    return len(rows)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Weekly competitor price-gap summary")
+    ap.add_argument("--db", default=None, help=f"default: {price_tracker.DB}")
+    ap.add_argument("--own-prices", help="CSV of art_no,price for our articles")
+    ap.add_argument("--weeks", type=int, default=WINDOW_WEEKS)
+    args = ap.parse_args()
+    run(args.db, args.own_prices, args.weeks)
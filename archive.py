@@ -0,0 +1,319 @@
+# archive.py  – content-addressed archive of the pages prices came from
+#
+# Every page pipeline.parse() sees is stored once under the SHA-256 of its
+# UTF-8 body:  archive/ab/ab12…ef.zst  (zstd when `zstandard` is installed,
+# else .gz).  A page that comes back unchanged next week hashes the same
+# and only has its mtime touched, so a stable PDP costs one blob however
+# many weeks it is scraped.  The observation a fetch writes carries the
+# hash of the page that produced its price (`page_hash` in prices.sqlite),
+# so any price can be traced back to, and re-parsed from, its page.
+#
+# Blobs are single files, so readers stream one page without touching the
+# rest (`open(digest)`), or map the compressed file themselves (`path()`).
+# archive/index.sqlite notes, for each URL's latest fetch, which
+# parse_<retailer> function got each page and what came out, so reparse.py
+# can re-run the parsers over the archived pages without the network.
+#
+# prune() keeps storage bounded: blobs referenced by the last RETAIN_DAYS
+# of observations or by a product's latest one stay, anything else older
+# than that goes, then the oldest blobs go until the archive fits in
+# MAX_BYTES.  Observations whose blob was dropped get page_hash NULL, and
+# its index rows go.
+#
+#   python archive.py                 blob count / size
+#   python archive.py --prune         apply the retention policy now
+#   python archive.py --cat HASH      stream one page to stdout
+
+import argparse
+import builtins
+import contextvars
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pipeline
+import price_tracker
+
+try:
+    import zstandard
+except ImportError:                   # optional – gzip is fine, just bigger
+    zstandard = None
+
+ARCHIVE_DIR = "archive"
+INDEX_DB    = "index.sqlite"          # inside ARCHIVE_DIR
+RETAIN_DAYS = 26 * 7                  # half a year of weekly runs
+MAX_BYTES   = 2 * 1024 ** 3           # compressed blobs kept at most
+
+EXTS = (".zst", ".gz")
+
+INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pages (
+        url       TEXT NOT NULL,          -- URL the parse function was given
+        seq       INTEGER NOT NULL,       -- page order within one fetch
+        retailer  TEXT NOT NULL,          -- extractors.<retailer>
+        parser    TEXT NOT NULL,          -- function in that module
+        keywords  TEXT NOT NULL,          -- json, functools.partial keywords
+        page_hash TEXT NOT NULL,          -- blob holding the page
+        fetched   REAL NOT NULL,
+        price     REAL,                   -- what the live parse returned …
+        currency  TEXT,
+        sku       TEXT,
+        error     TEXT,                   -- … or why it failed
+        PRIMARY KEY (url, seq)
+    );
+    CREATE INDEX IF NOT EXISTS pages_retailer ON pages (retailer)
+"""
+
+def outcome(result) -> tuple:
+    """Parser result → (price, currency, sku); BestBuy's product dict too."""
+    if isinstance(result, dict):
+        return result.get("price"), result.get("currency", "USD"), result.get("sku")
+    if len(result) == 3:
+        return tuple(result)
+    price, cur = result
+    return price, cur, ""
+
+class Fetch:
+    """The page behind one product fetch's price (see fetch())."""
+
+    def __init__(self):
+        self.page_hash = None
+
+_FETCH = contextvars.ContextVar("archive_fetch", default=None)
+
+@contextmanager
+def fetch():
+    """
+    Open a Fetch: while the block runs, the hash of the page that parses to
+    a price is recorded on it (run_weekly.scrape() saves it with the row).
+    """
+    rec   = Fetch()
+    token = _FETCH.set(rec)
+    try:
+        yield rec
+    finally:
+        _FETCH.reset(token)
+
+class Archive:
+    """Directory of compressed blobs named by content hash; thread-safe."""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root  = root
+        self.ext   = ".zst" if zstandard is not None else ".gz"
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, INDEX_DB), timeout=30,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(INDEX_SCHEMA)
+
+    # ── write side ─────────────────────────────────────────────────────────
+    def put(self, body: bytes) -> str:
+        """Store `body` unless it already is; returns its hex digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        old    = self.path(digest)
+        if old is not None:
+            os.utime(old)                 # seen again: restart its retention clock
+            return digest
+        path = self._name(digest, self.ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with builtins.open(tmp, "wb") as f:
+            f.write(zstandard.ZstdCompressor(level=10).compress(body)
+                    if zstandard is not None else gzip.compress(body, 6, mtime=0))
+        os.replace(tmp, path)             # a racing writer stored the same bytes
+        return digest
+
+    def keep(self, url, seq, fn, html, result, error) -> None:
+        """
+        pipeline's page sink: archive page `seq` of a fetch of `url`, index
+        it with its outcome, and note it on the Fetch if it gave the price.
+        """
+        digest = self.put(html.encode("utf-8", errors="replace"))
+        rec    = _FETCH.get()
+        if rec is not None and result is not None:
+            rec.page_hash = digest
+
+        keywords = getattr(fn, "keywords", {})    # functools.partial
+        fn = getattr(fn, "func", fn)
+        price = cur = sku = None
+        if result is not None:
+            price, cur, sku = outcome(result)
+        row = (url, seq, fn.__module__.rsplit(".", 1)[-1], fn.__name__,
+               json.dumps(keywords), digest, time.time(),
+               price, cur, None if sku is None else str(sku),
+               None if error is None else str(error)[:500])
+        with self._lock, self._conn:
+            if seq == 0:                          # a new fetch replaces the old one
+                self._conn.execute("DELETE FROM pages WHERE url=?", (url,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?,?,?,?,?,?,?,?,?,?,?)", row)
+
+    # ── read side ──────────────────────────────────────────────────────────
+    def _name(self, digest, ext) -> str:
+        return os.path.join(self.root, digest[:2], digest + ext)
+
+    def path(self, digest):
+        """File holding `digest`'s compressed blob, or None."""
+        for ext in EXTS:
+            path = self._name(digest, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def open(self, digest):
+        """Binary stream of `digest`'s page, decompressed as it is read."""
+        path = self.path(digest)
+        if path is None:
+            raise KeyError(digest)
+        if path.endswith(".gz"):
+            return gzip.open(path, "rb")
+        if zstandard is None:
+            raise RuntimeError(f"{path} needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(builtins.open(path, "rb"),
+                                                          closefd=True)
+
+    def text(self, digest) -> str:
+        with self.open(digest) as f:
+            return f.read().decode("utf-8")
+
+    def fetches(self, retailers=()) -> list:
+        """
+        [(url, retailer, fetched, live (price, cur, sku) or None, live error)]
+        for every indexed fetch, optionally only of some retailers.
+        """
+        sql = "SELECT url, retailer, fetched, price, currency, sku, error FROM pages"
+        if retailers:
+            sql += f" WHERE retailer IN ({','.join('?' * len(retailers))})"
+        sql += " ORDER BY retailer, url, seq"
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(retailers)).fetchall()
+        out = {}
+        for url, retailer, fetched, price, cur, sku, error in rows:
+            if url not in out:
+                out[url] = [url, retailer, fetched, None, None]
+            # a fetch's outcome is its successful page, else its last failure
+            if price is not None:
+                out[url][3:] = [(price, cur, sku), None]
+            elif out[url][3] is None:
+                out[url][4] = error
+        return [tuple(f) for f in out.values()]
+
+    def pages(self, url) -> list:
+        """
+        [(retailer, parser, partial keywords, page hash)] of `url`'s latest
+        fetch, in fetch order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT retailer, parser, keywords, page_hash FROM pages "
+                "WHERE url=? ORDER BY seq", (url,)).fetchall()
+        return [(r, p, json.loads(k), h) for r, p, k, h in rows]
+
+    def blobs(self):
+        """Yield (digest, path, compressed size, mtime) for every blob."""
+        for entry in os.scandir(self.root):
+            if not entry.is_dir():
+                continue
+            for blob in os.scandir(entry.path):
+                name, ext = os.path.splitext(blob.name)
+                if ext in EXTS:
+                    st = blob.stat()
+                    yield name, blob.path, st.st_size, st.st_mtime
+
+    # ── retention ──────────────────────────────────────────────────────────
+    def prune(self, db=None, days=RETAIN_DAYS, max_bytes=MAX_BYTES) -> int:
+        """Apply the retention policy (module comment); returns blobs dropped."""
+        conn = sqlite3.connect(db or price_tracker.DB, timeout=30)
+        try:
+            cutoff = price_tracker.to_day(time.strftime("%Y-%m-%d")) - days
+            wanted = {h for (h,) in conn.execute("""
+                SELECT page_hash FROM observations
+                 WHERE day >= ? AND page_hash IS NOT NULL
+                UNION
+                SELECT o.page_hash FROM current_prices c
+                  JOIN observations o USING (product_id, day)
+                 WHERE o.page_hash IS NOT NULL""", (cutoff,))}
+
+            too_old = time.time() - days * 86400
+            doomed, kept, total = [], [], 0
+            for digest, path, size, mtime in self.blobs():
+                if digest not in wanted and mtime < too_old:
+                    doomed.append((digest, path))
+                else:
+                    kept.append((mtime, digest, path, size))
+                    total += size
+            # still over budget: oldest first, referenced or not
+            for mtime, digest, path, size in sorted(kept):
+                if total <= max_bytes:
+                    break
+                doomed.append((digest, path))
+                total -= size
+
+            for _, path in doomed:
+                os.remove(path)
+            with conn:
+                conn.execute("CREATE TEMP TABLE dropped (page_hash TEXT PRIMARY KEY)")
+                conn.executemany("INSERT OR IGNORE INTO dropped VALUES (?)",
+                                 [(d,) for d, _ in doomed])
+                conn.execute("UPDATE observations SET page_hash = NULL "
+                             "WHERE page_hash IN (SELECT page_hash FROM dropped)")
+        finally:
+            conn.close()
+        with self._lock, self._conn:      # their fetches can't be re-parsed any more
+            self._conn.executemany("DELETE FROM pages WHERE page_hash=?",
+                                   [(d,) for d, _ in doomed])
+        return len(doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_ARCHIVE = None
+
+def get_archive():
+    """The shared Archive, or None while archiving is disabled."""
+    return _ARCHIVE
+
+def enable(root=ARCHIVE_DIR) -> Archive:
+    """Archive every page pipeline.parse() sees (idempotent)."""
+    global _ARCHIVE
+    if _ARCHIVE is None:
+        _ARCHIVE = Archive(root)
+        pipeline.add_page_sink(_ARCHIVE)
+    return _ARCHIVE
+
+def disable() -> None:
+    global _ARCHIVE
+    archive, _ARCHIVE = _ARCHIVE, None
+    if archive is not None:
+        pipeline.remove_page_sink(archive)
+        archive.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Content-addressed page archive")
+    ap.add_argument("--root", default=ARCHIVE_DIR)
+    ap.add_argument("--db", default=None, help=f"default: {price_tracker.DB}")
+    ap.add_argument("--prune", action="store_true", help="apply the retention policy")
+    ap.add_argument("--days", type=int, default=RETAIN_DAYS)
+    ap.add_argument("--max-mb", type=int, default=MAX_BYTES // 2 ** 20)
+    ap.add_argument("--cat", metavar="HASH", help="write one page to stdout")
+    args = ap.parse_args()
+
+    store = Archive(args.root)
+    if args.cat:
+        with store.open(args.cat) as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
+        sys.exit()
+    if args.prune:
+        price_tracker.init_db(args.db)            # adds page_hash to older databases
+        print(f"[ARCHIVE] {store.prune(args.db, args.days, args.max_mb * 2 ** 20)} blobs dropped")
+    sizes = [size for *_, size, _ in store.blobs()]
+    print(f"[ARCHIVE] {len(sizes)} blobs, {sum(sizes) / 2 ** 20:.1f} MiB in {args.root}/")
@@ -0,0 +1,363 @@
+# bench.py  – small offline benchmarks (results echoed to bench_output.txt)
+#
+#   python bench.py imports            # cold-start cost of the extractor registry
+#   python bench.py smoke              # every module imports cleanly (exit 1 if not)
+#   python bench.py json               # field lookup vs full decode of a state blob
+#   python bench.py mattressfirm [--fixture page.html …]   # variant extraction
+#   python bench.py pipeline [--workers N]                 # parse hand-off vs blocking
+#   python bench.py replay [--corpus replay.sqlite]        # every extractor, offline
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+OUTPUT = "bench_output.txt"
+
+# domains looked up in each import scenario (empty = registry only)
+IMPORT_SCENARIOS = {
+    "registry only": (),
+    "http-only (amazon/target/walmart)": ("amazon.com", "target.com", "walmart.com"),
+    "all retailers": None,                                   # every domain
+}
+
+_IMPORT_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import extractors
+domains = {domains!r}
+for dom in (extractors.DOMAIN_EXTRACTOR if domains is None else domains):
+    extractors.DOMAIN_EXTRACTOR[dom]
+print(time.perf_counter() - t0)
+"""
+
+# each module is imported first thing in a fresh interpreter: an import
+# cycle only shows up when the module that closes it is the entry point
+_SMOKE_PROBE = """
+import importlib
+importlib.import_module({module!r})
+import extractors
+for dom in extractors.DOMAIN_EXTRACTOR:
+    extractors.DOMAIN_EXTRACTOR[dom]
+"""
+
+def _report(lines) -> None:
+    stamp = datetime.datetime.now().isoformat(timespec="seconds")
+    with open(OUTPUT, "a", encoding="utf-8") as f:
+        f.write(f"# {stamp}\n")
+        for line in lines:
+            print(line)
+            f.write(line + "\n")
+
+def bench_imports(repeat=5) -> None:
+    """Time `import extractors` + resolving each scenario in a fresh interpreter."""
+    lines = [f"import time, {repeat} cold interpreters per scenario"]
+    for name, domains in IMPORT_SCENARIOS.items():
+        code = _IMPORT_PROBE.format(domains=domains)
+        times = []
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, "-c", code],
+                                  capture_output=True, text=True)
+            if proc.returncode:
+                err = proc.stderr.strip().splitlines()[-1]
+                lines.append(f"  {name:<36} FAILED: {err}")
+                break
+            times.append(float(proc.stdout))
+        else:
+            lines.append(f"  {name:<36} median {statistics.median(times)*1000:8.1f} ms"
+                         f"   min {min(times)*1000:8.1f} ms")
+    _report(lines)
+
+def smoke_imports() -> bool:
+    """
+    Import every top-level module (run_weekly, helpers, …), then resolve
+    every DOMAIN_EXTRACTOR entry, each in a fresh interpreter.
+    """
+    here    = os.path.dirname(os.path.abspath(__file__))
+    modules = sorted(os.path.splitext(os.path.basename(p))[0]
+                     for p in glob.glob(os.path.join(here, "*.py")))
+    lines, failed = [f"import smoke, {len(modules)} entry points"], 0
+    for module in modules:
+        proc = subprocess.run([sys.executable, "-c", _SMOKE_PROBE.format(module=module)],
+                              capture_output=True, text=True, cwd=here)
+        if proc.returncode:
+            failed += 1
+            lines.append(f"  {module:<16} FAILED: {proc.stderr.strip().splitlines()[-1]}")
+        else:
+            lines.append(f"  {module:<16} ok")
+    lines.append(f"  {failed} failed")
+    _report(lines)
+    return failed == 0
+
+def _state_blob(reviews=2000) -> str:
+    """Synthetic __WF_DATA__-shaped blob: a big review list, then the price."""
+    data = {"reviews": [{"id": i, "text": "lorem ipsum " * 20,
+                         "rating": i % 5} for i in range(reviews)],
+            "product": {"price": {"value": 129.99, "currency": "USD"}}}
+    return json.dumps({"props": {"pageProps": {"initialData": {"data": data}}}})
+
+def _measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+def bench_json(repeat=20, reviews=2000) -> None:
+    """jsonscan.path vs stdlib / orjson full decode on one synthetic blob."""
+    import jsonscan
+    blob  = _state_blob(reviews)
+    keys  = ("props", "pageProps", "initialData", "data", "product", "price")
+    cases = {
+        "jsonscan.path":     lambda: jsonscan.path(blob, *keys),
+        "jsonscan.member":   lambda: jsonscan.member(blob, 0, *keys),
+        "json.loads (full)": lambda: json.loads(blob),
+    }
+    if jsonscan.orjson is not None:
+        cases["orjson.loads (full)"] = lambda: jsonscan.orjson.loads(blob)
+    lines = [f"state blob {len(blob)/1024:.0f} KiB, median of {repeat}"]
+    for name, fn in cases.items():
+        median, peak = _measure(fn, repeat)
+        lines.append(f"  {name:<22} {median*1000:8.2f} ms   peak {peak/1024:8.0f} KiB")
+    _report(lines)
+
+def _mattressfirm_page(filler_kb=600) -> str:
+    """Synthetic PDP: lots of markup, then a ~250 KiB size/variant array."""
+    sizes = [{"id": s, "title": s, "size": s, "variantId": 5637329080 + i,
+              "price": 399.0 + 100 * i,
+              "variants": [{"sku": f"{s}-{j}", "comfort": ["plush", "firm"][j % 2],
+                            "images": [f"/img/{s}/{j}/{k}.jpg" for k in range(8)],
+                            "available": True} for j in range(60)]}
+             for i, s in enumerate(("Twin", "Twin XL", "Full", "Queen", "King", "California King"))]
+    filler = '<div class="tile"><span>$19.99</span> lorem ipsum</div>\n' * (filler_kb * 20)
+    return (f"<html><body>{filler}<script>window.__STATE__ = "
+            f'{{"product":{{"sizes":{json.dumps(sizes, separators=(",", ":"))}}}}};'
+            f"</script></body></html>")
+
+def _legacy_mattressfirm_array(html):
+    """The old char-by-char bracket scan + shrinking json.loads retries."""
+    import re
+    m = re.search(r'(\[{"id":"[^"]+","title":"[^"]+","size":"[^"]+".*?"variants":)', html, re.DOTALL)
+    if not m:
+        return None
+    start, count, end = m.start(1), 0, None
+    for i in range(start, len(html)):
+        if html[i] == "[":
+            count += 1
+        elif html[i] == "]":
+            count -= 1
+            if count == 0:
+                end = i + 1
+                break
+    if end is None:
+        return None
+    array_json = html[start:end]
+    for end_pos in range(len(array_json), 0, -1):
+        try:
+            partial = array_json[:end_pos]
+            if partial.count("[") == partial.count("]"):
+                variants = json.loads(partial)
+                break
+        except json.JSONDecodeError:
+            continue
+    else:
+        return None
+    return next((v for v in variants if v.get("size") == "Queen"), None)
+
+def bench_mattressfirm(fixtures=(), repeat=20) -> None:
+    """Old vs new Mattress Firm variant extraction on fixtures (or a synthetic page)."""
+    from extractors import mattressfirm
+    pages = {}
+    for path in fixtures:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages[path] = f.read()
+    if not pages:
+        pages["synthetic"] = _mattressfirm_page()
+    lines = [f"mattressfirm variant extraction, median of {repeat}"]
+    for name, html in pages.items():
+        lines.append(f"  {name} ({len(html)/1024:.0f} KiB)")
+        cases = {
+            "legacy bracket scan": lambda: _legacy_mattressfirm_array(html),
+            "price_from_html":     lambda: mattressfirm.price_from_html(html),
+        }
+        for label, fn in cases.items():
+            try:
+                median, peak = _measure(fn, repeat)
+            except ValueError as e:
+                lines.append(f"    {label:<22} FAILED: {e}")
+                continue
+            lines.append(f"    {label:<22} {median*1000:8.2f} ms   peak {peak/1024:8.0f} KiB")
+    _report(lines)
+
+def bench_pipeline(products=24, domains=3, network_ms=80, workers=None) -> None:
+    """
+    Products/s of `domains` I/O threads that each sleep `network_ms` (the
+    download) and parse a synthetic Mattress Firm page: inline, in the
+    parse pool waiting for the result, and in the pool handed off.
+    """
+    import concurrent.futures
+    import functools
+    import threading
+    import pipeline
+    from extractors import mattressfirm
+    from scheduler import DomainScheduler
+
+    html = _mattressfirm_page()
+    url  = "https://www.mattressfirm.com/bench.html?size=Queen"
+
+    def run(pool, defer):
+        if pool:
+            pipeline.enable_parse_pool(workers or pipeline.PARSE_WORKERS)
+        futures, lock = [], threading.Lock()
+        sched = DomainScheduler()
+
+        def job(hold):
+            time.sleep(network_ms / 1000)
+            with pipeline.deferred(hold):
+                result = pipeline.handoff(mattressfirm.parse_mattressfirm, html, url)
+            if isinstance(result, concurrent.futures.Future):
+                with lock:
+                    futures.append(result)
+
+        for d in range(domains):
+            for _ in range(products // domains):
+                sched.submit(f"d{d}", job,
+                             functools.partial(sched.hold, f"d{d}") if defer else None)
+        t0 = time.perf_counter()
+        sched.run()
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - t0
+        pipeline.disable_parse_pool()
+        return elapsed
+
+    run(True, True)                           # spawn + import cost outside the timings
+    lines = [f"pipeline: {products} products, {domains} domain threads, "
+             f"{network_ms} ms network each, {workers or pipeline.PARSE_WORKERS} "
+             f"parse workers, {os.cpu_count()} CPUs"]
+    for label, pool, defer in (("inline", False, False),
+                               ("pool, blocking parse()", True, False),
+                               ("pool, handoff()", True, True)):
+        elapsed = run(pool, defer)
+        lines.append(f"  {label:<24} {elapsed:6.2f} s   {products / elapsed:6.1f} products/s")
+    _report(lines)
+
+def _percentile(sorted_xs, q):
+    return sorted_xs[min(len(sorted_xs) - 1, int(q * len(sorted_xs)))]
+
+def _same(got, expected) -> bool:
+    price, cur, sku = got
+    return (round(float(price), 2) == round(expected[0], 2)
+            and cur == expected[1] and str(sku or "") == (expected[2] or ""))
+
+def bench_replay(corpus=None, repeat=3, retailers=()) -> None:
+    """
+    Run every captured product through its DOMAIN_EXTRACTOR offline: pages/s,
+    p50/p99 latency, peak allocation per page, and any result that no
+    longer matches what the extractor returned when the page was captured.
+    """
+    import replay
+    from extractors import DOMAIN_EXTRACTOR, retailer_module
+
+    store = replay.replay(corpus or replay.CORPUS_DB)
+    try:
+        captured    = store.fetches()
+        by_retailer = defaultdict(list)
+        for domain, url, *expected in captured:
+            retailer = DOMAIN_EXTRACTOR.module_for(domain)
+            if not retailers or retailer in retailers:
+                by_retailer[retailer].append((domain, url, expected))
+        if "bestbuy" in by_retailer:           # time the page, not its result cache
+            retailer_module("bestbuy")._BESTBUY.cache_ttl = 0
+
+        lines = [f"replay of {len(captured)} captured products, {repeat} runs each",
+                 f"  {'retailer':<16}{'pages':>6}{'ok':>5}{'changed':>8}{'failed':>7}"
+                 f"{'pages/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}"]
+        for retailer, items in sorted(by_retailer.items()):
+            times, peak, ok, changed, failed, notes = [], 0, 0, 0, 0, []
+            for domain, url, expected in items:
+                fn = DOMAIN_EXTRACTOR[domain]     # import outside the timings
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    try:
+                        got = replay.normalise(fn(url))
+                    except Exception as e:
+                        got = e
+                    times.append(time.perf_counter() - t0)
+                tracemalloc.start()
+                try:
+                    fn(url)
+                except Exception:
+                    pass
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+                if isinstance(got, Exception):
+                    failed += 1
+                    if expected[3] is None:       # worked when captured
+                        notes.append(f"    FAILED  {url}: {got}")
+                elif expected[3] is None and not _same(got, expected):
+                    changed += 1
+                    notes.append(f"    CHANGED {url}: {tuple(expected[:3])} → {got}")
+                else:
+                    ok += 1
+            times.sort()
+            lines.append(
+                f"  {retailer:<16}{len(items):>6}{ok:>5}{changed:>8}{failed:>7}"
+                f"{len(times) / sum(times):>9.1f}"
+                f"{_percentile(times, 0.50)*1000:>9.2f}{_percentile(times, 0.99)*1000:>9.2f}"
+                f"{peak/1024:>10.0f}")
+            lines.extend(notes)
+    finally:
+        replay.disable()
+    _report(lines)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Offline micro-benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("imports", help="extractor import / cold-start time")
+    p.add_argument("--repeat", type=int, default=5)
+    sub.add_parser("smoke", help="import every module + extractor in a fresh interpreter")
+    p = sub.add_parser("json", help="embedded-state field lookup vs full decode")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--reviews", type=int, default=2000)
+    p = sub.add_parser("mattressfirm", help="Mattress Firm variant-array extraction")
+    p.add_argument("--fixture", action="append", default=[],
+                   help="saved PDP HTML (repeatable); synthetic page if omitted")
+    p.add_argument("--repeat", type=int, default=20)
+    p = sub.add_parser("pipeline", help="parse hand-off vs blocking on the I/O threads")
+    p.add_argument("--products", type=int, default=24)
+    p.add_argument("--domains", type=int, default=3)
+    p.add_argument("--network-ms", type=int, default=80)
+    p.add_argument("--workers", type=int, default=None)
+    p = sub.add_parser("replay", help="every extractor over a captured corpus (replay.py)")
+    p.add_argument("--corpus", default=None, help="default: replay.sqlite")
+    p.add_argument("--retailer", action="append", default=[],
+                   help="only these extractor modules (repeatable)")
+    p.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.cmd == "imports":
+        bench_imports(args.repeat)
+    elif args.cmd == "smoke":
+        sys.exit(0 if smoke_imports() else 1)
+    elif args.cmd == "json":
+        bench_json(args.repeat, args.reviews)
+    elif args.cmd == "mattressfirm":
+        bench_mattressfirm(args.fixture, args.repeat)
+    elif args.cmd == "pipeline":
+        bench_pipeline(args.products, args.domains, args.network_ms, args.workers)
+    elif args.cmd == "replay":
+        bench_replay(args.corpus, args.repeat, args.retailer)
@@ -0,0 +1,237 @@
+# browser_pool.py  – pre-warmed undetected-Chrome instances shared by the
+#                    Selenium extractors (Home Depot, Ashley, Best Buy)
+
+import queue
+import threading
+
+import instrument                  # time spent waiting for / starting Chrome
+
+POOL_SIZE             = 3    # one per Selenium retailer → they never queue
+MAX_PAGES_PER_BROWSER = 40   # recycle Chrome after this many leased pages
+
+def _launch_chrome(headless=True):
+    """Start one stealth Chrome (undetected_chromedriver) instance."""
+    import undetected_chromedriver as uc
+
+    opts = uc.ChromeOptions()
+    opts.headless = headless
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--window-size=1920,1080")
+
+    driver = uc.Chrome(options=opts)
+    driver.execute_script(
+        "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    )
+    return driver
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class _Browser:
+    """A running Chrome plus its home tab and page counter."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.home   = driver.current_window_handle
+        self.pages  = 0
+
+class Lease:
+    """
+    Exclusive use of one pooled Chrome, in a fresh tab.
+
+    `driver` is ready to `.get()`; call release() when done (or use the
+    pool's `lease()` context manager).  release(crashed=True) discards the
+    instance instead of returning it.
+    """
+
+    def __init__(self, pool, browser):
+        self._pool    = pool
+        self._browser = browser
+        self.driver   = browser.driver
+        self.driver.switch_to.new_window("tab")
+
+    def release(self, crashed=False) -> None:
+        if self._browser is None:
+            return
+        browser, self._browser = self._browser, None
+        self._pool._give_back(browser, crashed)
+
+class BrowserPool:
+    """
+    N warm Chrome instances handed out one lease (tab) at a time.
+
+    Each lease opens a new tab and closes it on release, so cookies and the
+    solved bot challenges survive while page state does not.  An instance
+    is quit and replaced after `max_pages` leases or when a lease reports
+    a crash; replacements are launched lazily on the next acquire().
+    Launches in progress (warm() or acquire()) count against `size`, so
+    an acquire() racing the warm-up waits for a warm browser instead of
+    starting an extra one.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER,
+                 headless=True, launch=_launch_chrome):
+        self.size      = size
+        self.max_pages = max_pages
+        self.headless  = headless
+        self._launch   = launch
+        self._idle     = queue.LifoQueue()       # warm browsers first
+        self._slots    = threading.BoundedSemaphore(size)
+        self._all      = set()
+        self._launching = 0                      # _start() calls in progress
+        self._lock     = threading.Lock()
+        self._closed   = False
+
+    def _start(self) -> _Browser:
+        """Launch one browser; the caller has already counted it in _launching."""
+        try:
+            browser = _Browser(self._launch(headless=self.headless))
+        except BaseException:
+            with self._lock:
+                self._launching -= 1
+            raise
+        with self._lock:
+            self._launching -= 1
+            self._all.add(browser)
+        return browser
+
+    def _retire(self, browser: _Browser) -> None:
+        with self._lock:
+            self._all.discard(browser)
+        _quit(browser.driver)
+
+    def warm(self, n=None) -> None:
+        """Launch up to `n` (default: pool size) instances in parallel."""
+        n = self.size if n is None else min(n, self.size)
+        with self._lock:
+            n = max(0, n - len(self._all) - self._launching)
+            self._launching += n
+        launchers = [threading.Thread(target=lambda: self._idle.put(self._start()))
+                     for _ in range(n)]
+        for t in launchers:
+            t.start()
+        for t in launchers:
+            t.join()
+
+    def acquire(self) -> Lease:
+        """Block until a browser is free and open a new tab on it."""
+        if self._closed:
+            raise RuntimeError("browser pool is shut down")
+        with instrument.phase("browser"):
+            return self._acquire()
+
+    def _take(self) -> _Browser:
+        """An idle browser, else a new one if the pool has room, else wait."""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                room = len(self._all) + self._launching < self.size
+                if room:
+                    self._launching += 1
+            if room:
+                return self._start()
+            try:                                 # a warm-up launch or a release
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue                         # a launch failed: re-check room
+
+    def _acquire(self) -> Lease:
+        self._slots.acquire()
+        try:
+            browser = self._take()
+            try:
+                return Lease(self, browser)
+            except Exception:                    # died while idle → replace once
+                self._retire(browser)
+                return Lease(self, self._take())
+        except Exception:
+            self._slots.release()
+            raise
+
+    def lease(self):
+        """Context-manager form of acquire(); a WebDriver error retires Chrome."""
+        return _LeaseContext(self)
+
+    def _give_back(self, browser: _Browser, crashed: bool) -> None:
+        try:
+            browser.pages += 1
+            if not crashed:
+                try:
+                    browser.driver.close()                   # the leased tab
+                    browser.driver.switch_to.window(browser.home)
+                except Exception:
+                    crashed = True
+            if crashed or self._closed or browser.pages >= self.max_pages:
+                self._retire(browser)
+            else:
+                self._idle.put(browser)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Quit every instance; leased ones are quit as they come back."""
+        self._closed = True
+        with self._lock:
+            browsers = list(self._all)
+            self._all.clear()
+        for browser in browsers:
+            _quit(browser.driver)
+
+class _LeaseContext:
+    def __init__(self, pool):
+        self._pool  = pool
+        self._lease = None
+
+    def __enter__(self):
+        self._lease = self._pool.acquire()
+        return self._lease.driver
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lease.release(crashed=is_crash(exc))
+        return False
+
+def is_crash(exc) -> bool:
+    """True for WebDriver failures that leave Chrome unusable (not timeouts)."""
+    if exc is None:
+        return False
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    return isinstance(exc, WebDriverException) and not isinstance(exc, TimeoutException)
+
+_POOL      = None
+_POOL_LOCK = threading.Lock()
+_LAUNCH    = _launch_chrome
+
+def set_launcher(launch=None) -> None:
+    """
+    Start pool instances with `launch(headless=…)` from now on (replay.py
+    swaps in recording / replaying drivers); None restores real Chrome.
+    The current pool, if any, is shut down.
+    """
+    global _LAUNCH
+    shutdown_pool()
+    _LAUNCH = launch or _launch_chrome
+
+def get_pool() -> BrowserPool:
+    """The process-wide pool, created on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = BrowserPool(launch=_LAUNCH)
+        return _POOL
+
+def shutdown_pool() -> None:
+    """Quit all pooled Chrome instances (end of run); no-op if never used."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,22 @@
+# canonical.py  – stable product keys so each product is fetched once per run
+
+import shortlinks
+from extractors import DOMAIN_EXTRACTOR, PRODUCT_KEYS, retailer_module
+from urlnorm import strip_tracking                      # re-exported
+
+def product_key(domain: str, url: str) -> str:
+    """
+    'walmart:5119187467', 'amazon:B01FT0XEWG', … – identical for every row
+    that points at the same product.  Retailers without a URL id regex
+    (see extractors.PRODUCT_KEYS) fall back to the de-tracked URL.
+    Short links already resolved on an earlier run key like their target;
+    this never touches the network.
+    """
+    url    = shortlinks.cached(url) or url
+    module = DOMAIN_EXTRACTOR.module_for(domain)
+    key_fn = PRODUCT_KEYS.get(module)
+    if key_fn:
+        pid = getattr(retailer_module(module), key_fn)(url)
+        if pid:
+            return f"{module}:{pid}"
+    return f"{module}:{strip_tracking(url)}"
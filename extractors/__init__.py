@@ -0,0 +1,88 @@
+#  ── extractors  (one module per retailer, imported on first use) ─────────
+#
+#  `DOMAIN_EXTRACTOR[domain]` → fetch function returning (price, cur, sku).
+#  Every fetch function downloads its page(s) and hands them to the module's
+#  pure `parse_<retailer>(html, url)` through pipeline.parse(), so archived
+#  pages can be re-parsed offline (reparse.py).  Nothing retailer-specific
+#  is imported until a domain is looked up, so an Amazon/Target/Walmart-only
+#  run never loads Selenium, undetected-chrome, webdriver-manager or backoff.
+import importlib
+from collections.abc import Mapping
+
+# retailer module → (fetch function, domains it serves)
+RETAILERS = {
+    "amazon":         ("fetch_amazon_price",         ("amazon.com", "www.amazon.com", "smile.amazon.com")),
+    "target":         ("fetch_target_price",         ("target.com", "www.target.com")),
+    "walmart":        ("fetch_walmart_price",        ("walmart.com", "www.walmart.com")),
+    "babylist":       ("fetch_babylist_price",       ("babylist.com", "www.babylist.com")),
+    "wayfair":        ("fetch_wayfair_price",        ("wayfair.com", "www.wayfair.com")),
+    "homedepot":      ("fetch_homedepot_price",      ("homedepot.com", "www.homedepot.com")),
+    "mybobs":         ("fetch_mybobs_price",         ("mybobs.com", "www.mybobs.com")),
+    "ashley":         ("fetch_ashley_price",         ("ashleyfurniture.com", "www.ashleyfurniture.com")),
+    "livingspaces":   ("fetch_livingspaces_price",   ("livingspaces.com", "www.livingspaces.com")),
+    "bestbuy":        ("fetch_bestbuy_price",        ("bestbuy.com", "www.bestbuy.com")),
+    "lowes":          ("fetch_lowes_price",          ("lowes.com", "www.lowes.com")),
+    "raymour":        ("fetch_raymour_price",        ("raymourflanigan.com", "www.raymourflanigan.com")),
+    "crateandbarrel": ("fetch_crateandbarrel_price", ("crateandbarrel.com", "www.crateandbarrel.com")),
+    "dollartree":     ("fetch_dollartree_price",     ("dollartree.com", "www.dollartree.com")),
+    "westelm":        ("fetch_westelm_price",        ("westelm.com", "www.westelm.com")),
+    "athome":         ("fetch_athome_price",         ("athome.com", "www.athome.com")),
+    "mattressfirm":   ("fetch_mattressfirm_price",   ("mattressfirm.com", "www.mattressfirm.com")),
+    "kohls":          ("fetch_kohls_price",          ("kohls.com", "www.kohls.com")),
+}
+
+# retailer module → function giving a stable product id from the URL alone
+PRODUCT_KEYS = {
+    "amazon":  "asin_from_url",
+    "target":  "tcin_from_url",
+    "walmart": "item_id_from_url",
+    "wayfair": "extract_sku",
+}
+
+def retailer_module(name: str):
+    """Import (once) and return `extractors.<name>`."""
+    return importlib.import_module(f"{__name__}.{name}")
+
+def parser(name: str):
+    """`extractors.<name>.parse_<name>` – (html, url) → (price, cur, sku), no I/O."""
+    return getattr(retailer_module(name), f"parse_{name}")
+
+class LazyExtractorRegistry(Mapping):
+    """Read-only domain → fetch-function map that imports modules lazily."""
+
+    def __init__(self, retailers):
+        self._spec = {
+            dom: (mod, fn)
+            for mod, (fn, domains) in retailers.items()
+            for dom in domains
+        }
+
+    def module_for(self, domain: str) -> str:
+        """Retailer module name serving `domain` (KeyError if unknown)."""
+        return self._spec[domain][0]
+
+    def __getitem__(self, domain):
+        mod, fn = self._spec[domain]
+        return getattr(retailer_module(mod), fn)
+
+    def __iter__(self):
+        return iter(self._spec)
+
+    def __len__(self):
+        return len(self._spec)
+
+    def __contains__(self, domain):
+        return domain in self._spec
+
+DOMAIN_EXTRACTOR = LazyExtractorRegistry(RETAILERS)
+
+# `from extractors import fetch_walmart_price` (or parse_walmart) works, lazily
+_EXPORTS = {fn: mod for mod, (fn, _) in RETAILERS.items()}
+_EXPORTS.update({f"parse_{mod}": mod for mod in RETAILERS})
+_EXPORTS["BestBuyPriceScraper"] = "bestbuy"
+
+def __getattr__(name):
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(retailer_module(mod), name)
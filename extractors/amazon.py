@@ -0,0 +1,50 @@
+# extractors/amazon.py  – Amazon PDP (hidden cart inputs, JSON-LD)
+from fastparse import Page
+from helpers import _html, _clean
+import shortlinks                     # a.co/d/… → cached /dp/<ASIN> URL
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX, first_group
+
+RX = REGEX["amazon"]
+
+def asin_from_url(url: str):
+    """Amazon ASIN (their SKU format) from a /dp/ or /gp/product/ URL."""
+    return first_group(RX["asin"], url)
+
+def fetch_amazon_price(url: str):
+    # a.co short link → final /dp/ URL (cached, so usually no redirect hop)
+    url = shortlinks.resolve(url)
+    return pipeline.handoff(parse_amazon, _html(url), url)
+
+def parse_amazon(html: str, url: str):
+    """(price, currency, ASIN) from an Amazon PDP's HTML; no I/O."""
+    page = Page(html)                       # scripts/inputs only, no DOM
+    
+    # Extract Amazon ASIN (their SKU format)
+    asin = asin_from_url(url)
+    
+    # If not in URL, try to find in the page
+    if not asin:
+        asin = page.input_value(id="ASIN")
+
+    # hidden add-to-cart inputs (fastest)
+    amount = page.input_value(name_re=RX["cart_amount"])
+    if amount:
+        price = _clean(amount)
+        cur = page.input_value(name_re=RX["cart_currency"])
+        branch("cart_inputs")
+        return price, cur, asin
+
+    # JSON-LD fallback (first block, as before)
+    lds = page.json_ld()
+    if lds and isinstance(lds[0], dict):
+        data = lds[0]
+        offers = data.get("offers", {})
+        price = offers.get("price") or offers.get("value")
+        cur = offers.get("priceCurrency", "USD")
+        if price:
+            branch("json_ld")
+            return float(price), cur, asin
+
+    raise ValueError("Amazon price not found")
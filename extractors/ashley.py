@@ -0,0 +1,117 @@
+# extractors/ashley.py  – Ashley Furniture via pooled Chrome
+import json
+from bs4 import BeautifulSoup
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+
+from browser_pool import get_pool
+from helpers import pause
+from instrument import branch, phase
+import pipeline                       # parse() may run in a worker process
+from ratelimit import limiter
+from .patterns import DOLLARS, JSON_LD, NON_NUMERIC, REGEX, SELECTORS
+
+def fetch_ashley_price(url: str):
+    """
+    Uses Selenium to render any client-side JS (including CF’s “press & hold”),
+    then extracts:
+      1) schema.org JSON-LD
+      2) microdata itemprop="price"
+      3) OpenGraph meta price tags
+      4) regex fallback over rendered HTML
+    Returns (price: float, currency: str, sku: str)
+    """
+    # 1️⃣ Canonical URL (strip query params & fragments)
+    base = url.split("?", 1)[0].split("#", 1)[0]
+
+    # 2️⃣ Lease a tab on a pooled (already running) Chrome
+    with get_pool().lease() as driver, phase("render"):
+        limiter().wait(base)
+        driver.get(base)
+
+        # 2a️⃣ detect & solve Cloudflare “press & hold” slider if present
+        try:
+            knob = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, SELECTORS["ashley"]["cf_slider"]))
+            )
+            # drag it all the way to the right
+            ActionChains(driver) \
+                .click_and_hold(knob) \
+                .pause(1.0) \
+                .move_by_offset(300, 0) \
+                .release() \
+                .perform()
+        except (TimeoutException):
+            # no slider appeared in 5s, move on
+            pass
+
+        # 2b️⃣ now wait up to 10s for a JSON-LD <script> (real PDP content)
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, JSON_LD))
+        )
+        pause(2)           # give any final JS a moment to finish
+        html = driver.page_source
+    limiter().page(base, html)
+    return pipeline.handoff(parse_ashley, html, url)
+
+def parse_ashley(html: str, url: str):
+    """Extraction steps 1-4 of fetch_ashley_price(), on rendered HTML; no I/O."""
+    base = url.split("?", 1)[0].split("#", 1)[0]
+    soup = BeautifulSoup(html, "lxml")
+
+    # helper: extract SKU from URL
+    sku_match = REGEX["ashley"]["sku"].search(base)
+    sku       = sku_match.group(1) if sku_match else ""
+
+    # 3️⃣ Try schema.org JSON-LD
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string)
+            if isinstance(data, list):
+                data = next((d for d in data if d.get("@type") == "Product"), {})
+            if data.get("@type") == "Product":
+                offers = data.get("offers") or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                price = offers.get("price")
+                cur   = offers.get("priceCurrency", "USD")
+                if price is not None:
+                    branch("json_ld")
+                    return float(price), cur, sku
+        except Exception:
+            continue
+
+    # 4️⃣ Microdata fallback
+    price_tag = soup.find(attrs={"itemprop": "price"})
+    if price_tag:
+        raw = price_tag.get("content") or price_tag.get_text()
+        try:
+            price   = float(NON_NUMERIC.sub("", raw))
+            cur_tag = soup.find(attrs={"itemprop": "priceCurrency"})
+            cur     = cur_tag.get("content") if cur_tag and cur_tag.get("content") else "USD"
+            branch("microdata")
+            return price, cur, sku
+        except:
+            pass
+
+    # 5️⃣ OpenGraph meta fallback
+    meta_amt = soup.find("meta", {"property": "product:price:amount"})
+    if meta_amt and meta_amt.get("content"):
+        price     = float(meta_amt["content"])
+        meta_cur  = soup.find("meta", {"property": "product:price:currency"})
+        cur       = meta_cur["content"] if meta_cur and meta_cur.get("content") else "USD"
+        branch("meta")
+        return price, cur, sku
+
+    # 6️⃣ Regex last resort
+    m = DOLLARS.search(html)
+    if m:
+        branch("regex")
+        return float(m.group(1).replace(",", "")), "USD", sku
+
+    raise ValueError(f"Ashley price not found for URL: {url}")
@@ -0,0 +1,78 @@
+# extractors/athome.py  – At Home
+import json
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import DOLLARS_CENTS
+
+def fetch_athome_price(url: str):
+    """
+    1) Canonicalize URL (strip ?…#…)
+    2) GET HTML via _html()
+    3) Try JSON-LD <script type="application/ld+json">
+    4) Fallback: <meta property="product:price:amount">
+    5) Fallback: microdata itemprop="price"
+    6) Last-resort regex for $xx.xx
+    Returns (price: float, currency: str, sku: str)
+    """
+    base = url.split("?",1)[0].split("#",1)[0]
+    return pipeline.handoff(parse_athome, _html(base), url)
+
+def parse_athome(html: str, url: str):
+    """The parse half of fetch_athome_price(); no I/O."""
+    # 1️⃣ Canonical URL
+    base = url.split("?",1)[0].split("#",1)[0]
+
+    # 1b) SKU = last numeric path segment
+    path = urlparse(base).path.rstrip("/")
+    sku  = path.split("/")[-1]
+
+    # 2️⃣ Parse the downloaded page
+    soup = BeautifulSoup(html, "lxml")
+
+    # 3️⃣ JSON-LD
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "{}")
+            if isinstance(data, list):
+                data = next((d for d in data if d.get("@type")=="Product"), {})
+            if data.get("@type") == "Product":
+                offers = data.get("offers") or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                raw = offers.get("price") or offers.get("priceCurrency") and offers.get("price") 
+                if raw is not None:
+                    cur = offers.get("priceCurrency", "USD")
+                    branch("json_ld")
+                    return float(raw), cur, sku
+        except:
+            continue
+
+    # 4️⃣ <meta> tags
+    m_amt = soup.find("meta", {"property":"product:price:amount"})
+    if m_amt and m_amt.get("content"):
+        price = _clean(m_amt["content"])
+        m_cur = soup.find("meta", {"property":"product:price:currency"})
+        cur   = m_cur["content"] if m_cur and m_cur.get("content") else "USD"
+        branch("meta")
+        return price, cur, sku
+
+    # 5️⃣ microdata
+    tag_p = soup.find(attrs={"itemprop":"price"})
+    if tag_p:
+        raw = tag_p.get("content") or tag_p.get_text()
+        price = _clean(raw)
+        tag_c = soup.find(attrs={"itemprop":"priceCurrency"})
+        cur   = tag_c.get("content") if tag_c and tag_c.get("content") else "USD"
+        branch("microdata")
+        return price, cur, sku
+
+    # 6️⃣ regex fallback
+    m = DOLLARS_CENTS.search(html)
+    if m:
+        branch("regex")
+        return float(m.group(1).replace(",","")), "USD", sku
+
+    raise ValueError(f"AtHome price not found for URL: {url}")
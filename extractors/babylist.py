@@ -0,0 +1,64 @@
+# extractors/babylist.py  – Babylist
+from fastparse import Page
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX, SELECTORS
+
+RX = REGEX["babylist"]
+
+def fetch_babylist_price(url: str):
+    return pipeline.handoff(parse_babylist, _html(url), url)
+
+def parse_babylist(html: str, url: str):
+    """(price, currency, sku) from a Babylist page's HTML; no I/O."""
+    page = Page(html)
+
+    # ── 1.  Collect SKU ----------------------------------------------------
+    sku = None
+
+    # a) canonical /item/<SKU>
+    canonical = page.link_href("canonical")
+    if canonical:
+        m = RX["item"].search(canonical)
+        if m:
+            sku = m.group(1)
+
+    # b) og:url
+    if not sku:
+        og_url = page.meta("og:url")
+        if og_url:
+            m = RX["item"].search(og_url)
+            if m:
+                sku = m.group(1)
+
+    # c) JSON-LD
+    if not sku:
+        for data in page.json_ld():
+            if isinstance(data, dict):
+                sku = data.get("sku") or data.get("productID")
+                if sku:
+                    break
+
+    # d) NEW — activeProductId in raw HTML (plain or entity-quoted JSON)
+    if not sku:
+        m = RX["active_product"].search(page.html)
+        if m:
+            sku = m.group(1)
+
+    # ── 2.  Collect price --------------------------------------------------
+    # the numerals box needs a DOM; only build one if the class is there
+    if page.has("PriceTag-styles__PriceTag__numerals"):
+        box = page.dom().select_one(SELECTORS["babylist"]["price_box"])
+        if box:
+            price = _clean("".join(box.stripped_strings))
+            branch("price_box")
+            return price, "USD", sku
+
+    amount = page.meta("product:price:amount")
+    if amount:
+        cur = page.meta("product:price:currency")
+        branch("meta")
+        return float(amount), (cur or "USD"), sku
+
+    raise ValueError(f"Babylist price not found for URL: {url}")
@@ -0,0 +1,468 @@
+# extractors/bestbuy.py  – Best Buy via pooled stealth Chrome
+import time
+import json
+import logging
+from typing import Tuple, Optional, Dict, Any, Union
+from browser_pool import get_pool, is_crash
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from bs4 import BeautifulSoup
+from helpers import pause
+from instrument import branch, phase
+import pipeline                       # parse() may run in a worker process
+from ratelimit import limiter
+from .patterns import NON_NUMERIC, REGEX, SELECTORS
+
+RX  = REGEX["bestbuy"]
+CSS = SELECTORS["bestbuy"]
+
+logger = logging.getLogger(__name__)
+
+class BestBuyPriceScraper:
+    """A robust scraper for fetching Best Buy product information."""
+    
+    def __init__(self, headless: bool = True, timeout: int = 15,
+                 cache_ttl: float = 600):
+        """
+        Initialize the scraper with configurable options.
+        
+        Args:
+            headless: Whether to run Chrome in headless mode
+            timeout: Maximum time to wait for page elements in seconds
+            cache_ttl: Seconds a parsed product dict is reused for the
+                same canonical URL
+        """
+        self.headless = headless
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.driver = None
+        self._lease = None
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    def _setup_driver(self) -> None:
+        """Lease a tab on a pooled, already-stealthed undetected Chrome."""
+        try:
+            self._lease = get_pool().acquire()
+            self.driver = self._lease.driver
+        except Exception as e:
+            logger.error(f"Failed to initialize Chrome driver: {e}")
+            raise
+    
+    def _close_driver(self, crashed: bool = False) -> None:
+        """Hand the browser back to the pool (crashed=True discards it)."""
+        if self.driver:
+            try:
+                self._lease.release(crashed=crashed)
+            except Exception as e:
+                logger.warning(f"Error closing driver: {e}")
+            finally:
+                self.driver = None
+                self._lease = None
+    
+    def _canonicalize_url(self, url: str) -> str:
+        """
+        Canonicalize the Best Buy URL by removing query parameters and fragments.
+        Ensures the URL points to the product page.
+        
+        Args:
+            url: The raw Best Buy product URL
+            
+        Returns:
+            Cleaned canonical URL
+        """
+        # Remove query parameters and fragments
+        base_url = url.split("?", 1)[0].split("#", 1)[0]
+        
+        # Validate it's a Best Buy product URL and has a product ID
+        if not RX["product_url"].search(base_url):
+            raise ValueError(f"URL does not appear to be a valid Best Buy product page: {url}")
+            
+        return base_url
+    
+    def _extract_sku_from_url(self, url: str) -> Optional[str]:
+        """Extract the product SKU from the URL."""
+        m = RX["sku"].search(url)
+        return m.group(1) if m else None
+    
+    def _extract_from_hero_price(self, soup: BeautifulSoup) -> Optional[Tuple[float, str]]:
+        """
+        Extract price from the hero price element.
+        
+        Returns:
+            Tuple of (price, currency) or None if not found
+        """
+        # Try multiple selectors as Best Buy occasionally changes their DOM
+        for selector in CSS["hero_price"]:
+            hero = soup.select_one(selector)
+            if hero and hero.get_text(strip=True):
+                txt = hero.get_text(strip=True)
+                # Remove currency symbol and commas, then convert to float
+                try:
+                    price = float(NON_NUMERIC.sub('', txt))
+                    return price, "USD"
+                except ValueError:
+                    continue
+                    
+        return None
+    
+    def _extract_from_json_ld(self, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+        """
+        Extract product data from JSON-LD script tags.
+        
+        Returns:
+            Dictionary containing product data or None if not found
+        """
+        for tag in soup.find_all("script", type="application/ld+json"):
+            try:
+                data = json.loads(tag.string)
+                
+                # Handle array of JSON-LD objects
+                if isinstance(data, list):
+                    data = next((d for d in data if d.get("@type") == "Product"), {})
+                
+                if data.get("@type") == "Product":
+                    result = {}
+                    
+                    # Extract offers information
+                    offers = data.get("offers", {}) or {}
+                    if isinstance(offers, list) and offers:
+                        offers = offers[0]
+                    
+                    # Get price and currency
+                    price = offers.get("price")
+                    currency = offers.get("priceCurrency", "USD")
+                    
+                    if price is not None:
+                        try:
+                            result["price"] = float(price)
+                            result["currency"] = currency
+                        except (ValueError, TypeError):
+                            continue
+                    
+                    # Extract additional product data
+                    result["name"] = data.get("name")
+                    result["sku"] = data.get("sku") or data.get("mpn") or data.get("skuId")
+                    result["brand"] = data.get("brand", {}).get("name") if isinstance(data.get("brand"), dict) else data.get("brand")
+                    result["availability"] = offers.get("availability")
+                    
+                    # Only return if we have at least price and currency
+                    if "price" in result and "currency" in result:
+                        return result
+                        
+            except Exception as e:
+                logger.debug(f"Error parsing JSON-LD: {e}")
+                continue
+                
+        return None
+    
+    def _extract_from_metadata(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extract additional product metadata from the page."""
+        result = {}
+        
+        # Try to get product name
+        title_tag = soup.find("title")
+        if title_tag:
+            result["title"] = title_tag.get_text(strip=True).replace(" - Best Buy", "")
+        
+        # Try to get product image
+        og_image = soup.find("meta", property="og:image")
+        if og_image:
+            result["image_url"] = og_image.get("content")
+            
+        # Try to get product category
+        breadcrumbs = soup.select(CSS["breadcrumbs"])
+        if breadcrumbs and len(breadcrumbs) > 1:
+            result["category"] = breadcrumbs[-2].get_text(strip=True)
+            
+        return result
+        
+    def _check_availability(self, soup: BeautifulSoup) -> Dict[str, bool]:
+        """
+        Check if the product is available for purchase.
+        
+        Returns:
+            Dictionary with availability status
+        """
+        result = {
+            "in_stock": False,
+            "purchasable": False
+        }
+        
+        # Check for in-stock indicators
+        add_to_cart = soup.select_one(CSS["add_to_cart"])
+        if add_to_cart and "disabled" not in add_to_cart.get("class", []):
+            result["purchasable"] = True
+            result["in_stock"] = True
+            return result
+            
+        # Check for out-of-stock indicators
+        sold_out = soup.select_one(CSS["sold_out"])
+        if sold_out:
+            return result
+            
+        # Check shop-buttons area for status
+        shop_buttons = soup.select_one(CSS["shop_buttons"])
+        if shop_buttons and "btn-disabled" not in shop_buttons.get_text():
+            result["in_stock"] = True
+            result["purchasable"] = True
+            
+        return result
+        
+    def parse_product(self, html: str, canonical_url: str) -> Dict[str, Any]:
+        """
+        Product dict (see fetch_product_info) from a rendered product page.
+        Pure parsing, no driver needed.
+        
+        Raises:
+            ValueError: If the page carries no price
+        """
+        soup = BeautifulSoup(html, "lxml")
+        
+        # Prepare the result with the SKU from URL as fallback
+        result = {"sku": self._extract_sku_from_url(canonical_url)}
+        
+        # Try to get price from various sources
+        hero_price = self._extract_from_hero_price(soup)
+        if hero_price:
+            result["price"] = hero_price[0]
+            result["currency"] = hero_price[1]
+            
+        # Try to extract from JSON-LD as an alternative/supplement
+        json_ld_data = self._extract_from_json_ld(soup)
+        if json_ld_data:
+            # Use JSON-LD data where we don't already have info
+            for key, value in json_ld_data.items():
+                if value and (key not in result or not result[key]):
+                    result[key] = value
+        
+        # Check if we have the essential price information
+        if "price" not in result or result["price"] is None:
+            raise ValueError(f"Price not found on page: {canonical_url}")
+        
+        # Get additional metadata
+        metadata = self._extract_from_metadata(soup)
+        for key, value in metadata.items():
+            if key not in result or not result[key]:
+                result[key] = value
+        
+        # Check availability
+        result["availability"] = self._check_availability(soup)
+        result["source"] = "hero_price" if hero_price else "json_ld"
+        return result
+    
+    def fetch_price(self, url: str) -> Tuple[float, str, str]:
+        """
+        Fetch the price of a Best Buy product.
+        
+        Args:
+            url: The Best Buy product URL
+            
+        Returns:
+            Tuple of (price, currency, sku)
+            
+        Raises:
+            ValueError: If the price cannot be found
+        """
+        try:
+            info = self.fetch_product_info(url)
+            branch(info.get("source", "?"))
+            return info["price"], "USD", info["sku"]
+        except Exception as e:
+            logger.error(f"Error fetching price: {e}")
+            raise ValueError(f"BestBuy price not found for URL: {url}")
+        
+    def _cached(self, canonical_url: str) -> Optional[Dict[str, Any]]:
+        """Return a still-fresh cached product dict for `canonical_url`."""
+        hit = self._cache.get(canonical_url)
+        if hit and time.monotonic() - hit[0] < self.cache_ttl:
+            return hit[1]
+        self._cache.pop(canonical_url, None)
+        return None
+    
+    def fetch_product_info(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch comprehensive product information from Best Buy.
+        
+        Results are cached per canonical URL for `cache_ttl` seconds, so
+        repeated lookups of the same product in one run load the page once.
+        
+        Args:
+            url: The Best Buy product URL
+            
+        Returns:
+            Dictionary containing product information including:
+            - price: float
+            - currency: str
+            - sku: str
+            - name: str (if available)
+            - brand: str (if available)
+            - availability: dict with in_stock and purchasable statuses
+            - image_url: str (if available)
+            - category: str (if available)
+            - source: "hero_price" / "json_ld" (where the price came
+              from), or "cache" for a cached result
+            
+        Raises:
+            ValueError: If product information cannot be retrieved
+        """
+        canonical_url = self._canonicalize_url(url)
+        cached = self._cached(canonical_url)
+        if cached is not None:
+            return {**cached, "source": "cache"}
+        
+        try:
+            self._setup_driver()
+            return self._load_product(canonical_url)
+        except Exception as e:
+            logger.error(f"Error fetching product info: {e}")
+            raise
+        finally:
+            self._close_driver()
+    
+    def fetch_many(self, urls) -> Dict[str, Union[Dict[str, Any], Exception]]:
+        """
+        Fetch several products in one driver session.
+        
+        Args:
+            urls: Best Buy product URLs (duplicates are loaded once)
+            
+        Returns:
+            Dict mapping each input URL to its product dict, or to the
+            exception raised for that URL
+        """
+        results: Dict[str, Union[Dict[str, Any], Exception]] = {}
+        todo: Dict[str, list] = {}
+        for url in urls:
+            try:
+                canonical_url = self._canonicalize_url(url)
+            except ValueError as e:
+                results[url] = e
+                continue
+            cached = self._cached(canonical_url)
+            if cached is not None:
+                results[url] = cached
+            else:
+                todo.setdefault(canonical_url, []).append(url)
+        
+        if not todo:
+            return results
+        
+        try:
+            self._setup_driver()
+            for canonical_url, originals in todo.items():
+                try:
+                    info = self._load_product(canonical_url)
+                except Exception as e:
+                    logger.error(f"Error fetching product info: {e}")
+                    info = e
+                for url in originals:
+                    results[url] = info
+        finally:
+            self._close_driver()
+        
+        return results
+    
+    def _load_product(self, canonical_url: str) -> Dict[str, Any]:
+        """Load `canonical_url` in the current driver, parse it and cache it."""
+        # Load the page with retry mechanism
+        for attempt in range(3):
+            try:
+                logger.info(f"Loading URL (attempt {attempt+1}): {canonical_url}")
+                limiter().wait(canonical_url)
+                with phase("render"):
+                    self.driver.get(canonical_url)
+                    
+                    # Wait for the price element to be present
+                    try:
+                        WebDriverWait(self.driver, self.timeout).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, CSS["price_ready"]))
+                        )
+                    except TimeoutException:
+                        # If we can't find the price element, at least wait for page to load
+                        WebDriverWait(self.driver, self.timeout).until(
+                            lambda d: d.execute_script("return document.readyState") == "complete"
+                        )
+                        # Add a small delay for any JS to finish rendering
+                        pause(1, 2)
+                    
+                    # Get the page source
+                    html = self.driver.page_source
+                limiter().page(canonical_url, html)
+                try:
+                    result = pipeline.parse(parse_bestbuy_info, html, canonical_url)
+                except ValueError:
+                    if attempt < 2:
+                        logger.warning(f"Price not found, retrying (attempt {attempt+1})")
+                        pause(2, 4)
+                        continue
+                    raise ValueError("Price not found after multiple attempts")
+                
+                self._cache[canonical_url] = (time.monotonic(), result)
+                return result
+                
+            except (TimeoutException, WebDriverException) as e:
+                if attempt < 2:
+                    logger.warning(f"Browser error on attempt {attempt+1}: {e}")
+                    # Return the browser (recycled if it crashed) and lease again
+                    self._close_driver(crashed=is_crash(e))
+                    self._setup_driver()
+                else:
+                    raise
+        
+        raise ValueError(f"Failed to retrieve product information after multiple attempts")
+
+
+def fetch_bestbuy_price(url: str) -> Tuple[float, str, str]:
+    """
+    Fetch the price, currency, and SKU of a Best Buy product.
+    
+    Args:
+        url: The Best Buy product URL
+        
+    Returns:
+        Tuple of (price, currency, sku)
+        
+    Raises:
+        ValueError: If the price cannot be found
+    """
+    return _BESTBUY.fetch_price(url)
+
+def parse_bestbuy_info(html: str, url: str) -> Dict[str, Any]:
+    """BestBuyPriceScraper.parse_product() as a plain (picklable) function."""
+    return _BESTBUY.parse_product(html, url)
+
+def parse_bestbuy(html: str, url: str) -> Tuple[float, str, str]:
+    """(price, currency, sku) from a rendered Best Buy product page; no I/O."""
+    info = parse_bestbuy_info(html, url)
+    branch(info["source"])
+    return info["price"], "USD", info["sku"]
+
+# one scraper per process so its result cache spans the whole run
+_BESTBUY = BestBuyPriceScraper(headless=True)
+
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    try:
+        # Sample Best Buy product URL
+        url = "https://www.bestbuy.com/site/sony-playstation-5-slim-disc-console/6574179.p"
+        
+        # Basic price fetch
+        price, currency, sku = fetch_bestbuy_price(url)
+        print(f"Price: ${price} {currency}, SKU: {sku}")
+        
+        # Comprehensive product info
+        scraper = BestBuyPriceScraper()
+        product_info = scraper.fetch_product_info(url)
+        print(f"\nComprehensive product info:")
+        for key, value in product_info.items():
+            print(f"{key}: {value}")
+            
+    except Exception as e:
+        print(f"Error: {e}")
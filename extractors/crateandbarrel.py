@@ -0,0 +1,82 @@
+# extractors/crateandbarrel.py  – Crate & Barrel
+import json
+from bs4 import BeautifulSoup
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import DOLLARS, REGEX, SELECTORS
+
+def fetch_crateandbarrel_price(url: str):
+    """
+    Crate & Barrel PDP scraper:
+      1) Canonicalize URL
+      2) GET HTML via _html()
+      3) Try schema.org JSON-LD for Product → offers.price
+      4) Fallback: <meta property="product:price:amount">
+      5) Fallback: span.price or .price-display
+      6) Regex last-resort for $xx.xx
+    Returns (price: float, 'USD', sku: str)
+    """
+    base = url.split('?',1)[0].split('#',1)[0]
+    return pipeline.handoff(parse_crateandbarrel, _html(base), url)
+
+def parse_crateandbarrel(html: str, url: str):
+    """The parse half of fetch_crateandbarrel_price(); no I/O."""
+    # 1️⃣ strip off any query or fragment
+    base = url.split('?',1)[0].split('#',1)[0]
+
+    # 2️⃣ parse the downloaded page
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 3️⃣ JSON-LD
+    for tag in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(tag.string or '{}')
+            # if list, find the Product
+            if isinstance(data, list):
+                data = next((d for d in data if d.get('@type')=='Product'), {})
+            if data.get('@type') == 'Product':
+                offers = data.get('offers') or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                raw_price = offers.get('price')
+                if raw_price is not None:
+                    cur = offers.get('priceCurrency','USD')
+                    # sku may live on the product
+                    sku = data.get('sku') or data.get('mpn') or ''
+                    branch("json_ld")
+                    return float(raw_price), cur, str(sku)
+        except Exception:
+            continue
+
+    # 4️⃣ meta tag fallback
+    m_amt = soup.find('meta', {'property':'product:price:amount'})
+    if m_amt and m_amt.get('content'):
+        price = _clean(m_amt['content'])
+        m_cur = soup.find('meta', {'property':'product:price:currency'})
+        cur   = m_cur['content'] if m_cur and m_cur.get('content') else 'USD'
+        # sku from URL path
+        m_sku = REGEX["crateandbarrel"]["sku"].search(base)
+        sku   = m_sku.group(1) if m_sku else ''
+        branch("meta")
+        return price, cur, sku
+
+    # 5️⃣ common price span
+    span = soup.select_one(SELECTORS["crateandbarrel"]["price"])
+    if span and span.get_text(strip=True):
+        price = _clean(span.get_text())
+        m_sku = REGEX["crateandbarrel"]["sku"].search(base)
+        sku   = m_sku.group(1) if m_sku else ''
+        branch("price_span")
+        return price, 'USD', sku
+
+    # 6️⃣ regex fallback
+    m = DOLLARS.search(html)
+    if m:
+        price = float(m.group(1).replace(',',''))
+        m_sku = REGEX["crateandbarrel"]["sku"].search(base)
+        sku   = m_sku.group(1) if m_sku else ''
+        branch("regex")
+        return price, 'USD', sku
+
+    raise ValueError(f"Crate&Barrel price not found for URL: {url}")
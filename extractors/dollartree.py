@@ -0,0 +1,80 @@
+# extractors/dollartree.py  – Dollar Tree
+import json
+from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX
+
+def fetch_dollartree_price(url: str):
+    """
+    Dollar Tree PDP scraper, updated SKU logic:
+      1) canonicalize URL
+      2) GET via _html()
+      3) JSON-LD → offers.price + sku/productID
+      4) <meta> → price + URL segment SKU
+      5) itemprop → price + URL segment SKU
+      6) regex → price + URL segment SKU
+    """
+    base = url.split("?",1)[0].split("#",1)[0]
+    return pipeline.handoff(parse_dollartree, _html(base), url)
+
+def parse_dollartree(html: str, url: str):
+    """The parse half of fetch_dollartree_price(); no I/O."""
+    # 1️⃣ canonical URL
+    base = url.split("?",1)[0].split("#",1)[0]
+
+    # 2️⃣ parse
+    soup = BeautifulSoup(html, "lxml")
+
+    # helper: always grab last non-empty path segment as SKU
+    path = urlparse(base).path
+    segments = [seg for seg in path.split("/") if seg]
+    url_sku  = segments[-1] if segments else ""
+
+    # 3️⃣ JSON-LD
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "{}")
+            if isinstance(data, list):
+                data = next((d for d in data if d.get("@type")=="Product"), {})
+            if data.get("@type")=="Product":
+                offers = data.get("offers") or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                raw = offers.get("price")
+                if raw is not None:
+                    cur = offers.get("priceCurrency","USD")
+                    sku = data.get("sku") or data.get("productID") or url_sku
+                    branch("json_ld")
+                    return float(raw), cur, str(sku)
+        except:
+            continue
+
+    # 4️⃣ meta tag fallback
+    meta_amt = soup.find("meta", {"property":"product:price:amount"})
+    if meta_amt and meta_amt.get("content"):
+        price    = _clean(meta_amt["content"])
+        meta_cur = soup.find("meta", {"property":"product:price:currency"})
+        cur      = meta_cur["content"] if meta_cur and meta_cur.get("content") else "USD"
+        branch("meta")
+        return price, cur, url_sku
+
+    # 5️⃣ microdata fallback
+    price_tag = soup.find(attrs={"itemprop":"price"})
+    if price_tag:
+        raw      = price_tag.get("content") or price_tag.get_text()
+        price    = _clean(raw)
+        cur_tag  = soup.find(attrs={"itemprop":"priceCurrency"})
+        cur      = cur_tag.get("content") if cur_tag and cur_tag.get("content") else "USD"
+        branch("microdata")
+        return price, cur, url_sku
+
+    # 6️⃣ regex fallback
+    m2 = REGEX["dollartree"]["price"].search(html)
+    if m2:
+        branch("regex")
+        return float(m2.group(1)), "USD", url_sku
+
+    raise ValueError(f"Dollar Tree price not found for URL: {url}")
@@ -0,0 +1,76 @@
+# extractors/homedepot.py  – Home Depot via pooled stealth Chrome
+import json
+from bs4 import BeautifulSoup
+from browser_pool import get_pool          # shared warm Chrome instances
+from helpers import pause
+from instrument import branch, phase
+import pipeline                       # parse() may run in a worker process
+from ratelimit import limiter
+from .patterns import DOLLARS, SELECTORS
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+def fetch_homedepot_price(url: str):
+    """
+    1) Strip query & fragment → canonical PDP
+    2) Stealth‐Chrome to load real HTML
+    3) Parse the server blob or JSON‐LD, etc.
+    Returns (price, currency, sku)
+    """
+    # ── 1️⃣ Derive the clean PDP URL ────────────────────────────────
+    base = url.split("?", 1)[0].split("#", 1)[0]
+
+    # ── 2️⃣ Lease a pooled stealth Chrome tab and load that base URL ─
+    with get_pool().lease() as driver:
+        limiter().wait(base)
+        with phase("render"):
+            driver.get(base)
+        # give the JS challenge + hydration 5 s
+        pause(5)
+        html = driver.page_source
+    limiter().page(base, html)
+    return pipeline.handoff(parse_homedepot, html, url)
+
+def parse_homedepot(html: str, url: str):
+    """Step 3 onwards of fetch_homedepot_price(), on rendered HTML; no I/O."""
+    soup = BeautifulSoup(html, "lxml")
+
+    # ── 3️⃣ Parse the JSON blob you already know works ─────────────────
+    srv = soup.select_one(SELECTORS["homedepot"]["product_data"])
+    if srv and srv.string:
+        data   = json.loads(srv.string)
+        offers = data.get("offers", {}) or {}
+        price  = offers.get("price")
+        cur    = offers.get("priceCurrency", "USD")
+        sku    = data.get("sku") or data.get("productID")
+        if price is not None:
+            branch("product_data")
+            return float(price), cur, sku
+
+    # ── 4️⃣ Fallback to JSON‐LD ───────────────────────────────────────
+    for ld in soup.find_all("script", type="application/ld+json"):
+        try:
+            d = json.loads(ld.string)
+            if isinstance(d, list):
+                d = next((x for x in d if x.get("@type")=="Product"), {})
+            if d.get("@type")=="Product":
+                offers = d.get("offers", {}) or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                price = offers.get("price")
+                cur   = offers.get("priceCurrency", "USD")
+                sku   = d.get("sku") or d.get("productID")
+                if price is not None:
+                    branch("json_ld")
+                    return float(price), cur, sku
+        except:
+            continue
+
+    # ── 5️⃣ Last‐resort regex ─────────────────────────────────────────
+    m = DOLLARS.search(html)
+    if m:
+        branch("regex")
+        return float(m.group(1).replace(",", "")), "USD", None
+
+    raise ValueError(f"Home Depot price not found for URL: {url}")
@@ -0,0 +1,76 @@
+# extractors/kohls.py  – Kohl’s (productV2JsonData)
+import jsonscan
+from fastparse import Page
+from helpers import _html
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX
+
+def fetch_kohls_price(url: str):
+    """
+    Returns (price: float, currency: str, sku: str)
+    by extracting the productV2JsonData JS blob from a Kohl’s PDP.
+    """
+    return pipeline.handoff(parse_kohls, _html(url), url)
+
+def parse_kohls(html: str, url: str):
+    """fetch_kohls_price() on an already-downloaded page; no I/O."""
+    page = Page(html)
+    
+    # 1️⃣ productV2JsonData: price.yourPriceInfo.yourPrice.minPrice and webID,
+    #    direct members of the blob (not a related product's), from the raw text
+    found = page.blob_text("productV2JsonData")
+    if found:
+        text, start = found
+        price = jsonscan.member(text, start, "price", "yourPriceInfo", "yourPrice", "minPrice")
+        try:
+            if price is not None:
+                webid = jsonscan.member(text, start, "webID", default="")
+                branch("your_price")
+                return float(price), "USD", str(webid).strip()
+        except (TypeError, ValueError):
+            pass
+
+    # … else decode the whole blob for the salePrice / regularPrice fallbacks
+    data = page.blob("productV2JsonData") if found else None
+    if isinstance(data, dict):
+        try:
+            price_block = data.get("price", {})
+            # yourPrice → minPrice
+            your = price_block.get("yourPriceInfo", {}) \
+                              .get("yourPrice", {})
+            price = your.get("minPrice")
+            if price is None:
+                # fallback to salePrice or regularPrice.minPrice
+                price = price_block.get("salePrice") \
+                     or price_block.get("regularPrice", {}).get("minPrice")
+            price = float(price)
+
+            # Kohl’s always uses USD here
+            currency = "USD"
+
+            # webID is the Kohl’s “product” identifier
+            sku = str(data.get("webID", "")).strip()
+
+            branch("product_json")
+            return price, currency, sku
+        except Exception as e:
+            # if JSON parse or key lookup failed, fall back
+            pass
+
+    # 2️⃣ Fallback → JSON-LD Offer (rarely used)
+    for jd in page.json_ld():
+        if not isinstance(jd, dict):
+            continue
+        offers = jd.get("offers")
+        if isinstance(offers, dict) and offers.get("price"):
+            branch("json_ld")
+            return float(offers["price"]), offers.get("priceCurrency", "USD"), jd.get("sku", "")
+
+    # 3️⃣ Last-resort regex
+    m2 = REGEX["kohls"]["your_price"].search(html)
+    if m2:
+        branch("regex")
+        return float(m2.group(1)), "USD", ""
+
+    raise ValueError(f"Kohl's price not found for URL: {url}")
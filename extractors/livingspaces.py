@@ -0,0 +1,55 @@
+# extractors/livingspaces.py  – Living Spaces (utag_data blob)
+from fastparse import Page
+from helpers import _html
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX
+
+def fetch_livingspaces_price(url: str):
+    """
+    1) Strip query/fragment → canonical PDP
+    2) GET HTML via _html()
+    3) Parse utag_data JS blob for product_price & product_id
+    4) Fallback: meta[itemprop=price] + meta[itemprop=priceCurrency]
+    Returns (price: float, 'USD', sku: str)
+    """
+    base = url.split("?", 1)[0].split("#", 1)[0]
+    return pipeline.handoff(parse_livingspaces, _html(base), url)
+
+def parse_livingspaces(html: str, url: str):
+    """The parse half of fetch_livingspaces_price(); no I/O."""
+    # 1️⃣ canonical URL
+    base = url.split("?", 1)[0].split("#", 1)[0]
+
+    # 2️⃣ parse HTML
+    page = Page(html)
+
+    # 3️⃣ utag_data JS blob
+    data = page.blob("utag_data")
+    if isinstance(data, dict):
+        try:
+            prices = data.get("product_price") or []
+            if isinstance(prices, list) and prices:
+                price = float(prices[0])
+                ids = data.get("product_id") or []
+                sku   = str(ids[0]) if isinstance(ids, list) and ids else ""
+                branch("utag_data")
+                return price, "USD", sku
+        except Exception:
+            pass
+
+    # 4️⃣ meta tags fallback
+    price_meta = page.meta("price", attr="itemprop")
+    if price_meta:
+        try:
+            price = float(price_meta)
+            cur   = page.meta("priceCurrency", attr="itemprop") or "USD"
+            # SKU from URL segment (last numeric chunk)
+            m2 = REGEX["livingspaces"]["sku"].search(base)
+            sku = m2.group(1) if m2 else ""
+            branch("meta")
+            return price, cur, sku
+        except:
+            pass
+
+    raise ValueError(f"Living Spaces price not found for URL: {url}")
@@ -0,0 +1,79 @@
+# extractors/lowes.py  – Lowe's
+import json
+from bs4 import BeautifulSoup
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX
+
+RX = REGEX["lowes"]
+
+def fetch_lowes_price(url: str):
+    """
+    1) Strip off any query-string or fragment
+    2) GET HTML via your _html() helper
+    3) Try schema.org JSON-LD for Product → offers.price
+    4) Fallback to <meta property="product:price:amount"/>
+    5) Last resort: regex for "price":123.45 in the payload
+    Returns (price: float, currency: str, sku: str)
+    """
+    base = url.split("?",1)[0].split("#",1)[0]
+    return pipeline.handoff(parse_lowes, _html(base), url)
+
+def parse_lowes(html: str, url: str):
+    """The parse half of fetch_lowes_price(); no I/O."""
+    # 1️⃣ canonical URL
+    base = url.split("?",1)[0].split("#",1)[0]
+
+    # 2️⃣ parse
+    soup = BeautifulSoup(html, "lxml")
+
+    # 3️⃣ JSON-LD
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "{}")
+            # sometimes it's a list of records
+            if isinstance(data, list):
+                data = next((d for d in data if d.get("@type") == "Product"), {})
+            if data.get("@type") == "Product":
+                offers = data.get("offers", {}) or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                raw_price = offers.get("price")
+                if raw_price is not None:
+                    price = float(raw_price)
+                    cur   = offers.get("priceCurrency", "USD")
+                    sku   = data.get("sku") or data.get("mpn") or ""
+                    branch("json_ld")
+                    return price, cur, str(sku)
+        except Exception:
+            continue
+
+    # 4️⃣ <meta> fallback
+    meta_amt = soup.find("meta", {"property": "product:price:amount"})
+    if meta_amt and meta_amt.get("content"):
+        price = _clean(meta_amt["content"])
+        meta_cur = soup.find("meta", {"property": "product:price:currency"})
+        cur   = (meta_cur["content"] if meta_cur and meta_cur.get("content") else "USD")
+        # SKU: last numeric segment of the path
+        m = RX["sku"].search(base)
+        sku = m.group(1) if m else ""
+        branch("meta")
+        return price, cur, sku
+
+    # 5️⃣ Regex last-resort
+    m2 = RX["json_price"].search(html)
+    if m2:
+        price = float(m2.group(1))
+        # try to find a sku field in the blob
+        m3 = RX["json_sku"].search(html)
+        if m3:
+            sku = m3.group(1)
+        else:
+            # fallback to URL segment
+            m = RX["sku"].search(base)
+            sku = m.group(1) if m else ""
+        branch("regex")
+        return price, "USD", sku
+
+    raise ValueError(f"Lowe's price not found for URL: {url}")
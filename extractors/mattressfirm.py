@@ -0,0 +1,100 @@
+# extractors/mattressfirm.py  – Mattress Firm (variant array in page JSON)
+import functools
+import json
+from urllib.parse import urlsplit, parse_qs
+
+from fastparse import Page
+from helpers import _html
+import pipeline                       # parse() may run in a worker process
+from instrument import branch
+from .patterns import REGEX, price_near
+
+DEFAULT_SIZE = "Queen"
+
+RX       = REGEX["mattressfirm"]
+_DECODER = json.JSONDecoder()
+
+def _pick(variants, size: str, variant_id=None):
+    """Variant matching the URL's variantid, else the first of `size`."""
+    size, by_size = size.lower(), None
+    for v in variants:
+        if v.get("price") is None or v.get("variantId") is None:
+            continue
+        if variant_id and str(v["variantId"]) == variant_id:
+            return v
+        if by_size is None and str(v.get("size", "")).lower() == size:
+            by_size = v
+    return by_size
+
+def variants_from_html(html: str) -> list:
+    """The size/variant array, decoded in place; [] if not found."""
+    m = RX["sizes_array"].search(html)
+    if not m:
+        return []
+    try:
+        variants = _DECODER.raw_decode(html, m.start())[0]
+    except ValueError:
+        return []
+    return [v for v in variants if isinstance(v, dict)]
+
+def price_from_html(html: str, size: str = DEFAULT_SIZE, variant_id=None):
+    """(price, currency, sku) for one size / variant of a Mattress Firm PDP."""
+    # 1️⃣ the variant array
+    v, found_in = _pick(variants_from_html(html), size, variant_id), "variant_array"
+
+    # 2️⃣ else any standalone variant objects (key order doesn't matter)
+    if v is None:
+        objs = []
+        for m in RX["variant_obj"].finditer(html):
+            try:
+                objs.append(json.loads(m.group()))
+            except ValueError:
+                continue
+        v, found_in = _pick(objs, size, variant_id), "variant_obj"
+    if v is not None:
+        branch(found_in)
+        return float(v["price"]), "USD", str(v["variantId"])
+
+    # 3️⃣ JSON-LD offers naming the size
+    page = Page(html)
+    for data in page.ld_products():
+        offers = data.get("offers", {})
+        for o in (offers if isinstance(offers, list) else [offers]):
+            if not isinstance(o, dict) or o.get("price") is None:
+                continue
+            text = (o.get("name", "") + o.get("description", "")).lower()
+            if size.lower() in text:
+                branch("json_ld")
+                return (float(o["price"]), o.get("priceCurrency", "USD"),
+                        variant_id or str(o.get("sku", "")))
+
+    # 4️⃣ price printed next to the size name
+    m = price_near(size).search(html)
+    if m:
+        branch("price_near")
+        return float((m.group(1) or m.group(2)).replace(",", "")), "USD", variant_id or ""
+
+    raise ValueError(f"{size} variant price not found")
+
+def parse_mattressfirm(html: str, url: str, size: str = None):
+    """
+    Parse half: price of one variant of a Mattress Firm product page.
+
+    The variant is picked by the URL's `variantid`, else by `size` (or the
+    URL's `size` parameter), else DEFAULT_SIZE.  Returns (price, currency, sku).
+    """
+    query  = parse_qs(urlsplit(url).query)
+    size   = size or query.get("size", [DEFAULT_SIZE])[0]
+    wanted = query.get("variantid", [None])[0]
+
+    try:
+        return price_from_html(html, size, wanted)
+    except ValueError:
+        raise ValueError(f"{size} variant price not found for URL: {url}") from None
+
+def fetch_mattressfirm_price(url: str, size: str = None):
+    """Fetch the PDP without its query string, then parse_mattressfirm() it."""
+    base  = url.split("?", 1)[0].split("#", 1)[0]
+    parse = (parse_mattressfirm if size is None
+             else functools.partial(parse_mattressfirm, size=size))
+    return pipeline.handoff(parse, _html(base), url)
@@ -0,0 +1,83 @@
+# extractors/mybobs.py  – Bob's Discount Furniture via the DXP search API
+import json
+import time
+from helpers    import _clean
+import sessions                       # pooled keep-alive HTTP sessions
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import REGEX
+
+def fetch_mybobs_price(url: str):
+    """
+    1) Grab the PID from the /p/<pid> URL segment
+    2) Call the exact same core.dxpapi.com search API as in bobs loop.py
+    3) Return (price: float, 'USD', sku: str)
+    """
+    # 1️⃣ extract PID
+    m = REGEX["mybobs"]["pid"].search(url)
+    if not m:
+        raise ValueError(f"Could not find product ID in URL: {url}")
+    pid = m.group(1)
+
+    # 2️⃣ call DXP search API with *all* the original params :contentReference[oaicite:0]{index=0}:contentReference[oaicite:1]{index=1}
+    api = "https://core.dxpapi.com/api/v1/core/"
+    params = {
+        "account_id":    "6804",
+        "domain_key":    "mybobs",
+        "auth_key":      "78zkm2v43h9aggad",
+        "view_id":       "30003210",
+        "request_id":    str(int(time.time() * 1000)),
+        "_br_uid_2":     "",
+        "url":           "mybobs.com",
+        "ref_url":       "https://www.google.com/",
+        "request_type":  "search",
+        "fl":            (
+            "pid,code,title,brand,price,sale_price,promotions,"
+            "thumb_image,sku_thumb_images,sku_swatch_images,sku_color_group,"
+            "sku_price,sku_finish,sku_color,sku_sale_price,url,price_range,"
+            "sale_price_range,description,is_live,score,variant_title,"
+            "variant_url,color,finance_eligible,finance_per_month,"
+            "finance_no_of_payments,badges,outlet,clearance,original_price,"
+            "yotpo_average_rating,yotpo_number_of_reviews,price_map,"
+            "special_delivery_fee_indicator,price_zone4,finance_map,"
+            "strikethrough_prices_map,badges_zone4"
+        ),
+        "realm":         "prod",
+        "facet":         "true",
+        "stats.field":   "price_zone4",
+        "search_type":   "keyword",
+        "rows":          "1",       # we only need the single product
+        "start":         "0",
+        "sort":          "",
+        "segment":       "customer_geo:501",
+        "fq":            'warehouse:("30003210")',
+        "q":             pid,
+    }
+    headers = {"User-Agent": "insomnia/10.0.0"}
+
+    # plain (non-impersonated) client, as the DXP API expects
+    resp = sessions.get(api, impersonate=None, params=params,
+                        headers=headers, timeout=20)
+    resp.raise_for_status()  # now returns 200 instead of 400
+    return pipeline.handoff(parse_mybobs, resp.text, url)
+
+def parse_mybobs(body: str, url: str):
+    """(price, 'USD', sku) from a DXP search response for `url`'s PID; no I/O."""
+    pid  = REGEX["mybobs"]["pid"].search(url).group(1)
+    data = json.loads(body)
+
+    # 3️⃣ pull out first doc
+    docs = data.get("response", {}).get("docs", [])
+    if not docs:
+        raise ValueError(f"No product data for PID {pid}")
+    doc = docs[0]
+
+    raw_price = doc.get("price")
+    if raw_price is None:
+        raise ValueError(f"No price in API response for PID {pid}")
+
+    sku   = doc.get("code") or pid
+    price = _clean(raw_price)
+
+    branch("dxp_api")
+    return price, "USD", sku
@@ -0,0 +1,186 @@
+# extractors/patterns.py  – compiled regexes and CSS selectors, per retailer
+#
+# Everything here is compiled once at import.  Extractors take their
+# entries by name (`RX = REGEX["amazon"]`) instead of calling
+# re.search(r"…") on every page.  URL → SKU rules that used to be a list
+# tried in turn are folded into a single `ordered()` regex, so a URL is
+# scanned with one call.
+import functools
+import re
+
+def ordered(*patterns, flags=0):
+    """
+    One regex equivalent to trying `patterns` in order with re.search and
+    keeping the first hit.  Each pattern must have exactly one capture
+    group; read it back with first_group().
+    """
+    alts = "|".join(f"(?=.*?{p})" for p in patterns)
+    return re.compile(f"^(?:{alts})", flags | re.S)
+
+def first_group(rx, text):
+    """Group captured by an ordered() regex (or a one-group regex), else None."""
+    m = rx.search(text)
+    return m.group(m.lastindex) if m and m.lastindex else None
+
+# ── shared ────────────────────────────────────────────────────────────────
+DOLLARS       = re.compile(r"\$(\d{1,3}(?:,\d{3})*(?:\.\d{2}))")   # $1,234.56
+DOLLARS_CENTS = re.compile(r"\$(\d{1,3}(?:,\d{3})*\.\d{2})")
+DECIMAL       = re.compile(r"(\d+\.\d+)")
+NON_NUMERIC   = re.compile(r"[^\d.]")
+JSON_LD       = "script[type='application/ld+json']"
+
+# ── regexes ───────────────────────────────────────────────────────────────
+REGEX = {
+    "amazon": {
+        "asin": ordered(
+            r"/dp/([A-Z0-9]{10})(?:[/?]|$)",
+            r"/gp/product/([A-Z0-9]{10})(?:[/?]|$)",
+        ),
+        "cart_amount":   re.compile(r"customerVisiblePrice.*\[amount\]"),
+        "cart_currency": re.compile(r"customerVisiblePrice.*\[currencyCode\]"),
+    },
+    "ashley": {
+        "sku": re.compile(r"/([^/]+)\.html$"),
+    },
+    "babylist": {
+        "item":           re.compile(r"/item/([^/]+)(?:[/?]|$)"),
+        "active_product": re.compile(r'(?:"|&quot;)activeProductId(?:"|&quot;):(\d+)'),
+    },
+    "bestbuy": {
+        "product_url": re.compile(r"bestbuy\.com.*?/\d+\.p"),
+        "sku":         re.compile(r"/(\d+)\.p"),
+    },
+    "crateandbarrel": {
+        "sku": re.compile(r"/s(\d+)"),
+    },
+    "dollartree": {
+        "price": re.compile(r"\$(\d{1,3}(?:\.\d{2}))"),
+    },
+    "kohls": {
+        "your_price": re.compile(r'"yourPrice"\s*:\s*\{\s*"minPrice"\s*:\s*([\d.]+)'),
+    },
+    "livingspaces": {
+        "sku": re.compile(r"-(\d+)$"),
+    },
+    "lowes": {
+        "sku":        re.compile(r"/(\d+)$"),
+        "json_price": re.compile(r'"price"\s*:\s*([\d.]+)'),
+        "json_sku":   re.compile(r'"sku"\s*:\s*"([^"]+)"'),
+    },
+    "mattressfirm": {
+        # start of the per-size variant array: [{"id":"…","title":"…","size":"…",…
+        "sizes_array": re.compile(r'\[\{"id":"[^"]+","title":"[^"]+","size":"[^"]+"'),
+        # any flat JSON object carrying a variantId
+        "variant_obj": re.compile(r'\{[^{}]*"variantId"\s*:\s*\d+[^{}]*\}'),
+    },
+    "mybobs": {
+        "pid": re.compile(r"/p/(\d+)"),
+    },
+    "raymour": {
+        "sku": re.compile(r"-(\d+)$"),
+    },
+    "target": {
+        "tcin": ordered(
+            r"/A-(\d+)",
+            r"(?:/-|/p)/([A-Za-z0-9]{8,})(?:[/?]|$)",
+        ),
+    },
+    "walmart": {
+        "item_id":    re.compile(r"/(\d+)(?:[/?]|$)"),
+        "sku_label":  re.compile(r"(?:Item|SKU|#)\s*(?:number|num)?(?:\s*:)?\s*(\d+)", re.I),
+        "digits":     re.compile(r"^\s*(\d+)\s*$"),
+        "script_sku": re.compile(r'"sku"\s*:\s*"(\d+)"'),
+    },
+    "wayfair": {
+        "sku": ordered(
+            # W-SKUs with 8+ digits
+            r"/pdp/[\w-]+-([A-Za-z]\d{8,})\.html",
+            r"/([A-Za-z]\d{8,})\.html",
+            r"[/-]([A-Za-z]\d{8,})[/\.]",
+            r"[/-]([A-Za-z]\d{8,})$",
+            # 4-letter + 4-number SKUs
+            r"/pdp/[\w-]+-([A-Za-z]{4}\d{4})\.html",
+            r"[/-]([A-Za-z]{4}\d{4})\.html",
+            r"[/-]([A-Za-z]{4}\d{4})[/\.]",
+            r"[/-]([A-Za-z]{4}\d{4})$",
+            r"/([A-Za-z]{4}\d{4})\.html",
+            r"/([A-Za-z]{4}\d{4})$",
+            # other SKU formats
+            r"/pdp/[\w-]+-([A-Za-z]\d{4,})\.html",
+            r"/([A-Za-z]\d{4,})\.html",
+            r"[/-]([A-Za-z]\d{4,})[/\.]",
+            r"[/-]([A-Za-z]\d{4,})$",
+            r"[-/]([A-Za-z]+\d+)\.html$",
+            flags=re.I,
+        ),
+        "pdp_name":      re.compile(r"/pdp/([\w-]+)-[A-Za-z]\d{8,}", re.I),
+        "name_suffix":   re.compile(r"-[A-Za-z]\d{8,}\.html$"),
+        "number":        re.compile(r"([\d.,]+)"),
+        "decimal_comma": re.compile(r",\d{2}$"),
+        "plain_number":  re.compile(r"^\d+(\.\d+)?$"),
+    },
+}
+
+@functools.lru_cache(maxsize=None)
+def price_near(size: str):
+    """`<size> … $1,234.00` (either order, one line) – Mattress Firm fallback."""
+    s = re.escape(size)
+    return re.compile(rf"(?i:{s}).*?\$(\d{{1,3}}(?:,\d{{3}})*\.\d{{2}})"
+                      rf"|\$(\d{{1,3}}(?:,\d{{3}})*\.\d{{2}}).*?(?i:{s})")
+
+# ── CSS selectors ─────────────────────────────────────────────────────────
+SELECTORS = {
+    "ashley": {
+        "cf_slider": ".cf-browser-verification__button",
+    },
+    "babylist": {
+        "price_box": 'div[class^="PriceTag-styles__PriceTag__numerals"]',
+    },
+    "bestbuy": {
+        "hero_price": (
+            "div.priceView-hero-price span",
+            "div.priceView-customer-price span",
+            "div[data-testid='customer-price'] span",
+            ".priceView-desktop-price span",
+        ),
+        "price_ready":  "div.priceView-hero-price, div.priceView-customer-price",
+        "breadcrumbs":  "ol.c-breadcrumbs a",
+        "add_to_cart":  "button.add-to-cart-button",
+        "sold_out":     "button.sold-out",
+        "shop_buttons": "div.fulfillment-add-to-cart-button",
+    },
+    "crateandbarrel": {
+        "price": "span.price, .price-display",
+    },
+    "homedepot": {
+        "product_data": "#thd-helmet__script--productStructureData",
+    },
+    "raymour": {
+        "sale_price": "span.price-sales, .price-sales",
+    },
+    "walmart": {
+        "price": 'span[itemprop="price"], [data-automation-id="price-value"]',
+        "price_containers": (
+            '[data-testid="price-value"]',
+            '[data-automation-id="price-value"]',
+            ".price-characteristic",
+            '[itemprop="price"][content]',
+        ),
+        "sku_containers": (
+            '[data-testid="product-sku"]',
+            ".prod-ProductId",
+            '[itemprop="sku"]',
+            '[data-automation-id="product-sku"]',
+        ),
+    },
+    "wayfair": {
+        "price": (
+            "span[data-price]", "span[itemprop='price']",
+            "meta[property='product:price:amount']", "meta[itemprop='price']",
+            "[data-enzyme-id*='price']", ".StandardPriceBlock",
+            ".PriceBlock", ".SalePrice", ".price",
+        ),
+        "product_cards": "[data-product-id], [data-sku], .ProductCard",
+        "card_price":    ".SalesPrice, .price, [data-enzyme-id*='price']",
+    },
+}
@@ -0,0 +1,65 @@
+# extractors/raymour.py  – Raymour & Flanigan
+import json
+from bs4 import BeautifulSoup
+from helpers import _html, _clean
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import DOLLARS, REGEX, SELECTORS
+
+def fetch_raymour_price(url: str):
+    """
+    Raymour & Flanigan PDP scraper:
+      1) canonicalize URL
+      2) GET via _html()
+      3) JSON-LD Product → offers.price
+      4) fallback: .price-sales span
+      5) fallback: regex $xxx.xx
+    Returns (price: float, 'USD', sku: str)
+    """
+    base = url.split('?',1)[0].split('#',1)[0]
+    return pipeline.handoff(parse_raymour, _html(base), url)
+
+def parse_raymour(html: str, url: str):
+    """The parse half of fetch_raymour_price(); no I/O."""
+    # 1️⃣ strip off query/fragments
+    base = url.split('?',1)[0].split('#',1)[0]
+
+    # 2️⃣ pull numeric SKU off the end
+    sku_m = REGEX["raymour"]["sku"].search(base)
+    sku   = sku_m.group(1) if sku_m else ''
+
+    # 3️⃣ parse
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 4️⃣ try JSON-LD
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string)
+            # if it’s an array, pick the Product object
+            if isinstance(data, list):
+                data = next((d for d in data if d.get('@type')=='Product'), {})
+            if data.get('@type') == 'Product':
+                offers = data.get('offers') or {}
+                if isinstance(offers, list):
+                    offers = offers[0]
+                raw = offers.get('price')
+                if raw is not None:
+                    branch("json_ld")
+                    return float(raw), offers.get('priceCurrency','USD'), sku
+        except Exception:
+            continue
+
+    # 5️⃣ fallback: look for <span class="price-sales">
+    sale = soup.select_one(SELECTORS["raymour"]["sale_price"])
+    if sale and sale.get_text(strip=True):
+        price = _clean(sale.get_text())
+        branch("sale_price")
+        return price, 'USD', sku
+
+    # 6️⃣ last-resort regex
+    m = DOLLARS.search(html)
+    if m:
+        branch("regex")
+        return float(m.group(1).replace(',','')), 'USD', sku
+
+    raise ValueError(f"Raymour price not found for URL: {url}")
@@ -0,0 +1,45 @@
+# extractors/target.py  – Target via the RedSky PDP API
+import json
+
+import pipeline                       # parse() may run in a worker process
+from helpers import _get_text         # pooled session + conditional-GET cache
+from instrument import branch
+from .patterns import DECIMAL, REGEX, first_group
+
+def tcin_from_url(url: str):
+    """Target TCIN (their SKU) from a PDP URL, or None."""
+    # /A-<tcin>, else the alternate /-/ or /p/ URL format
+    return first_group(REGEX["target"]["tcin"], url)
+
+def fetch_target_price(url: str):
+    # TCIN is Target's SKU
+    tcin = tcin_from_url(url)
+    if not tcin:
+        raise ValueError("Could not extract Target TCIN from URL")
+
+    api = (
+        "https://redsky.target.com/redsky_aggregations/v1/web/pdp_client_v1"
+        "?key=eb2551d2d6ea49278afeb0f96ea59f0a"
+        f"&tcin={tcin}&pricing_store_id=3991&has_store_id=false"
+        "&excludes=taxonomy,bulk_ship"
+    )
+    _, body = _get_text(api)
+    return pipeline.handoff(parse_target, body, url)
+
+def parse_target(body: str, url: str):
+    """(price, currency, TCIN) from a RedSky pdp_client_v1 JSON body; no I/O."""
+    tcin  = tcin_from_url(url)
+    block = json.loads(body)["data"]["product"]["price"]
+
+    raw = (block.get("current_retail") or
+           block.get("formatted_current_price") or
+           block.get("formatted_current_price_range") or
+           block.get("formatted_current_price_combined"))
+
+    if not raw:
+        raise ValueError("Price missing in RedSky JSON")
+
+    # → "$73.49 - $157.49"  →  "73.49"
+    first_num = DECIMAL.search(str(raw)).group(1)
+    branch("redsky")
+    return float(first_num), "USD", tcin
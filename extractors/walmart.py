@@ -0,0 +1,251 @@
+# extractors/walmart.py  – Walmart PDP (__PRELOADED_STATE__, HTML fallbacks)
+import random, urllib.parse
+import jsonscan                       # decode only the fields we need
+from fastparse import Page
+from helpers import _get_text, pause  # pooled session + conditional-GET cache
+from instrument import branch
+from pipeline import first_price     # parse() may run in a worker process
+from .patterns import DECIMAL, REGEX, SELECTORS
+
+RX  = REGEX["walmart"]
+CSS = SELECTORS["walmart"]
+
+def _find_first(node, key):
+    """Depth-first search for the first occurrence of `key` in nested dict/list."""
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, dict):
+            if key in n:
+                return n[key]
+            stack.extend(n.values())
+        elif isinstance(n, list):
+            stack.extend(n)
+    return None
+
+# Helper function for Walmart JSON parsing
+def _find_walmart_product_data(data):
+    """Navigate Walmart's complex JSON structure to find product data."""
+    if not data:
+        return None
+        
+    # Try multiple paths where price data might be stored
+    if "product" in data:
+        return data["product"]
+    
+    for key in ["__PRELOADED_STATE__", "data", "contents", "productByLine", "products"]:
+        if key in data:
+            data = data[key]
+            if isinstance(data, dict) and "offering" in data:
+                return data
+            if isinstance(data, dict) and "price" in data:
+                return data
+    
+    return None
+
+# Helper function to extract price from Walmart product data
+def _extract_walmart_price(data):
+    """Extract price from Walmart product data structure."""
+    if not data:
+        return None
+        
+    # Check common price locations
+    if "price" in data:
+        price_data = data["price"]
+        if isinstance(price_data, dict):
+            for key in ["current", "currentPrice", "priceAmount", "price"]:
+                if key in price_data and price_data[key]:
+                    return price_data[key]
+    
+    # Check offering price structure
+    if "offering" in data and "pricesInfo" in data["offering"]:
+        price_info = data["offering"]["pricesInfo"]
+        if "currentPrice" in price_info:
+            return price_info["currentPrice"]["price"]
+    
+    return None
+
+# props.pageProps.initialData.data.product – the page's product, not a
+# carousel / variant / sponsored one further down the blob
+PRODUCT_PATH = ("props", "pageProps", "initialData", "data", "product")
+
+def _own_price(text: str, item_id):
+    """priceInfo.currentPrice.price of the page's product object, or None."""
+    obj = jsonscan.locate(text, 0, *PRODUCT_PATH)
+    if obj < 0:
+        return None
+    if str(jsonscan.member(text, obj, "usItemId", default=item_id)) != str(item_id):
+        return None                       # some other item's page state
+    return jsonscan.member(text, obj, "priceInfo", "currentPrice", "price")
+
+def item_id_from_url(url: str):
+    """Walmart item id: the last all-digit segment of the /ip/ path."""
+    item_id_match = RX["item_id"].search(urllib.parse.urlsplit(url).path)
+    return item_id_match.group(1) if item_id_match else None
+
+def _browser_headers():
+    """Random session data + headers that closely mimic a real browser session."""
+    session_id = f"s{random.randint(100000000, 999999999)}"
+    visitor_id = f"v{random.randint(1000000000000, 9999999999999)}"
+    return {
+        "User-Agent": f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.{random.randint(4200, 4299)}.{random.randint(60, 99)} Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "sec-ch-ua": "\"Chromium\";v=\"124\", \"Google Chrome\";v=\"124\", \"Not-A.Brand\";v=\"99\"",
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": "\"Windows\"",
+        "Cache-Control": "max-age=0",
+        # Cookies that help avoid detection
+        "Cookie": f"vtc={visitor_id}; s_vi=[CS]{session_id}[CE]; wmt.c=0"
+    }
+
+def pages(url: str):
+    """
+    Fetch half: yield (parse_walmart, html) for the mobile product page, then – only
+    if that one didn't parse – the standard /ip/ page.
+    """
+    # Extract the product ID from the URL
+    item_id = item_id_from_url(url)
+    if not item_id:
+        raise ValueError("Could not extract Walmart product ID from URL")
+
+    browser_headers = _browser_headers()
+
+    # Add random delay to simulate human browsing
+    pause(2, 4)
+
+    # Strategy 1: Try browsing the mobile product page first
+    mobile_url = f"https://www.walmart.com/ip/product/{item_id}?selected=true"
+    status, text = _get_text(mobile_url, browser_headers)
+    if status == 200:
+        yield parse_walmart, text
+
+    # Strategy 2: Try the standard product page
+    pause(1.5, 3)
+
+    # Add referer to second request to look more legitimate
+    browser_headers["Referer"] = mobile_url
+    browser_headers["sec-fetch-site"] = "same-origin"
+
+    standard_url = f"https://www.walmart.com/ip/{item_id}"
+    status, text = _get_text(standard_url, browser_headers)
+    if status == 200:
+        yield parse_walmart, text
+
+def parse_walmart(html: str, url: str):
+    """Parse half: (price, currency, sku) from a Walmart PDP; no I/O."""
+    item_id = item_id_from_url(url)
+    page    = Page(html)
+
+    # Look for additional SKU (may be different from URL item_id)
+    sku = _extract_walmart_sku(page, item_id)
+
+    # Walmart injects the product data as JSON in a script tag
+    for script in page.scripts:
+        if (script.attrs.get("type", "").lower() == "application/json"
+                and "__PRELOADED_STATE__" in script.text):
+            # Fast path: decode only the page's own product price
+            current = _own_price(script.text, item_id)
+            try:
+                if current:
+                    branch("preloaded_price")
+                    return float(current), "USD", sku or item_id
+            except (TypeError, ValueError):
+                pass
+            try:
+                # Full decode of the state blob as a fallback
+                data = jsonscan.loads(script.text)
+                
+                # Navigate the complex JSON structure to find the price
+                product_data = _find_walmart_product_data(data)
+                if product_data:
+                    price = _extract_walmart_price(product_data)
+                    if price:
+                        branch("preloaded_state")
+                        return float(price), "USD", sku or item_id
+            except Exception as e:
+                print(f"Error parsing Walmart JSON: {e}")
+    
+    # Direct HTML extraction approach (DOM only if a price node exists)
+    if page.has("itemprop", "price-value"):
+        price_elem = page.dom().select_one(CSS["price"])
+        if price_elem:
+            price_text = price_elem.get_text().strip()
+            price = DECIMAL.search(price_text)
+            if price:
+                branch("price_node")
+                return float(price.group(1)), "USD", sku or item_id
+    
+    # Alternative: Look for meta tags with price
+    meta_price = page.meta("product:price:amount")
+    if meta_price:
+        branch("meta")
+        return float(meta_price), "USD", sku or item_id
+
+    # Check for price in the /ip/ page's price containers
+    if page.has("price-value", "price-characteristic", "itemprop"):
+        soup = page.dom()
+        price_containers = [soup.select_one(sel) for sel in CSS["price_containers"]]
+        
+        for container in price_containers:
+            if container:
+                if container.has_attr('content'):
+                    branch("ip_page_content")
+                    return float(container['content']), "USD", sku or item_id
+                else:
+                    price_text = container.get_text().strip()
+                    price_match = DECIMAL.search(price_text)
+                    if price_match:
+                        branch("ip_page_text")
+                        return float(price_match.group(1)), "USD", sku or item_id
+    
+    raise ValueError("Could not extract Walmart price from any source")
+
+def fetch_walmart_price(url: str):
+    """Extract Walmart price and SKU using only HTML parsing"""
+    return first_price(url, pages(url))
+
+# Helper function to extract Walmart's SKU (which might be different from the URL ID)
+def _extract_walmart_sku(page, default_id):
+    """Extract Walmart's internal SKU from a fastparse.Page"""
+    # Look for SKU/item number in the page (selectors need the DOM)
+    sku_containers = []
+    if page.has("product-sku", "prod-ProductId", "itemprop"):
+        soup = page.dom()
+        sku_containers = [soup.select_one(sel) for sel in CSS["sku_containers"]]
+    
+    for container in sku_containers:
+        if container:
+            # Extract text and look for digits
+            text = container.get_text().strip()
+            sku_match = RX["sku_label"].search(text)
+            if sku_match:
+                return sku_match.group(1)
+            
+            # If we have text with just digits, use that
+            digits_only = RX["digits"].search(text)
+            if digits_only:
+                return digits_only.group(1)
+    
+    # Look for it in meta tags
+    meta_sku = page.meta("product:retailer_item_id")
+    if meta_sku:
+        return meta_sku
+    
+    # Try to find it in script tags
+    for script in page.scripts:
+        if "sku" in script.text.lower():
+            sku_match = RX["script_sku"].search(script.text)
+            if sku_match:
+                return sku_match.group(1)
+    
+    # Fallback to URL ID if we can't find a better SKU
+    return default_id
@@ -0,0 +1,320 @@
+# extractors/wayfair.py  – Wayfair (__WF_DATA__, HTML, JSON-LD, search)
+import random
+import time
+# Removed: from helpers import get_html # Not used
+# from helpers import clean_price # Defined inline now
+import curl_cffi.requests
+import sessions                       # pooled keep-alive HTTP sessions
+from bs4 import BeautifulSoup
+from fastparse import Page
+import jsonscan                       # path lookups into __WF_DATA__
+from instrument import branch
+from pipeline import first_price     # parse() may run in a worker process
+from .patterns import REGEX, SELECTORS, first_group
+from urllib.parse import urlencode
+import backoff
+import datetime # Added for timestamp
+
+RX  = REGEX["wayfair"]
+CSS = SELECTORS["wayfair"]
+
+# --- clean_price function (added for completeness) ---
+def clean_price(price_input) -> float | None:
+    if price_input is None:
+        return None
+    
+    price_str = str(price_input)
+    
+    match = RX["number"].search(price_str)
+    if not match:
+        return None
+    
+    cleaned_str = match.group(1)
+    
+    if ',' in cleaned_str and '.' in cleaned_str:
+        if cleaned_str.rfind('.') > cleaned_str.rfind(','): 
+            cleaned_str = cleaned_str.replace(',', '')
+        else: 
+            cleaned_str = cleaned_str.replace('.', '').replace(',', '.')
+    elif ',' in cleaned_str:
+        if cleaned_str.count(',') == 1 and RX["decimal_comma"].search(cleaned_str):
+            cleaned_str = cleaned_str.replace(',', '.')
+        else:
+            cleaned_str = cleaned_str.replace(',', '')
+    try:
+        price_value = float(cleaned_str)
+        return price_value
+    except ValueError:
+        return None
+
+# --- Silence backoff library's own logging ---
+import logging as py_logging # Use a different alias to avoid confusion if 'logging' module is used elsewhere
+py_logging.getLogger('backoff').addHandler(py_logging.NullHandler())
+py_logging.getLogger('backoff').propagate = False
+
+
+# --- New print_success function ---
+def print_success(method_description: str, price_value: float, currency: str, sku: str):
+    """Prints the success message in the desired format."""
+    current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]
+    print(f"{current_time} - INFO - {method_description}: {price_value}")
+    print(f"({price_value}, '{currency}', '{sku}')")
+
+# Configure exponential backoff for handling rate limits
+@backoff.on_exception(backoff.expo, 
+                     (curl_cffi.requests.RequestsError, 
+                      ConnectionError, 
+                      TimeoutError), # Note: curl_cffi might raise RequestsError for timeouts too
+                     max_tries=3,
+                     jitter=backoff.full_jitter)
+def rate_limited_request(url, user_agent, additional_headers=None):
+    """Make a request with exponential backoff for rate limiting"""
+    headers = {
+        "User-Agent": user_agent,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+        "Referer": "https://www.wayfair.com/",
+        "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="124", "Chromium";v="124"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Windows"',
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "same-origin",
+        "Sec-Fetch-User": "?1",
+        "Upgrade-Insecure-Requests": "1"
+    }
+    
+    if additional_headers:
+        headers.update(additional_headers)
+    
+    try:
+        response = sessions.get(
+            url,
+            impersonate="chrome124",
+            headers=headers,
+            timeout=30
+        )
+        
+        if response.status_code == 429:
+            # ratelimit.py has already paused wayfair.com (Retry-After / COOLDOWN);
+            # the retry below waits for that pause to end.
+            raise curl_cffi.requests.RequestsError("Rate limited (429)") # Trigger backoff
+            
+        return response
+    except Exception as e:
+        # Removed logger.error, error will be propagated by backoff or Python
+        raise
+
+def fetch_wayfair_price(url: str, proxy=None): # proxy parameter is present but not used in rate_limited_request
+    """Fetch price from Wayfair with focus on proven approach"""
+    sku = extract_sku(url)
+    if not sku:
+        raise ValueError(f"Could not extract SKU from URL: {url}")
+    
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    
+    return first_price(url, pages(url, sku, user_agent),
+                       not_found=f"Wayfair price not found for URL: {url}, SKU: {sku}")
+
+def _page_text(url, user_agent):
+    """Body of a 200 response, else None (the caller moves on to its next URL)."""
+    try:
+        response = rate_limited_request(url, user_agent)
+    except Exception: # retries exhausted / connection failed
+        return None
+    return response.text if response.status_code == 200 else None
+
+def pages(url, sku, user_agent):
+    """
+    Fetch half: yield (parse_fn, html) for the canonical PDP, the URL as
+    given, /product/<sku> and finally a keyword search – each fetched only
+    if the previous one didn't parse, skipping URLs already tried.
+    """
+    product_name = extract_product_name(url)
+    canonical_url = build_canonical_url(sku, product_name)
+    product_url = f"https://www.wayfair.com/product/{sku}"
+
+    tried = set()
+    for candidate in (canonical_url, url, product_url):
+        key = candidate.lower().strip('/') # Avoid re-fetching if URLs are effectively the same
+        if key in tried:
+            continue
+        tried.add(key)
+        html = _page_text(candidate, user_agent)
+        if html is not None:
+            yield parse_wayfair, html
+
+    search_term = f"{product_name.replace('-', ' ')} {sku}"
+    search_url = f"https://www.wayfair.com/keyword.php?{urlencode({'keyword': search_term})}"
+    html = _page_text(search_url, user_agent)
+    if html is not None:
+        yield parse_wayfair_search, html
+
+def extract_sku(url):
+    # every URL → SKU rule, in priority order, folded into one regex
+    sku = first_group(RX["sku"], url)
+    return sku.upper() if sku else None
+
+def extract_product_name(url):
+    pdp_match = RX["pdp_name"].search(url)
+    if pdp_match:
+        return pdp_match.group(1)
+    parts = url.rstrip('/').split('/')
+    if parts:
+        last_part = parts[-1]
+        product_name = RX["name_suffix"].sub('', last_part)
+        if product_name and product_name != last_part:
+            return product_name
+    return "product" # Default product name
+
+def build_canonical_url(sku, product_name="product"):
+    category = "furniture" # Default category
+    return f"https://www.wayfair.com/{category}/pdp/{product_name}-{sku.lower()}.html"
+
+def parse_wayfair(html, url):
+    """Parse half for a product page: (price, currency, sku); ValueError if none."""
+    sku = extract_sku(url)
+    try:
+        page = Page(html)
+        
+        # Method 1: __WF_DATA__ blob
+        blob = page.script_by_id("__WF_DATA__")
+        if blob:
+            try:
+                # props.pageProps.initialData.data.product.price.value as a strict
+                # member path, decoding only the small price object
+                price_data_path = jsonscan.member(
+                    blob, 0, "props", "pageProps", "initialData", "data", "product", "price")
+                if isinstance(price_data_path, dict) and "value" in price_data_path:
+                    price = price_data_path["value"]
+                    price_f = float(price)
+                    print_success("Extracted price from __WF_DATA__ (direct path)", price_f, "USD", sku)
+                    branch("wf_data")
+                    return price_f, "USD", sku
+                
+                # Fallback recursive search in __WF_DATA__
+                data = jsonscan.loads(blob)
+                price = find_price_in_json(data)
+                if price is not None:
+                    price_f = float(price)
+                    print_success("Extracted price from __WF_DATA__ (recursive)", price_f, "USD", sku)
+                    branch("wf_data_search")
+                    return price_f, "USD", sku
+            except Exception:
+                pass # Failed to parse or extract from __WF_DATA__
+        
+        # Method 2: Direct HTML price search (first step that needs a DOM)
+        soup = page.dom()
+        for selector in CSS["price"]:
+            elements = soup.select(selector)
+            for el in elements:
+                price_str = el.get("data-price") or el.get("content") or el.get_text(strip=True)
+                if price_str:
+                    try:
+                        price_value_cleaned = clean_price(price_str)
+                        if price_value_cleaned is not None:
+                            description = "Found price in HTML (attribute/content)" if el.get("data-price") or el.get("content") else "Found price in HTML (text)"
+                            print_success(description, price_value_cleaned, "USD", sku)
+                            branch("html_price")
+                            return price_value_cleaned, "USD", sku
+                        # Check for plain numeric after clean_price failed
+                        if RX["plain_number"].match(price_str.strip().lstrip('$')): # Check if it's just a number
+                             price_f = float(price_str.strip().lstrip('$'))
+                             print_success("Found numeric price in HTML (direct float)", price_f, "USD", sku)
+                             branch("html_number")
+                             return price_f, "USD", sku
+                    except Exception:
+                        pass # Price conversion failed
+        
+        # Method 3: JSON-LD
+        for data in page.json_ld():
+            try:
+                price = find_price_in_json(data) # find_price_in_json handles cleaning
+                if price is not None:
+                    price_f = float(price) # find_price_in_json should ideally return float or None
+                    print_success("Found price in JSON-LD", price_f, "USD", sku)
+                    branch("json_ld")
+                    return price_f, "USD", sku
+            except Exception:
+                pass # JSON-LD extraction failed
+        
+    except Exception: # Catch any error while parsing the page itself
+        pass
+    raise ValueError(f"No Wayfair price on product page for SKU: {sku}")
+
+def parse_wayfair_search(html, url):
+    """Parse half for keyword.php results: the card whose SKU matches `url`'s."""
+    sku = extract_sku(url)
+    try:
+        soup = BeautifulSoup(html, "lxml")
+        product_cards = soup.select(CSS["product_cards"])
+        for card in product_cards:
+            card_sku = card.get("data-product-id") or card.get("data-sku")
+            if card_sku and card_sku.upper() == sku:
+                price_elements = card.select(CSS["card_price"])
+                for el in price_elements:
+                    price_text = el.get_text(strip=True)
+                    if price_text:
+                        price_value = clean_price(price_text)
+                        if price_value is not None:
+                            print_success("Found price via search", price_value, "USD", sku)
+                            branch("search")
+                            return price_value, "USD", sku
+    except Exception:
+        pass # Search extraction failed
+    raise ValueError(f"No Wayfair search result for SKU: {sku}")
+
+def find_price_in_json(data, path="", depth=0):
+    if depth > 10: return None
+        
+    if isinstance(data, dict):
+        for key in ["currentPrice", "price", "value", "salePrice", "salesPrice", "finalPrice"]:
+            if key in data and data[key] is not None:
+                price_val = clean_price(data[key]) # clean_price returns float or None
+                if price_val is not None: return price_val
+        
+        priority_keys = ["price", "pricing", "product", "data", "props", "pageProps", "initialData", "offers"]
+        for key in priority_keys:
+            if key in data:
+                result = find_price_in_json(data[key], f"{path}.{key}", depth + 1)
+                if result is not None: return result
+        for key, value in data.items():
+            if key not in priority_keys:
+                result = find_price_in_json(value, f"{path}.{key}", depth + 1)
+                if result is not None: return result
+    elif isinstance(data, list):
+        for i, item in enumerate(data[:10]): # Limit list iteration
+            result = find_price_in_json(item, f"{path}[{i}]", depth + 1)
+            if result is not None: return result
+    return None
+
+# --- Example Usage (Optional - for testing) ---
+if __name__ == '__main__':
+    test_urls = [
+        # Replace with actual Wayfair product URLs you want to test
+        # "https://www.wayfair.com/furniture/pdp/zipcode-design-denna-armless-accent-chair-w004906494.html",
+        "https://www.wayfair.com/lighting/pdp/mercury-row-yearby-2-light-dimmable-vanity-light-w005639500.html",
+        "https://www.wayfair.com/furniture/pdp/latitude-run-sovremennoj-knopkoj-s-pugovicami-s-obivkoj-iz-lnjanoj-tkani-s-podushkami-w011415677.html",
+    ]
+
+    for product_url in test_urls:
+        print(f"\n--- Processing URL: {product_url} ---")
+        try:
+            # The print_success function is called internally by fetch_wayfair_price or its sub-functions
+            result_tuple = fetch_wayfair_price(product_url)
+            if not result_tuple: # Should be caught by ValueError, but as a fallback
+                 print(f"Failed to fetch price for {product_url}")
+            # result_tuple contains (price, currency, sku) if needed for further programmatic use
+        except ValueError as e:
+            # This catches "Could not extract SKU" or "Wayfair price not found"
+            print(f"ERROR: {e}") 
+        except curl_cffi.requests.RequestsError as e:
+            print(f"REQUESTS_ERROR: All retries failed for {product_url} - {e}")
+        except Exception as e:
+            import traceback
+            print(f"UNEXPECTED_ERROR for {product_url}: {e}")
+            traceback.print_exc()
+        print("--------------------------------------")
+        time.sleep(random.uniform(2, 5)) # Delay between processing different products
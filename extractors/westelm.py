@@ -0,0 +1,79 @@
+# extractors/westelm.py  – West Elm (internal "skus" blob)
+import json
+from bs4 import BeautifulSoup
+from helpers import _html
+from instrument import branch
+import pipeline                       # parse() may run in a worker process
+from .patterns import DOLLARS_CENTS
+
+def fetch_westelm_price(url: str):
+    """
+    1) Strip query/fragment from URL
+    2) GET HTML via _html()
+    3) Extract the internal 'skus' JSON blob
+    4) Parse it, collect all variants' sellingPrice
+    5) Return the lowest sellingPrice and its SKU
+    6) Fallback: schema.org JSON-LD
+    7) Fallback: simple price regex
+    """
+    base = url.split("?",1)[0].split("#",1)[0]
+    return pipeline.handoff(parse_westelm, _html(base), url)
+
+def parse_westelm(html: str, url: str):
+    """The parse half of fetch_westelm_price(); no I/O."""
+    # 3️⃣ locate and extract 'skus' JSON object
+    skus_idx = html.find('"skus":')
+    if skus_idx != -1:
+        start = html.find('{', skus_idx)
+        if start != -1:
+            count = 0
+            for i in range(start, len(html)):
+                if html[i] == '{': count += 1
+                elif html[i] == '}': count -= 1
+                if count == 0:
+                    end = i + 1
+                    break
+            else:
+                end = None
+            if end:
+                skus_text = html[start:end]
+                try:
+                    skus_dict = json.loads(skus_text)
+                    variants = []
+                    for sku_id, info in skus_dict.items():
+                        price_info = info.get('price', {})
+                        sp = price_info.get('sellingPrice')
+                        if sp is not None:
+                            variants.append((float(sp), sku_id))
+                    if variants:
+                        low_price, low_sku = min(variants, key=lambda x: x[0])
+                        branch("skus_blob")
+                        return low_price, 'USD', low_sku
+                except json.JSONDecodeError:
+                    pass
+
+    # 4️⃣ JSON-LD fallback
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(tag.string or '{}')
+            if isinstance(data, list):
+                data = next((d for d in data if d.get('@type')=='Product'), {})
+            if data.get('@type') == 'Product':
+                offers = data.get('offers') or {}
+                if isinstance(offers, list): offers = offers[0]
+                raw = offers.get('price')
+                if raw is not None:
+                    sku = data.get('sku') or data.get('mpn') or ''
+                    branch("json_ld")
+                    return float(raw), offers.get('priceCurrency','USD'), sku
+        except:
+            continue
+
+    # 5️⃣ regex fallback
+    m = DOLLARS_CENTS.search(html)
+    if m:
+        branch("regex")
+        return float(m.group(1).replace(',', '')), 'USD', ''
+
+    raise ValueError(f"West Elm price not found for URL: {url}")
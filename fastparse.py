@@ -0,0 +1,142 @@
+# fastparse.py  – one regex pass over raw PDP HTML for the bits we read
+#
+# Nearly every extractor only needs JSON-LD, a few <meta>/<input> tags or a
+# named JSON blob.  Page() pulls all of those out in a single scan and only
+# builds a BeautifulSoup tree (Page.dom) when a fallback needs CSS selectors.
+
+import html as _htmlmod
+import re
+from collections import namedtuple
+
+import jsonscan
+
+_TAG = re.compile(
+    r"<script\b(?P<sattrs>[^>]*)>(?P<sbody>.*?)</script\s*>"
+    r"|<(?P<tag>meta|input|link)\b(?P<attrs>[^>]*)>",
+    re.S | re.I,
+)
+_ATTR = re.compile(
+    r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+)
+
+Script = namedtuple("Script", "attrs text start")   # start = offset of text in html
+
+def _attrs(raw: str) -> dict:
+    return {
+        m.group(1).lower(): _htmlmod.unescape(
+            m.group(2) if m.group(2) is not None else
+            m.group(3) if m.group(3) is not None else m.group(4))
+        for m in _ATTR.finditer(raw)
+    }
+
+class Page:
+    """Scripts, meta, input and link tags of one HTML document."""
+
+    def __init__(self, html: str):
+        self.html    = html
+        self.scripts = []
+        self.metas   = []
+        self.inputs  = []
+        self.links   = []
+        self._ld     = None
+        self._soup   = None
+        for m in _TAG.finditer(html):
+            if m.group("sattrs") is not None:
+                self.scripts.append(
+                    Script(_attrs(m.group("sattrs")), m.group("sbody"), m.start("sbody")))
+            else:
+                bucket = {"meta": self.metas, "input": self.inputs,
+                          "link": self.links}[m.group("tag").lower()]
+                bucket.append(_attrs(m.group("attrs")))
+
+    # ── cheap look-ups ────────────────────────────────────────────────────
+    def has(self, *needles) -> bool:
+        """True if any needle occurs in the raw HTML (guards DOM fallbacks)."""
+        return any(n in self.html for n in needles)
+
+    def meta(self, key: str, attr: str = "property"):
+        """content of the first <meta attr=key>, e.g. meta('og:url')."""
+        for tag in self.metas:
+            if tag.get(attr) == key and tag.get("content"):
+                return tag["content"]
+        return None
+
+    def input_value(self, name=None, id=None, name_re=None):
+        """value of the first <input> matching name / id / name regex."""
+        for tag in self.inputs:
+            if name is not None and tag.get("name") != name:
+                continue
+            if id is not None and tag.get("id") != id:
+                continue
+            if name_re is not None and not name_re.search(tag.get("name", "")):
+                continue
+            if tag.get("value"):
+                return tag["value"]
+        return None
+
+    def link_href(self, rel: str):
+        for tag in self.links:
+            if rel in tag.get("rel", "").split() and tag.get("href"):
+                return tag["href"]
+        return None
+
+    def script_by_id(self, script_id: str):
+        for s in self.scripts:
+            if s.attrs.get("id") == script_id:
+                return s.text
+        return None
+
+    # ── JSON ──────────────────────────────────────────────────────────────
+    def json_ld(self) -> list:
+        """Every decodable application/ld+json block, in document order."""
+        if self._ld is None:
+            self._ld = []
+            for s in self.scripts:
+                if s.attrs.get("type", "").lower() == "application/ld+json":
+                    try:
+                        self._ld.append(jsonscan.loads(s.text))
+                    except ValueError:
+                        continue
+        return self._ld
+
+    def ld_products(self):
+        """Yield JSON-LD objects whose @type is Product (lists flattened)."""
+        for data in self.json_ld():
+            for d in (data if isinstance(data, list) else [data]):
+                if isinstance(d, dict) and d.get("@type") == "Product":
+                    yield d
+
+    def blob_text(self, name: str):
+        """
+        Locate a named JSON blob without decoding it: <script id=name>,
+        `name = {…}` inside a script, or an application/json script
+        mentioning `name`.  Returns (script text, offset of the value) or None.
+        """
+        assign = re.compile(r"\b" + re.escape(name) + r"\s*=\s*")
+        for s in self.scripts:
+            if s.attrs.get("id") == name:
+                return s.text, 0
+            m = assign.search(s.text)
+            if m:
+                return s.text, m.end()
+            if name in s.text and s.attrs.get("type", "").lower() == "application/json":
+                return s.text, 0
+        return None
+
+    def blob(self, name: str):
+        """Decode the blob found by blob_text(); None when absent or undecodable."""
+        found = self.blob_text(name)
+        if found is None:
+            return None
+        text, idx = found
+        try:
+            return jsonscan.value_at(text, idx)[0]
+        except ValueError:
+            return None
+
+    # ── full DOM, only when a fallback needs selectors ────────────────────
+    def dom(self, parser: str = "lxml"):
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.html, parser)
+        return self._soup
@@ -1,14 +1,21 @@
-# helpers.py  – shared utilities (headers, polite rate-limit, HTTP wrapper)
+# helpers.py  – shared utilities (headers, pauses, HTTP wrapper)
 
+import asyncio
+import json
 import random
 import re
 import time
 import urllib.parse
-from collections import defaultdict
-from threading import Lock
+import weakref
+from threading import Thread
 
 import curl_cffi
 
+import http_cache                    # ETag / Last-Modified revalidation
+import instrument                    # per-fetch phase timings
+import ratelimit                     # adaptive per-host token buckets
+import sessions                      # pooled keep-alive sessions per host
+
 # ────────────────────────────────── HEADERS ──────────────────────────────────
 UA_DESKTOP = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -32,55 +39,193 @@ HEADERS = {
     "Sec-Fetch-User":  "?1",
 }
 
-# ───────────────────────────── rate-limit decorator ──────────────────────────
-_RATE_LOCK   = Lock()
-_LAST_HIT    = defaultdict(float)    # domain → last request timestamp
-
-PER_DOMAIN_DELAY = {                 # seconds between hits to same domain
-    "amazon.com":   3,
-    "target.com":   2,
-    "walmart.com":  2,
-    "babylist.com": 2,
-}
+# ─────────────────────────────── pauses / domains ────────────────────────────
+# Request pacing lives in ratelimit.py: sessions.get() and _acached_get()
+# take a token from the host's bucket before every request.
 
-def polite(func):
-    """Throttle outbound HTTP so we never hammer one host too fast."""
-    def wrapper(url: str, *args, **kwargs):
-        dom = urllib.parse.urlparse(url).netloc.split(":")[0].lower()
-        base_dom = ".".join(dom.split(".")[-2:])      # strip subdomain
+_WAITS = True                        # False while replaying captured pages offline
 
-        min_delay = PER_DOMAIN_DELAY.get(base_dom, 1.5)
-        with _RATE_LOCK:
-            elapsed  = time.time() - _LAST_HIT[base_dom]
-            wait_for = max(0, min_delay - elapsed)
-            _LAST_HIT[base_dom] = time.time() + wait_for
+def set_waits(on: bool) -> None:
+    """Turn rate-limit waits and pause() sleeps on or off (replay.py)."""
+    global _WAITS
+    _WAITS = on
+    ratelimit.limiter().enabled = on
 
-        if wait_for:
-            time.sleep(wait_for + random.uniform(0, 0.75))  # jitter
+def base_domain(url: str) -> str:
+    """'https://www.walmart.com/ip/1' → 'walmart.com' (scheduler / report key)."""
+    dom = urllib.parse.urlparse(url).netloc or url
+    dom = dom.split(":")[0].lower()
+    return ".".join(dom.split(".")[-2:])             # strip subdomain
 
-        return func(url, *args, **kwargs)
-    return wrapper
+def pause(low: float, high: float = None, phase: str = "sleep") -> None:
+    """
+    time.sleep(low), or a random time between `low` and `high`, charged to
+    `phase` in instrument.py – use it for any fixed wait in an extractor.
+    """
+    if not _WAITS:
+        return
+    with instrument.phase(phase):
+        time.sleep(low if high is None else random.uniform(low, high))
 
 # ──────────────────────────── HTTP helper functions ─────────────────────────
-@polite
 def _html(url: str) -> str:
-    """Return page HTML with Chrome-124 TLS fingerprint + polite delay."""
-    return curl_cffi.requests.get(
-        url,
-        headers=HEADERS,
-        impersonate="chrome124",
-        timeout=20,
-    ).text
+    """Return page HTML with Chrome-124 TLS fingerprint, rate-limited per host."""
+    if _ENGINE is not None:
+        return _ENGINE.run(_ahtml(url))
+    return _html_blocking(url)
 
-@polite
 def _get_json(url: str):
     """GET → .json() with rate-limit & impersonation."""
-    return curl_cffi.requests.get(
+    if _ENGINE is not None:
+        return _ENGINE.run(_aget_json(url))
+    return _get_json_blocking(url)
+
+JSON_HEADERS = {"Accept": "application/json", **HEADERS}
+
+def _body(cache, url, validators, resp):
+    """
+    Settle a (possibly conditional) response into (body bytes, encoding).
+    Returns None when a 304 arrives but the cached copy is gone, so the
+    caller re-fetches unconditionally.
+    """
+    if resp.status_code == 304 and validators:
+        return cache.load(url)
+    if cache is not None and resp.status_code == 200:
+        cache.store(url, resp.headers, resp.content, resp.encoding)
+    return resp.content, resp.encoding
+
+def _decode(body: bytes, encoding) -> str:
+    return body.decode(encoding or "utf-8", errors="replace")
+
+def _cached_get(url: str, headers: dict, impersonate="chrome124", timeout=20):
+    """
+    GET through the pooled session, revalidating against http_cache.
+    Returns (status, body bytes, encoding); a 304 served from the cache
+    counts as 200.
+    """
+    cache      = http_cache.get_cache()
+    validators = cache.conditional_headers(url) if cache else {}
+    resp = sessions.get(
         url,
-        headers={"Accept": "application/json", **HEADERS},
-        impersonate="chrome124",
-        timeout=20,
-    ).json()
+        headers={**headers, **validators},
+        impersonate=impersonate,
+        timeout=timeout,
+    )
+    got = _body(cache, url, validators, resp)
+    if got is None:
+        resp = sessions.get(url, headers=headers,
+                            impersonate=impersonate, timeout=timeout)
+        got  = _body(cache, url, {}, resp)
+    return (200 if resp.status_code == 304 else resp.status_code), *got
+
+def _get_text(url: str, headers: dict = None, impersonate="chrome124", timeout=20):
+    """
+    (status, text) of a GET with the extractor's own headers / fingerprint
+    (Walmart, RedSky), revalidated against http_cache like _html().
+    """
+    status, body, encoding = _cached_get(url, headers or {}, impersonate, timeout)
+    return status, _decode(body, encoding)
+
+def _html_blocking(url: str) -> str:
+    return _decode(*_cached_get(url, HEADERS)[1:])
+
+def _get_json_blocking(url: str):
+    return json.loads(_cached_get(url, JSON_HEADERS)[1])
+
+# ───────────────────────────── async fetch engine ────────────────────────────
+_ASESSIONS = weakref.WeakKeyDictionary()     # event loop → AsyncSession
+
+def _async_session():
+    """One curl_cffi AsyncSession per running event loop."""
+    loop = asyncio.get_running_loop()
+    sess = _ASESSIONS.get(loop)
+    if sess is None:
+        sess = _ASESSIONS[loop] = curl_cffi.requests.AsyncSession(
+            impersonate="chrome124",
+            timeout=20,
+            curl_infos=list(sessions.CURL_INFOS),
+        )
+    return sess
+
+async def _aget(url: str, headers: dict):
+    """One async GET: limiter token, request, accounting, limiter feedback."""
+    limiter = ratelimit.limiter()
+    await limiter.wait_async(url)
+    with instrument.phase("network"):
+        resp = await _async_session().get(url, headers=headers)
+    sessions.account(resp)
+    limiter.feedback(url, resp)
+    return resp
+
+async def _acached_get(url: str, headers: dict):
+    """Async _cached_get()."""
+    if sessions.transport() is not None:     # recording / replaying: no async session
+        return (await asyncio.to_thread(_cached_get, url, headers))[1:]
+    cache      = http_cache.get_cache()
+    validators = cache.conditional_headers(url) if cache else {}
+    resp = await _aget(url, {**headers, **validators})
+    got  = _body(cache, url, validators, resp)
+    if got is None:
+        resp = await _aget(url, headers)
+        got  = _body(cache, url, {}, resp)
+    return got
+
+async def _ahtml(url: str) -> str:
+    """Async _html(): same headers/fingerprint, rate-limit waits on the loop."""
+    return _decode(*await _acached_get(url, HEADERS))
+
+async def _aget_json(url: str):
+    """Async _get_json()."""
+    return json.loads((await _acached_get(url, JSON_HEADERS))[0])
+
+class AsyncEngine:
+    """
+    Event loop on a daemon thread that blocking code can hand coroutines to.
+
+    While an engine is enabled, _html()/_get_json() route through it, so the
+    sync extractors keep their signatures but every limiter wait and
+    socket read is parked on one loop instead of pinning a thread each.
+    Coroutines run in a copy of the submitting thread's context, so the
+    caller's open instrument.call() sees their throttle/network time.
+    """
+
+    def __init__(self):
+        # selector loop: curl_cffi needs add_reader(), which Proactor lacks
+        self.loop   = asyncio.SelectorEventLoop()
+        self.thread = Thread(target=self.loop.run_forever,
+                             name="http-async", daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout=None):
+        """Run `coro` on the engine loop and block for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self) -> None:
+        async def _close_session():
+            sess = _ASESSIONS.pop(self.loop, None)
+            if sess is not None:
+                await sess.close()
+
+        self.run(_close_session())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+_ENGINE = None
+
+def enable_async_engine() -> AsyncEngine:
+    """Route _html/_get_json through a shared AsyncEngine (idempotent)."""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = AsyncEngine()
+    return _ENGINE
+
+def disable_async_engine() -> None:
+    """Shut the engine down; _html/_get_json go back to blocking calls."""
+    global _ENGINE
+    engine, _ENGINE = _ENGINE, None
+    if engine is not None:
+        engine.close()
 
 def _clean(txt) -> float:
     """Strip $, commas, spaces → float."""
@@ -0,0 +1,126 @@
+# http_cache.py  – on-disk conditional-GET cache for product pages
+#
+# Stores the last 200 body (zlib-compressed) with its ETag / Last-Modified.
+# The next fetch sends If-None-Match / If-Modified-Since; on 304 the cached
+# body is served instead of re-downloading the whole PDP.
+
+import sqlite3
+import threading
+import time
+import zlib
+
+CACHE_DB  = "http_cache.sqlite"
+MAX_AGE   = 21 * 24 * 3600        # drop validators older than three weekly runs
+MAX_BYTES = 256 * 1024 * 1024     # compressed bodies kept before LRU eviction
+
+class HttpCache:
+    """SQLite-backed URL → (validators, compressed body) store; thread-safe."""
+
+    def __init__(self, path=CACHE_DB, max_age=MAX_AGE, max_bytes=MAX_BYTES):
+        self.max_age   = max_age
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._conn     = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                encoding      TEXT,
+                stored_at     REAL,
+                last_used     REAL,
+                size          INTEGER,
+                body          BLOB
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS http_cache_lru ON http_cache (last_used)")
+        self._conn.commit()
+
+    def conditional_headers(self, url: str) -> dict:
+        """Validators to send for `url` (empty if nothing fresh is cached)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, stored_at FROM http_cache WHERE url=?",
+                (url,)).fetchone()
+        if row is None:
+            return {}
+        etag, last_modified, stored_at = row
+        if time.time() - stored_at > self.max_age:
+            self.forget(url)
+            return {}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def load(self, url: str):
+        """(body bytes, encoding) for a 304, or None if it was evicted."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT body, encoding FROM http_cache WHERE url=?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE http_cache SET last_used=? WHERE url=?", (time.time(), url))
+        return zlib.decompress(row[0]), row[1]
+
+    def store(self, url: str, headers, body: bytes, encoding=None) -> None:
+        """Remember a 200 response if the server gave us any validator."""
+        etag          = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        blob = zlib.compress(body, 6)
+        now  = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?,?,?,?,?,?,?,?)",
+                (url, etag, last_modified, encoding, now, now, len(blob), blob))
+            self._evict_locked()
+
+    def forget(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM http_cache WHERE url=?", (url,))
+
+    def _evict_locked(self) -> None:
+        self._conn.execute("DELETE FROM http_cache WHERE stored_at < ?",
+                           (time.time() - self.max_age,))
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # walk least-recently-used rows until enough bytes are freed
+        doomed, excess = [], total - self.max_bytes
+        for url, size in self._conn.execute(
+                "SELECT url, size FROM http_cache ORDER BY last_used"):
+            if excess <= 0:
+                break
+            doomed.append((url,))
+            excess -= size
+        self._conn.executemany("DELETE FROM http_cache WHERE url=?", doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_CACHE = None
+
+def get_cache():
+    """The shared HttpCache, or None while caching is disabled."""
+    return _CACHE
+
+def enable(path=CACHE_DB, **kwargs) -> HttpCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = HttpCache(path, **kwargs)
+    return _CACHE
+
+def disable() -> None:
+    global _CACHE
+    cache, _CACHE = _CACHE, None
+    if cache is not None:
+        cache.close()
@@ -0,0 +1,285 @@
+# instrument.py  – per-fetch phase timings + which extractor branch won
+#
+# run_weekly.scrape() opens one Call per product fetch.  Code on the hot
+# path charges its time to the open call with `phase(name)`:
+#
+#   throttle   ratelimit.py token waits (including 429 / captcha pauses)
+#   connect    TCP + TLS handshake, from curl's timers (0 on a reused socket)
+#   network    rest of each HTTP round trip; `bytes` counts the bodies
+#   browser    waiting for / launching a pooled Chrome
+#   render     driver.get() and the WebDriver waits after it
+#   sleep      fixed "human" pauses (helpers.pause)
+#   parse      extractor time not claimed by any phase above
+#   db         handing the rows to the PriceWriter
+#
+# Phases nest exclusively: time spent in an inner phase is not also
+# charged to the outer one, so the phases of a call add up to (nearly)
+# its total.  `branch(label)` records which fallback produced the price.
+# With no call open (bench.py, ad-hoc use) every hook is a no-op.
+#
+# A fetch whose parse was handed to pipeline.py's pool is hold()-ed: its
+# Call outlives the call() block, the pool thread's parse time is merged
+# in, the rows are saved under reenter(), and finish() records it.
+#
+# save() appends the finished calls to the `call_metrics` table in
+# prices.sqlite under the run id; report() / `python instrument.py`
+# summarises a run per retailer.
+
+import argparse
+import contextvars
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+PHASES = ("throttle", "connect", "network", "browser", "render",
+          "sleep", "parse", "db")
+
+SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS call_metrics (
+        run_id   TEXT NOT NULL,
+        domain   TEXT NOT NULL,
+        url      TEXT NOT NULL,
+        started  REAL NOT NULL,           -- unix time
+        outcome  TEXT NOT NULL,           -- 'ok' | 'fail'
+        branch   TEXT,                    -- extractor strategy that won
+        error    TEXT,
+        total    REAL NOT NULL,           -- seconds, whole fetch
+        {", ".join(f"{p} REAL NOT NULL DEFAULT 0" for p in PHASES)},
+        requests INTEGER NOT NULL DEFAULT 0,
+        bytes    INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS call_metrics_run ON call_metrics(run_id, domain)
+"""
+
+class Call:
+    """Timings for one product fetch; see the module comment for phases."""
+
+    def __init__(self, domain, url):
+        self.domain   = domain
+        self.url      = url
+        self.started  = time.time()
+        self.total    = 0.0
+        self.outcome  = "ok"
+        self.branch   = None
+        self.error    = None
+        self.requests = 0
+        self.bytes    = 0
+        self.phases   = dict.fromkeys(PHASES, 0.0)
+        self._stack   = []                # [phase name, start of current slice]
+        self._t0      = time.perf_counter()
+        self._held    = False
+        self._lock    = threading.Lock()  # a pool thread may merge() meanwhile
+
+    def fail(self, error) -> None:
+        self.outcome, self.error = "fail", str(error)[:500]
+
+    def hold(self) -> None:
+        """Keep the call open past its call() block, until finish()."""
+        self._held = True
+
+    def finish(self) -> None:
+        """Stop the clock and keep the call for save()."""
+        self.total = time.perf_counter() - self._t0
+        with _LOCK:
+            _FINISHED.append(self)
+
+    def merge(self, other) -> None:
+        """Add the phases / requests / branch timed on a detached() Call."""
+        with self._lock:
+            for name, secs in other.phases.items():
+                self.phases[name] += secs
+            self.requests += other.requests
+            self.bytes    += other.bytes
+            self.branch    = other.branch or self.branch
+
+    def _enter(self, name) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            if self._stack:               # pause the enclosing phase
+                outer = self._stack[-1]
+                self.phases[outer[0]] += now - outer[1]
+            self._stack.append([name, now])
+
+    def _exit(self) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            name, since = self._stack.pop()
+            self.phases[name] += now - since
+            if self._stack:               # … and resume it
+                self._stack[-1][1] = now
+
+    def row(self, run_id) -> tuple:
+        return (run_id, self.domain, self.url, self.started, self.outcome,
+                self.branch, self.error, round(self.total, 4),
+                *(round(self.phases[p], 4) for p in PHASES),
+                self.requests, self.bytes)
+
+_CURRENT  = contextvars.ContextVar("instrument_call", default=None)
+_FINISHED = []                            # Calls not yet save()d
+_LOCK     = threading.Lock()
+
+@contextmanager
+def call(domain, url):
+    """
+    Open a Call for one fetch; it is kept for save() when the block ends,
+    unless it was hold()-ed – then when finish() is called.
+    """
+    rec   = Call(domain, url)
+    token = _CURRENT.set(rec)
+    try:
+        yield rec
+    except BaseException as e:
+        rec.fail(e)
+        raise
+    finally:
+        _CURRENT.reset(token)
+        if not rec._held:
+            rec.finish()
+
+@contextmanager
+def reenter(rec):
+    """Make a held Call the open one again (on whichever thread settles it)."""
+    token = _CURRENT.set(rec)
+    try:
+        yield rec
+    finally:
+        _CURRENT.reset(token)
+
+@contextmanager
+def phase(name):
+    """Charge the enclosed time to `name` on the open call (if any)."""
+    rec = _CURRENT.get()
+    if rec is None:
+        yield
+        return
+    rec._enter(name)
+    try:
+        yield
+    finally:
+        rec._exit()
+
+@contextmanager
+def detached():
+    """
+    A throwaway Call for code running outside the fetch's context
+    (pipeline.py's parser processes and pool threads); read its `branch`
+    afterwards, or merge() it into the fetch's Call.
+    """
+    rec   = Call("", "")
+    token = _CURRENT.set(rec)
+    try:
+        yield rec
+    finally:
+        _CURRENT.reset(token)
+
+def current():
+    """The Call open in this context, or None."""
+    return _CURRENT.get()
+
+def branch(label: str) -> None:
+    """Record which strategy produced the price (last call wins)."""
+    rec = _CURRENT.get()
+    if rec is not None:
+        rec.branch = label
+
+def response(nbytes, connect=0.0) -> None:
+    """
+    Account one finished HTTP response: body size and handshake seconds.
+    Call right after the request's `network` phase has closed.
+    """
+    rec = _CURRENT.get()
+    if rec is None:
+        return
+    with rec._lock:
+        rec.requests += 1
+        rec.bytes    += nbytes or 0
+        connect = min(connect or 0.0, rec.phases["network"])
+        rec.phases["network"] -= connect
+        rec.phases["connect"] += connect
+
+# ── persistence / report ─────────────────────────────────────────────────
+def _connect(path=None) -> sqlite3.Connection:
+    import price_tracker           # lazily: helpers imports this module early
+
+    conn = sqlite3.connect(path or price_tracker.DB, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+def save(run_id, path=None) -> int:
+    """Append every finished call to `call_metrics`; returns how many."""
+    with _LOCK:
+        calls = _FINISHED[:]
+        _FINISHED.clear()
+    if not calls:
+        return 0
+    conn = _connect(path)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT INTO call_metrics VALUES ({','.join('?' * (10 + len(PHASES)))})",
+                [c.row(run_id) for c in calls])
+    finally:
+        conn.close()
+    return len(calls)
+
+def latest_run(path=None):
+    """Run id of the most recently started instrumented call."""
+    conn = _connect(path)
+    try:
+        row = conn.execute(
+            "SELECT run_id FROM call_metrics ORDER BY started DESC LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+def report(run_id=None, path=None) -> str:
+    """
+    Per-retailer summary of one run: calls, failures, mean seconds per
+    phase, KiB downloaded and how often each branch produced the price.
+    """
+    run_id = run_id or latest_run(path)
+    conn   = _connect(path)
+    try:
+        rows = conn.execute(
+            f"SELECT domain, outcome, branch, total, {', '.join(PHASES)}, bytes "
+            "FROM call_metrics WHERE run_id = ?", (run_id,)).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return f"[METRICS] no calls recorded for run {run_id}"
+
+    by_dom = defaultdict(list)
+    for r in rows:
+        by_dom[r[0]].append(r)
+
+    cols  = ("total",) + PHASES
+    lines = [f"[METRICS] run {run_id}: {len(rows)} calls, mean seconds per call",
+             f"{'domain':<24}{'calls':>6}{'fail':>5}"
+             + "".join(f"{c:>9}" for c in cols) + f"{'KiB':>8}  branches"]
+    sums = dict.fromkeys(cols, 0.0)
+    for dom in sorted(by_dom, key=lambda d: -sum(r[3] for r in by_dom[d])):
+        group = by_dom[dom]
+        n     = len(group)
+        fails = sum(r[1] != "ok" for r in group)
+        means = [sum(r[3 + i] for r in group) / n for i in range(len(cols))]
+        for c, m in zip(cols, means):
+            sums[c] += m * n
+        kib   = sum(r[-1] for r in group) / n / 1024
+        wins  = Counter(r[2] or "?" for r in group if r[1] == "ok")
+        lines.append(f"{dom:<24}{n:>6}{fails:>5}"
+                     + "".join(f"{m:>9.2f}" for m in means) + f"{kib:>8.0f}  "
+                     + ", ".join(f"{b} {k}" for b, k in wins.most_common()))
+    lines.append(f"{'all (sum, s)':<35}"
+                 + "".join(f"{sums[c]:>9.0f}" for c in cols))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import price_tracker
+
+    ap = argparse.ArgumentParser(description="Per-retailer timing report for a run")
+    ap.add_argument("--run-id", help="default: the latest instrumented run")
+    ap.add_argument("--db", default=None, help=f"default: {price_tracker.DB}")
+    args = ap.parse_args()
+    print(report(args.run_id, args.db))
@@ -0,0 +1,139 @@
+# jobqueue.py  – persistent per-run work queue so a crashed run can resume
+#
+# One `jobs` row per product fetch, keyed by (run_id, product key), living
+# in prices.sqlite next to the price history.  States:
+#
+#   pending → running (leased) → done | failed
+#
+# A restart with the same run id (default: the ISO week) only re-queues
+# jobs that aren't done: pending ones, failed ones with attempts left, and
+# running ones whose lease expired (the process holding them died/hung).
+# `done` is buffered and only written after the PriceWriter has committed
+# that product's rows (see checkpoint), so "done" never outruns the data.
+
+import datetime
+import json
+import sqlite3
+import threading
+import time
+
+import price_tracker
+
+LEASE_SECONDS = 15 * 60   # a fetch still "running" after this is presumed dead
+MAX_ATTEMPTS  = 3         # per job, across restarts of the same run
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        run_id      TEXT NOT NULL,
+        job_key     TEXT NOT NULL,
+        domain      TEXT NOT NULL,
+        fetch_url   TEXT NOT NULL,
+        rows        TEXT NOT NULL,        -- JSON [[art_no, competitor, url], …]
+        state       TEXT NOT NULL DEFAULT 'pending',
+        attempts    INTEGER NOT NULL DEFAULT 0,
+        lease_until REAL,
+        error       TEXT,
+        updated     REAL,
+        PRIMARY KEY (run_id, job_key)
+    ) WITHOUT ROWID
+"""
+
+def current_run_id(today=None, daily=False) -> str:
+    """'2025-W21' – one run per ISO week; '2025-05-21' for daily runs."""
+    today = today or datetime.date.today()
+    if daily:
+        return today.isoformat()
+    year, week, _ = today.isocalendar()
+    return f"{year}-W{week:02d}"
+
+class JobQueue:
+    """SQLite-backed job states for one run id; thread-safe."""
+
+    def __init__(self, path=None, run_id=None, lease_seconds=LEASE_SECONDS,
+                 max_attempts=MAX_ATTEMPTS):
+        self.run_id        = run_id or current_run_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts  = max_attempts
+        self._lock = threading.Lock()
+        self._done = []                       # keys finished since last checkpoint
+        self._conn = sqlite3.connect(path or price_tracker.DB, timeout=30,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(SCHEMA)
+
+    def reset(self) -> None:
+        """Forget this run's jobs (start over instead of resuming)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE run_id=?", (self.run_id,))
+
+    def enqueue(self, jobs) -> None:
+        """Add (key, domain, fetch_url, rows) jobs; known keys keep their state."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, job_key, domain, fetch_url, rows, updated) "
+                "VALUES (?,?,?,?,?,?)",
+                [(self.run_id, key, domain, url, json.dumps(rows), now)
+                 for key, domain, url, rows in jobs])
+
+    def runnable(self) -> list:
+        """(key, domain, fetch_url, rows) for every job this run still owes."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT job_key, domain, fetch_url, rows FROM jobs
+                 WHERE run_id = ?
+                   AND (state = 'pending'
+                        OR (state = 'failed'  AND attempts < ?)
+                        OR (state = 'running' AND lease_until < ?))
+                 ORDER BY job_key
+            """, (self.run_id, self.max_attempts, time.time())).fetchall()
+        return [(key, dom, url, [tuple(r) for r in json.loads(rs)])
+                for key, dom, url, rs in rows]
+
+    def claim(self, key) -> None:
+        """Mark `key` running under a fresh lease."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state='running', attempts=attempts+1, "
+                "lease_until=?, updated=? WHERE run_id=? AND job_key=?",
+                (now + self.lease_seconds, now, self.run_id, key))
+
+    def done(self, key) -> None:
+        """Buffered; written by the next checkpoint()."""
+        with self._lock:
+            self._done.append(key)
+
+    def failed(self, key, error) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state='failed', error=?, lease_until=NULL, updated=? "
+                "WHERE run_id=? AND job_key=?",
+                (str(error)[:500], time.time(), self.run_id, key))
+
+    def checkpoint(self) -> None:
+        """Persist buffered `done` states (call once their rows are committed)."""
+        with self._lock:
+            if not self._done:
+                return
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE jobs SET state='done', error=NULL, lease_until=NULL, updated=? "
+                    "WHERE run_id=? AND job_key=?",
+                    [(now, self.run_id, key) for key in self._done])
+            self._done.clear()
+
+    def summary(self) -> dict:
+        """state → job count for this run."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT state, count(*) FROM jobs WHERE run_id=? GROUP BY state",
+                (self.run_id,)).fetchall())
+
+    def close(self) -> None:
+        """Final checkpoint – close the PriceWriter first so its rows are in."""
+        self.checkpoint()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,110 @@
+# jsonscan.py  – pull a few fields out of a big embedded JSON blob
+#
+# Walmart's __PRELOADED_STATE__, Wayfair's __WF_DATA__ and Kohl's
+# productV2JsonData run to hundreds of KB, and we want two or three values
+# from each.  Instead of building the whole object graph we search the raw
+# text for `"key":` and decode only the value sitting at that offset.
+# member() walks a strict path of direct members, so a key repeated in a
+# carousel, variant or sponsored product never stands in for the page's own.
+# Full decodes (the fallbacks) go through orjson when it is installed.
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:                   # optional – stdlib is fine, just slower
+    orjson = None
+
+_DECODER = json.JSONDecoder()
+_WS      = re.compile(r"\s*")
+_KEYS    = {}                         # key → compiled `"key"\s*:\s*` pattern
+
+def loads(text):
+    """Full decode of `text` (orjson if available, else stdlib)."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def _key_re(key: str):
+    pat = _KEYS.get(key)
+    if pat is None:
+        pat = _KEYS[key] = re.compile(r'"' + re.escape(key) + r'"\s*:\s*')
+    return pat
+
+def find(text: str, key: str, start: int = 0, end=None) -> int:
+    """Offset of the value of the first `"key":` in text[start:end], or -1."""
+    m = _key_re(key).search(text, start, len(text) if end is None else end)
+    return m.end() if m else -1
+
+def value_at(text: str, idx: int):
+    """(value, end offset) of the JSON value starting at `idx`."""
+    return _DECODER.raw_decode(text, _WS.match(text, idx).end())
+
+def first(text: str, key: str, start: int = 0, default=None):
+    """Decoded value of the first `"key":` at or after `start`."""
+    idx = find(text, key, start)
+    if idx < 0:
+        return default
+    try:
+        return value_at(text, idx)[0]
+    except ValueError:
+        return default
+
+def path(text: str, *keys, start: int = 0, default=None):
+    """
+    Value reached by matching `keys` in order, each one after the previous
+    match – e.g. path(blob, "product", "price", "value").  Only the last
+    value is decoded.  Keys are found as descendants, not strict children,
+    so pick distinctive ones and keep a full-decode fallback.
+    """
+    idx = start
+    for key in keys:
+        idx = find(text, key, idx)
+        if idx < 0:
+            return default
+    try:
+        return value_at(text, idx)[0]
+    except ValueError:
+        return default
+
+def _depth(text: str, start: int, end: int) -> int:
+    """Net { / [ nesting opened in text[start:end], string contents skipped."""
+    seg = text[start:end]
+    if "\\" in seg:                       # escapes can't fake or hide a quote
+        seg = seg.replace("\\\\", "").replace('\\"', "")
+    seg = "".join(seg.split('"')[::2])    # outside the quotes
+    return seg.count("{") + seg.count("[") - seg.count("}") - seg.count("]")
+
+def locate(text: str, start: int, *keys) -> int:
+    """
+    Offset of the value at the strict path `keys` below the object starting
+    at `start` (0, or a find() / blob offset), or -1.  Each key must be a
+    direct member of the object before it; nothing is decoded, only the
+    braces between matches are counted.
+    """
+    idx = _WS.match(text, start).end()
+    for key in keys:
+        if not text.startswith("{", idx):
+            return -1
+        pos, depth = idx, 0
+        while True:
+            m = _key_re(key).search(text, pos)
+            if m is None:
+                return -1
+            depth += _depth(text, pos, m.start())
+            if depth == 1:
+                break
+            if depth < 1:                 # walked out of the object
+                return -1
+            pos = m.end()
+        idx = _WS.match(text, m.end()).end()
+    return idx
+
+def member(text: str, start: int, *keys, default=None):
+    """Decoded value at locate(text, start, *keys), else `default`."""
+    idx = locate(text, start, *keys)
+    if idx < 0:
+        return default
+    try:
+        return value_at(text, idx)[0]
+    except ValueError:
+        return default
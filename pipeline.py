@@ -0,0 +1,232 @@
+# pipeline.py  – parse downloaded pages in a process pool, off the I/O threads
+#
+# Every extractor is split into a fetch half that runs on the scheduler's
+# per-domain thread and a pure `parse_<retailer>(html, url)` half that goes
+# through parse() here.  With a ParsePool enabled the parse runs in a worker
+# process, so lxml trees, big json.loads and regex scans for one retailer
+# stop holding the GIL while the other domains' threads wait on sockets;
+# without one it runs inline.  Page sinks (archive.Archive) may keep each
+# page with its outcome for re-parsing or auditing later.
+#
+# Inside a deferred() block (run_weekly.scrape() opens one per product) an
+# extractor's last page goes through handoff() instead: it returns a Future
+# as soon as the page is queued, the I/O thread moves on to its next
+# download, and the caller saves the price when the Future completes.
+# Pool threads only parse: when first_price()'s page doesn't parse, the
+# next page is fetched by the domain's own worker, ahead of its other jobs
+# (DomainScheduler.hold()).  Pages that need the previous page's result
+# first (BestBuy's retries) keep the blocking parse().
+#
+# The hand-off is bounded: at most PENDING_PER_WORKER pages per worker are
+# queued or being parsed, and an I/O thread that gets further ahead blocks
+# until a parser frees up, so downloaded pages never pile up in memory.
+
+import concurrent.futures
+import contextvars
+import multiprocessing
+import os
+import threading
+from contextlib import contextmanager
+
+import instrument
+
+PARSE_WORKERS      = max(1, (os.cpu_count() or 2) - 1)
+PENDING_PER_WORKER = 2
+
+def _run(fn, html, url):
+    """Worker side: parse, and bring the winning branch label back."""
+    with instrument.detached() as rec:
+        return fn(html, url), rec.branch
+
+class ParsePool:
+    """Worker processes running pure parse functions (module-level, picklable)."""
+
+    def __init__(self, workers=PARSE_WORKERS, pending=None):
+        self.workers   = workers
+        # spawn, not fork: the parent has live threads, sockets and sqlite handles
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"))
+        pending        = pending or PENDING_PER_WORKER * workers
+        self._slots    = threading.BoundedSemaphore(pending)
+        # one thread per handed-off page: waits for its parse, runs the
+        # sinks, then completes the caller's Future; never touches the network
+        self._handoffs = threading.BoundedSemaphore(pending)
+        self._settle   = concurrent.futures.ThreadPoolExecutor(
+            pending, thread_name_prefix="parse-settle")
+
+    def parse(self, fn, html: str, url: str):
+        """fn(html, url) in a worker; blocks while the hand-off queue is full."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_run, fn, html, url)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        result, label = future.result()
+        if label:
+            instrument.branch(label)
+        return result
+
+    def defer(self, work, *args) -> concurrent.futures.Future:
+        """
+        Future of work(*args), run on a settle thread in the caller's
+        context; blocks while the hand-off queue is full.
+        """
+        self._handoffs.acquire()
+        try:
+            future = self._settle.submit(contextvars.copy_context().run,
+                                         _settle, work, *args)
+        except BaseException:
+            self._handoffs.release()
+            raise
+        future.add_done_callback(lambda _: self._handoffs.release())
+        return future
+
+    def close(self) -> None:
+        self._settle.shutdown(wait=True)      # handed-off pages finish first
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+def _settle(work, *args):
+    """
+    Settle-thread side of defer().  The I/O thread may still be timing the
+    fetch's Call, so this side is timed as `parse` on a detached one and
+    merged into it.
+    """
+    outer = instrument.current()
+    with instrument.detached() as rec:
+        try:
+            with instrument.phase("parse"):
+                return work(*args)
+        finally:
+            if outer is not None:
+                outer.merge(rec)
+
+_POOL = None
+_SINKS = []            # archive.Archive while enabled
+_DEFER = contextvars.ContextVar("pipeline_defer", default=None)   # hold()
+
+def enable_parse_pool(workers=PARSE_WORKERS) -> ParsePool:
+    """Send parse() to a shared ParsePool (idempotent)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ParsePool(workers)
+    return _POOL
+
+def disable_parse_pool() -> None:
+    """Settle every handed-off page, stop the workers; parse() runs inline."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.close()               # settling pages still parse in the pool
+        _POOL = None
+
+def add_page_sink(sink) -> None:
+    """Hand every parsed page to `sink.keep(url, seq, fn, html, result, error)`."""
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+def remove_page_sink(sink) -> None:
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+def parse(fn, html: str, url: str, seq: int = 0):
+    """
+    fn(html, url), in the parse pool if one is enabled.  `seq` numbers the
+    pages of one fetch (first_price()); sinks start a new fetch at 0.
+    """
+    try:
+        result = _POOL.parse(fn, html, url) if _POOL is not None else fn(html, url)
+    except Exception as e:
+        for sink in _SINKS:
+            sink.keep(url, seq, fn, html, None, e)
+        raise
+    for sink in _SINKS:
+        sink.keep(url, seq, fn, html, result, None)
+    return result
+
+@contextmanager
+def deferred(hold):
+    """
+    While the block runs, handoff() and first_price() may return a Future
+    instead of the result (only with a parse pool enabled).  `hold()` is
+    DomainScheduler.hold for the caller's domain: first_price() uses it to
+    fetch fallback pages on that domain's worker.
+    """
+    token = _DEFER.set(hold)
+    try:
+        yield
+    finally:
+        _DEFER.reset(token)
+
+def handoff(fn, html: str, url: str, seq: int = 0):
+    """
+    parse() for an extractor's last page.  Inside deferred() with a pool
+    enabled, returns a Future of the result once the page is queued.
+    """
+    if _POOL is None or _DEFER.get() is None:
+        return parse(fn, html, url, seq)
+    return _POOL.defer(parse, fn, html, url, seq)
+
+def _first_price(url, steps, not_found):
+    error = ValueError(f"No page could be fetched for URL: {url}")
+    for seq, (fn, html) in enumerate(steps):
+        try:
+            return parse(fn, html, url, seq)
+        except ValueError as e:
+            error = e
+    if not_found:
+        raise ValueError(not_found) from None
+    raise error
+
+def _next_page(done, hold, url, steps, not_found, seq, error):
+    """
+    I/O-thread side of a deferred first_price(): fetch page `seq` and hand
+    its parse off.  If that page doesn't parse, the domain's worker comes
+    back here for the next one; `done` gets the outcome.
+    """
+    try:
+        with instrument.phase("parse"):
+            step = next(steps, None)
+        if step is None:
+            done.set_exception(ValueError(not_found) if not_found else error)
+            return
+        resume = hold()
+        try:
+            page = _POOL.defer(parse, *step, url, seq)
+        except BaseException:
+            resume()
+            raise
+    except Exception as e:
+        done.set_exception(e)
+        return
+    ctx = contextvars.copy_context()          # the fetch's Call and archive.Fetch
+
+    def _parsed(page):
+        error = concurrent.futures.CancelledError() if page.cancelled() else page.exception()
+        if isinstance(error, ValueError):     # try the next page, on the I/O thread
+            resume(ctx.run, _next_page, done, hold, url, steps, not_found, seq + 1, error)
+            return
+        resume()
+        if error is not None:
+            done.set_exception(error)
+        else:
+            done.set_result(page.result())
+
+    page.add_done_callback(_parsed)
+
+def first_price(url: str, steps, not_found=None):
+    """
+    Parse the pages `steps` yields – (parse_fn, html) pairs, fetched lazily –
+    until one gives a price.  Re-raises the last ValueError if none does, or
+    ValueError(not_found) when given.  Inside deferred() it returns a Future
+    once the first page is handed off; every page is still fetched on the
+    calling domain's worker.
+    """
+    steps = iter(steps)
+    hold  = _DEFER.get()
+    if _POOL is None or hold is None:
+        return _first_price(url, steps, not_found)
+    done = concurrent.futures.Future()
+    _next_page(done, hold, url, steps, not_found, 0,
+               ValueError(f"No page could be fetched for URL: {url}"))
+    return done
@@ -1,41 +1,336 @@
-import sqlite3, datetime
+import sqlite3, datetime, threading, time, atexit
+
+from urlnorm import strip_tracking
 
 DB = "prices.sqlite"
 
+FLUSH_ROWS    = 50      # flush once this many rows are buffered …
+FLUSH_SECONDS = 10.0    # … or once the oldest buffered row is this old
+
+# ── schema ────────────────────────────────────────────────────────────────
+#   products      one row per (art_no, competitor, de-tracked url)
+#   observations  (product_id, day) → price in integer cents; WITHOUT ROWID,
+#                 so the PK b-tree *is* the table and covers "latest price
+#                 per product" and "history of a product" on its own.
+#                 page_hash names the archived page the price came from
+#                 (archive.py), NULL if none was kept
+#   current_prices  latest + previous price per product, kept up to date by
+#                 a trigger on every observation insert (see queries.py)
+#   prices        read-only view with the old table's columns
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS products (
+        product_id INTEGER PRIMARY KEY,
+        art_no     TEXT NOT NULL,
+        competitor TEXT NOT NULL,
+        url        TEXT NOT NULL,
+        sku        TEXT,
+        UNIQUE (art_no, competitor, url)
+    );
+    CREATE TABLE IF NOT EXISTS observations (
+        product_id  INTEGER NOT NULL REFERENCES products,
+        day         INTEGER NOT NULL,          -- days since 1970-01-01
+        price_cents INTEGER,
+        currency    TEXT,
+        page_hash   TEXT,                      -- archive.py blob, or NULL
+        PRIMARY KEY (product_id, day)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS observations_day
+        ON observations (day, product_id);
+    CREATE TABLE IF NOT EXISTS current_prices (
+        product_id       INTEGER PRIMARY KEY REFERENCES products,
+        day              INTEGER NOT NULL,
+        price_cents      INTEGER,
+        currency         TEXT,
+        prev_day         INTEGER,
+        prev_price_cents INTEGER
+    );
+    -- re-reads the product's two newest observations (two PK seeks), so
+    -- backfills and out-of-order retries leave latest / prev right; rows
+    -- older than the current prev_day cannot change either and are skipped
+    CREATE TRIGGER IF NOT EXISTS observations_current_v2
+    AFTER INSERT ON observations
+    WHEN NEW.day >= COALESCE((SELECT prev_day FROM current_prices
+                               WHERE product_id = NEW.product_id), -1)
+    BEGIN
+        INSERT OR REPLACE INTO current_prices
+        SELECT o.product_id, o.day, o.price_cents, o.currency,
+               p.day, p.price_cents
+          FROM (SELECT * FROM observations WHERE product_id = NEW.product_id
+                 ORDER BY day DESC LIMIT 1) o
+          LEFT JOIN (SELECT day, price_cents FROM observations
+                      WHERE product_id = NEW.product_id
+                      ORDER BY day DESC LIMIT 1 OFFSET 1) p ON 1;
+    END;
+    CREATE VIEW IF NOT EXISTS prices AS
+        SELECT p.art_no, p.competitor, p.url, p.sku,
+               date(o.day * 86400, 'unixepoch') AS date,
+               o.price_cents / 100.0            AS price,
+               o.currency, o.page_hash
+          FROM observations o JOIN products p USING (product_id);
+"""
+
+# fills current_prices from history (databases created before the trigger)
+_BACKFILL_CURRENT = """
+    INSERT OR REPLACE INTO current_prices
+    SELECT product_id, day, price_cents, currency, prev_day, prev_price_cents
+      FROM (SELECT product_id, day, price_cents, currency,
+                   LAG(day)         OVER w AS prev_day,
+                   LAG(price_cents) OVER w AS prev_price_cents,
+                   ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY day DESC) AS rn
+              FROM observations
+            WINDOW w AS (PARTITION BY product_id ORDER BY day))
+     WHERE rn = 1
+"""
+
+_UPSERT_PRODUCT = """
+    INSERT INTO products (art_no, competitor, url, sku) VALUES (?,?,?,?)
+    ON CONFLICT (art_no, competitor, url) DO UPDATE SET sku = excluded.sku
+"""
+_PRODUCT_ID = "SELECT product_id FROM products WHERE art_no=? AND competitor=? AND url=?"
+_INSERT     = "INSERT OR REPLACE INTO observations VALUES (?,?,?,?,?)"
+
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+def to_day(iso_date: str) -> int:
+    """'2025-05-21' → days since 1970-01-01 (the observations.day encoding)."""
+    return datetime.date.fromisoformat(iso_date).toordinal() - _EPOCH
+
+def from_day(day: int) -> str:
+    return datetime.date.fromordinal(day + _EPOCH).isoformat()
+
+def to_cents(price):
+    return None if price is None else int(round(float(price) * 100))
+
+def _connect(path=None) -> sqlite3.Connection:
+    """Open `path` (default: DB) in WAL mode so readers never block the scraper."""
+    conn = sqlite3.connect(path or DB, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")   # WAL-safe, one fsync/checkpoint
+    return conn
+
+class PriceWriter:
+    """
+    Buffered writer: one long-lived connection, rows flushed in batches.
+
+    add() only appends to an in-memory buffer; a flush writes the whole
+    buffer with `executemany` in a single transaction (one fsync) when it
+    reaches `max_rows`, when the oldest row is `max_age` seconds old (a
+    background timer checks), or on close().  Thread-safe, so every domain
+    worker can share one writer.  Callables in `after_flush` run after
+    every flush, once the rows are committed (jobqueue checkpoints).
+
+    A flush that fails from add() or the timer keeps the whole buffer for
+    the next try instead of raising, so no caller takes its rows for lost
+    while a later flush still commits them; flush() and close() raise.
+    """
+
+    def __init__(self, path=None, max_rows=FLUSH_ROWS, max_age=FLUSH_SECONDS):
+        self.path     = path or DB
+        self.max_rows = max_rows
+        self.max_age  = max_age
+        self._conn    = _connect(path)
+        self._rows    = []
+        self._ids     = {}                    # (art, comp, url) → (product_id, sku)
+        self.after_flush = []
+        self._oldest  = None                  # monotonic time of first buffered row
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._timer   = threading.Thread(target=self._tick,
+                                         name="price-writer", daemon=True)
+        self._timer.start()
+
+    def add(self, art_no, competitor, url, sku, date, price, currency,
+            page_hash=None) -> None:
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append((art_no, competitor, url, sku, date, price, currency,
+                               page_hash))
+            if len(self._rows) >= self.max_rows:
+                self._retry_flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _product_id(self, art_no, competitor, url, sku) -> int:
+        """Id of the products row, inserting it (or a changed sku) first."""
+        key = (art_no, competitor, url)
+        hit = self._ids.get(key)
+        if hit is None or hit[1] != sku:
+            self._conn.execute(_UPSERT_PRODUCT, (*key, sku))
+            hit = self._ids[key] = (self._conn.execute(_PRODUCT_ID, key).fetchone()[0], sku)
+        return hit[0]
+
+    def _flush_locked(self) -> None:
+        if self._rows:
+            try:
+                with self._conn:              # BEGIN … COMMIT (rollback on error)
+                    obs = [
+                        (self._product_id(art, comp, strip_tracking(url), sku),
+                         to_day(date), to_cents(price), currency, page_hash)
+                        for art, comp, url, sku, date, price, currency, page_hash
+                        in self._rows
+                    ]
+                    self._conn.executemany(_INSERT, obs)
+            except Exception:
+                self._ids.clear()             # ids of products rows just rolled back
+                raise
+            self._rows.clear()
+            self._oldest = None
+        for fn in self.after_flush:
+            fn()
+
+    def _retry_flush_locked(self) -> None:
+        """Flush; on failure keep the rows (and pending checkpoints) for later."""
+        try:
+            self._flush_locked()
+        except Exception as e:
+            print(f"[DB] flush failed, retrying: {e}")
+
+    def _tick(self) -> None:
+        while not self._stop.wait(min(1.0, self.max_age)):
+            with self._lock:
+                if self._oldest is not None and \
+                   time.monotonic() - self._oldest >= self.max_age:
+                    self._retry_flush_locked()   # an escaping error would end the timer
+
+    def close(self) -> None:
+        """Flush whatever is left and release the connection."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._timer.join()
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_WRITER      = None
+_WRITER_LOCK = threading.Lock()
+
+def writer() -> PriceWriter:
+    """Process-wide PriceWriter, created on first use and closed at exit."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = PriceWriter()
+            atexit.register(close_writer)
+        return _WRITER
+
+def close_writer() -> None:
+    """Flush and close the shared writer (safe to call more than once)."""
+    global _WRITER
+    with _WRITER_LOCK:
+        w, _WRITER = _WRITER, None
+    if w is not None:
+        w.close()
+
 def _save(art_no: str,
           competitor: str,
           url: str,
           sku: str,
           price: float,
-          currency: str):
+          currency: str,
+          page_hash: str = None):
     """
-    Inserts or replaces…
+    Inserts or replaces today's row for (art_no, competitor, url).
+    Rows are buffered by the shared PriceWriter and committed in batches.
     """
     today = datetime.date.today().isoformat()
-    with sqlite3.connect(DB) as conn:
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO prices
-               (art_no, competitor, url, sku, date, price, currency)
-            VALUES (?,?,?,?,?,?,?)
-            """,
-            (art_no, competitor, url, sku, today, price, currency)
-        )
-        conn.commit()
-
-def init_db():
-    """Create the `prices` table if it doesn't already exist."""
-    with sqlite3.connect(DB) as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS prices (
-                art_no     TEXT,
-                competitor TEXT,
-                url        TEXT,
-                sku        TEXT,
-                date       TEXT,
-                price      REAL,
-                currency   TEXT,
-                PRIMARY KEY (art_no, competitor, url, date)
-            )
-        """)
-        conn.commit()
+    writer().add(art_no, competitor, url, sku, today, price, currency, page_hash)
+
+def _create_schema(conn) -> None:
+    """SCHEMA statement by statement (executescript would commit early)."""
+    stmt = ""
+    for piece in SCHEMA.split(";"):
+        stmt += piece + ";"
+        if sqlite3.complete_statement(stmt):       # trigger bodies contain ';'
+            if stmt.strip() != ";":
+                conn.execute(stmt)
+            stmt = ""
+
+def _replace_current_trigger(conn) -> None:
+    """
+    The first current_prices trigger treated every insert as the newest
+    row; drop it and empty the table so init_db() rebuilds it from history.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master "
+                    "WHERE type='trigger' AND name='observations_current'").fetchone():
+        conn.execute("DROP TRIGGER observations_current")
+        conn.execute("DELETE FROM current_prices")
+
+def _add_page_hash(conn) -> None:
+    """
+    Give an observations table from before archive.py its page_hash column;
+    the `prices` view is dropped so _create_schema() recreates it with it.
+    """
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(observations)")]
+    if cols and "page_hash" not in cols:
+        conn.execute("ALTER TABLE observations ADD COLUMN page_hash TEXT")
+        conn.execute("DROP VIEW IF EXISTS prices")
+
+def _migrate(conn) -> int:
+    """
+    Move rows from a legacy `prices` *table* into products/observations,
+    then drop it (the view takes its name).  Returns the rows migrated;
+    0 if there was nothing to do.  Runs inside the caller's transaction.
+    """
+    kind = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name='prices'").fetchone()
+    if kind is None or kind[0] != "table":
+        return 0
+    conn.execute("ALTER TABLE prices RENAME TO prices_legacy")
+    _create_schema(conn)
+    conn.create_function("strip_tracking", 1, strip_tracking, deterministic=True)
+    # latest sku wins when a product's sku changed over time
+    conn.execute("""
+        INSERT OR IGNORE INTO products (art_no, competitor, url, sku)
+        SELECT art_no, competitor, strip_tracking(url), sku
+          FROM prices_legacy
+         ORDER BY date DESC
+    """)
+    # rows whose URLs differ only by tracking params collapse to one per day
+    n = conn.execute("""
+        INSERT OR REPLACE INTO observations (product_id, day, price_cents, currency)
+        SELECT p.product_id,
+               CAST(julianday(l.date) - 2440587.5 AS INTEGER),
+               CAST(round(l.price * 100) AS INTEGER),
+               l.currency
+          FROM prices_legacy l
+          JOIN products p
+            ON p.art_no = l.art_no AND p.competitor = l.competitor
+           AND p.url = strip_tracking(l.url)
+         ORDER BY l.date
+    """).rowcount
+    conn.execute("DROP TABLE prices_legacy")
+    return n
+
+def init_db(path=None):
+    """
+    Create products / observations / current_prices / the `prices` view if
+    missing, migrate a pre-existing `prices` table into them (then VACUUM,
+    since the old table's pages are now free), add observations.page_hash
+    and swap in the order-independent current_prices trigger.
+    """
+    conn = sqlite3.connect(path or DB)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")     # persistent per database
+        with conn:                                  # one transaction, all or nothing
+            conn.execute("BEGIN IMMEDIATE")
+            migrated = _migrate(conn)
+            _add_page_hash(conn)
+            _replace_current_trigger(conn)
+            _create_schema(conn)
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM current_prices)").fetchone()[0]:
+                conn.execute(_BACKFILL_CURRENT)
+        if migrated:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return migrated
@@ -0,0 +1,142 @@
+# queries.py  – read side of prices.sqlite, returned as column arrays
+#
+#   latest_prices()        current price per product (+ the one before it)
+#   history(art_no)        every observation for one article, all competitors
+#   changes_since(date)    every price change on or after `date`
+#
+# latest_prices() reads `current_prices`, which a trigger keeps up to date
+# on each insert (price_tracker.SCHEMA), so no query here scans the whole
+# history.  Results come back as Columns: NumPy arrays when NumPy is
+# installed, array.array / lists otherwise.
+
+import array
+import sqlite3
+
+import price_tracker
+from price_tracker import from_day, to_day
+
+try:
+    import numpy as np
+except ImportError:                   # optional – array.array fallback
+    np = None
+
+# column → kind: "int" / "float" arrays, everything else stays a list
+_KINDS = {
+    "product_id": "int", "day": "int", "prev_day": "float",
+    "price": "float", "prev_price": "float",
+}
+
+def _array(kind, values):
+    if kind == "int":
+        return np.array(values, dtype=np.int64) if np is not None else array.array("q", values)
+    nan = float("nan")
+    values = [nan if v is None else v for v in values]
+    return np.array(values, dtype=np.float64) if np is not None else array.array("d", values)
+
+class Columns:
+    """Column-oriented query result: cols["price"] → array, len() → rows."""
+
+    def __init__(self, names, rows):
+        self.names = list(names)
+        cols = list(zip(*rows)) if rows else [()] * len(self.names)
+        self._cols = {
+            name: _array(_KINDS[name], col) if name in _KINDS else list(col)
+            for name, col in zip(self.names, cols)
+        }
+        self._len = len(rows)
+
+    def __getitem__(self, name):
+        return self._cols[name]
+
+    def __contains__(self, name):
+        return name in self._cols
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return f"<Columns {self._len} rows: {', '.join(self.names)}>"
+
+    def rows(self):
+        """Back to row tuples, in column order."""
+        return zip(*(self._cols[n] for n in self.names))
+
+    def dates(self, name="day"):
+        """An int day column as ISO date strings."""
+        return [from_day(int(d)) for d in self._cols[name]]
+
+def _connect(path=None) -> sqlite3.Connection:
+    """Read-only connection; WAL lets it run alongside a scrape."""
+    return sqlite3.connect(f"file:{path or price_tracker.DB}?mode=ro",
+                           uri=True, timeout=30)
+
+def _query(sql, params=(), path=None) -> Columns:
+    conn = _connect(path)
+    try:
+        cur  = conn.execute(sql, params)
+        rows = cur.fetchall()
+        return Columns([d[0] for d in cur.description], rows)
+    finally:
+        conn.close()
+
+def latest_prices(art_no=None, competitor=None, path=None) -> Columns:
+    """
+    Current price of every product (optionally one article / competitor):
+    product_id, art_no, competitor, url, sku, day, price, currency,
+    prev_day, prev_price.
+    """
+    where, params = [], []
+    if art_no is not None:
+        where.append("p.art_no = ?")
+        params.append(art_no)
+    if competitor is not None:
+        where.append("p.competitor = ?")
+        params.append(competitor)
+    sql = f"""
+        SELECT c.product_id, p.art_no, p.competitor, p.url, p.sku, c.day,
+               c.price_cents / 100.0      AS price, c.currency,
+               c.prev_day, c.prev_price_cents / 100.0 AS prev_price
+          FROM current_prices c JOIN products p USING (product_id)
+         {"WHERE " + " AND ".join(where) if where else ""}
+         ORDER BY p.art_no, p.competitor, p.url
+    """
+    return _query(sql, params, path)
+
+def history(art_no, since=None, path=None) -> Columns:
+    """
+    Every observation of `art_no` across competitors, oldest first:
+    product_id, competitor, url, sku, day, price, currency.
+    `since` is an ISO date; omit for the full history.
+    """
+    sql = """
+        SELECT o.product_id, p.competitor, p.url, p.sku, o.day,
+               o.price_cents / 100.0 AS price, o.currency
+          FROM products p JOIN observations o USING (product_id)
+         WHERE p.art_no = ? AND o.day >= ?
+         ORDER BY p.competitor, p.url, o.day
+    """
+    return _query(sql, (art_no, to_day(since) if since else 0), path)
+
+def changes_since(date, path=None) -> Columns:
+    """
+    Every price change observed on or after ISO `date`:
+    product_id, art_no, competitor, url, day, price, prev_price, currency.
+    Only products seen since `date` are windowed (observations_day index).
+    """
+    sql = """
+        SELECT x.product_id, p.art_no, p.competitor, p.url, x.day,
+               x.price_cents / 100.0 AS price,
+               x.prev_cents  / 100.0 AS prev_price, x.currency
+          FROM (SELECT product_id, day, price_cents, currency,
+                       LAG(price_cents) OVER (PARTITION BY product_id ORDER BY day)
+                           AS prev_cents
+                  FROM observations
+                 WHERE product_id IN (SELECT product_id FROM observations
+                                       WHERE day >= :since)) x
+          JOIN products p USING (product_id)
+         WHERE x.day >= :since
+           AND x.prev_cents IS NOT NULL
+           AND x.price_cents IS NOT x.prev_cents
+         ORDER BY p.art_no, p.competitor, x.day
+    """
+    return _query(sql, {"since": to_day(date)}, path)
@@ -0,0 +1,216 @@
+# ratelimit.py  – one adaptive token bucket per retailer host
+#
+# Every outbound request books a token from its host's bucket first:
+# sessions.get() and the async engine for HTTP, the Selenium extractors
+# before driver.get().  A bucket refills at `rate` tokens/s up to `burst`;
+# when it is empty the caller waits (charged to instrument's `throttle`).
+# Rates adapt AIMD-style from what comes back:
+#
+#   healthy response              rate += INCREASE × base  (≤ MAX_SPEEDUP × base)
+#   429 / 503 / captcha / block   rate ×= DECREASE         (≥ MIN_FRACTION × base)
+#                                 and nothing is sent until Retry-After / COOLDOWN
+#
+# Base rates come from PER_DOMAIN_DELAY (seconds between hits) and burst
+# sizes from PER_DOMAIN_BURST, looked up by host suffix: redsky.target.com
+# gets target.com's settings but a bucket of its own.  Each bucket has its
+# own lock and bucket creation is lock-striped, so a slow or backed-off
+# host never holds up the others.  snapshot() / report() expose the state.
+
+import asyncio
+import random
+import threading
+import time
+import urllib.parse
+
+import instrument
+
+PER_DOMAIN_DELAY = {                 # base seconds between hits to one host
+    "amazon.com":   3,
+    "target.com":   2,
+    "walmart.com":  2,
+    "babylist.com": 2,
+    "wayfair.com":  3,
+}
+DEFAULT_DELAY    = 1.5
+
+PER_DOMAIN_BURST = {                 # requests allowed back-to-back
+    "amazon.com":   1,
+}
+DEFAULT_BURST    = 2
+
+INCREASE     = 0.05       # × base rate added per healthy response
+MAX_SPEEDUP  = 2.0        # rate ceiling, × base
+DECREASE     = 0.5        # rate multiplier on a throttling signal
+MIN_FRACTION = 0.1        # rate floor, × base
+COOLDOWN     = 60.0       # seconds paused after a 429/503 without Retry-After
+JITTER       = 0.75       # random extra seconds on every wait
+STRIPES      = 16         # locks guarding bucket creation
+
+BLOCK_STATUSES     = {429, 503}
+# block / captcha pages served with a 200 (Walmart, PerimeterX, Amazon)
+CAPTCHA_MARKERS    = (b"px-captcha", b"Robot or human?", b"/errors/validateCaptcha",
+                      b"Type the characters you see in this image")
+BLOCKED_URL_PARTS  = ("/blocked?", "validateCaptcha")
+CAPTCHA_SCAN_BYTES = 128 * 1024     # real PDPs are bigger than block pages
+
+def host_key(url: str) -> str:
+    """'https://www.walmart.com/ip/1' → 'walmart.com'; subdomains are kept."""
+    host = urllib.parse.urlparse(url).netloc or url
+    host = host.split(":")[0].lower()
+    return host[4:] if host.startswith("www.") else host
+
+def _setting(table, host, default):
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        value = table.get(".".join(labels[i:]))
+        if value is not None:
+            return value
+    return default
+
+def _retry_after(headers):
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):            # absent, or an HTTP date
+        return None
+
+def is_captcha(body: bytes) -> bool:
+    """A small page carrying one of the known challenge markers."""
+    if not body or len(body) > CAPTCHA_SCAN_BYTES:
+        return False
+    return any(marker in body for marker in CAPTCHA_MARKERS)
+
+class TokenBucket:
+    """Token bucket for one host with AIMD rate adaptation; thread-safe."""
+
+    def __init__(self, host, delay=DEFAULT_DELAY, burst=DEFAULT_BURST):
+        self.host      = host
+        self.base_rate = 1.0 / delay
+        self.rate      = self.base_rate
+        self.burst     = burst
+        self.tokens    = float(burst)
+        self.stamp     = time.monotonic()   # last refill; in the future while paused
+        self.ok        = 0
+        self.throttled = 0
+        self._lock     = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token (possibly one not refilled yet); seconds to wait first."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self.stamp:
+                self.tokens = min(self.burst,
+                                  self.tokens + (now - self.stamp) * self.rate)
+                self.stamp  = now
+            self.tokens -= 1.0
+            return (max(0.0, self.stamp - now)
+                    + max(0.0, -self.tokens) / self.rate)
+
+    def success(self) -> None:
+        """Additive increase."""
+        with self._lock:
+            self.ok  += 1
+            self.rate = min(self.rate + INCREASE * self.base_rate,
+                            MAX_SPEEDUP * self.base_rate)
+
+    def backoff(self, pause=None) -> None:
+        """Multiplicative decrease, and no tokens for `pause` seconds."""
+        with self._lock:
+            self.throttled += 1
+            self.rate   = max(self.rate * DECREASE, MIN_FRACTION * self.base_rate)
+            self.stamp  = max(self.stamp, time.monotonic() + (COOLDOWN if pause is None else pause))
+            self.tokens = min(self.tokens, 1.0)
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "rate":      round(self.rate, 4),
+                "base_rate": round(self.base_rate, 4),
+                "burst":     self.burst,
+                "tokens":    round(self.tokens, 2),
+                "paused_s":  round(max(0.0, self.stamp - time.monotonic()), 1),
+                "ok":        self.ok,
+                "throttled": self.throttled,
+            }
+
+class RateLimiter:
+    """host → TokenBucket, created on first use."""
+
+    def __init__(self, delays=PER_DOMAIN_DELAY, bursts=PER_DOMAIN_BURST,
+                 stripes=STRIPES):
+        self.delays   = delays
+        self.bursts   = bursts
+        self.enabled  = True             # False: never wait (offline replay)
+        self._buckets = {}
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def bucket(self, url) -> TokenBucket:
+        host   = host_key(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._stripes[hash(host) % len(self._stripes)]:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = self._buckets[host] = TokenBucket(
+                        host,
+                        _setting(self.delays, host, DEFAULT_DELAY),
+                        _setting(self.bursts, host, DEFAULT_BURST))
+        return bucket
+
+    def wait(self, url) -> None:
+        """Block until `url`'s host may be hit."""
+        wait_for = self.bucket(url).reserve()
+        if wait_for and self.enabled:
+            with instrument.phase("throttle"):
+                time.sleep(wait_for + random.uniform(0, JITTER))
+
+    async def wait_async(self, url) -> None:
+        """wait() on the event loop instead of a thread."""
+        wait_for = self.bucket(url).reserve()
+        if wait_for and self.enabled:
+            with instrument.phase("throttle"):
+                await asyncio.sleep(wait_for + random.uniform(0, JITTER))
+
+    def feedback(self, url, resp) -> None:
+        """Adapt `url`'s host to one response (status, Retry-After, body)."""
+        bucket = self.bucket(url)
+        final  = str(getattr(resp, "url", "") or "")
+        if resp.status_code in BLOCK_STATUSES:
+            bucket.backoff(_retry_after(resp.headers))
+        elif any(part in final for part in BLOCKED_URL_PARTS) or is_captcha(resp.content):
+            bucket.backoff()
+        else:
+            bucket.success()
+            return
+        print(f"[RATE] {bucket.host}: HTTP {resp.status_code}, "
+              f"backing off to {bucket.rate:.3f} req/s")
+
+    def page(self, url, html: str) -> None:
+        """feedback() for a page loaded in Chrome (no status code)."""
+        bucket = self.bucket(url)
+        if is_captcha(html.encode("utf-8", errors="ignore")[:CAPTCHA_SCAN_BYTES + 1]):
+            bucket.backoff()
+            print(f"[RATE] {bucket.host}: challenge page, "
+                  f"backing off to {bucket.rate:.3f} req/s")
+        else:
+            bucket.success()
+
+    def interval(self, url) -> float:
+        """Current seconds between hits to `url`'s host."""
+        return 1.0 / self.bucket(url).rate
+
+    def snapshot(self) -> dict:
+        """host → bucket state (rate, tokens, pause left, ok / throttled counts)."""
+        return {host: b.state() for host, b in sorted(self._buckets.items())}
+
+    def report(self) -> str:
+        lines = [f"[RATE] {'host':<28}{'req/s':>6} {'(base)':<6}{'ok':>5}{'throttled':>11}"]
+        for host, s in self.snapshot().items():
+            lines.append(f"[RATE] {host:<28}{s['rate']:>6.2f} ({s['base_rate']:.2f})"
+                         f"{s['ok']:>5}{s['throttled']:>11}")
+        return "\n".join(lines)
+
+_LIMITER = RateLimiter()
+
+def limiter() -> RateLimiter:
+    """The process-wide limiter."""
+    return _LIMITER
@@ -0,0 +1,81 @@
+# refresh.py  – per-product refresh intervals for incremental runs
+#
+# A product whose price moves at most observations gets re-scraped daily;
+# one that hasn't changed in the lookback window waits a month.  Run
+# `run_weekly.py --incremental` daily and only the due rows are fetched.
+
+import datetime
+import sqlite3
+
+import price_tracker
+from urlnorm import strip_tracking
+from price_tracker import to_day
+
+LOOKBACK_DAYS    = 90
+MAX_INTERVAL     = 30     # days – nothing changed in the lookback window
+DEFAULT_INTERVAL = 7      # days – too little history to judge (the old cadence)
+
+# (share of consecutive observations whose price changed, interval in days)
+REFRESH_TIERS = (
+    (0.50,  1),
+    (0.25,  3),
+    (0.10,  7),
+    (0.00, 14),           # changed at least once
+)
+
+_STATS = """
+    SELECT p.art_no, p.competitor, p.url, s.n, s.changes, s.last_day
+      FROM (SELECT product_id,
+                   count(*)                                   AS n,
+                   sum(prev IS NOT NULL AND price_cents IS NOT prev) AS changes,
+                   max(day)                                   AS last_day
+              FROM (SELECT product_id, day, price_cents,
+                           LAG(price_cents) OVER (PARTITION BY product_id
+                                                  ORDER BY day) AS prev
+                      FROM observations
+                     WHERE day >= ?)
+             GROUP BY product_id) s
+      JOIN products p USING (product_id)
+"""
+
+def interval_for(n_obs: int, changes: int) -> int:
+    """Refresh interval in days from one product's recent history."""
+    if n_obs < 2:
+        return DEFAULT_INTERVAL
+    share = changes / (n_obs - 1)
+    for min_share, days in REFRESH_TIERS:
+        if changes and share >= min_share:
+            return days
+    return MAX_INTERVAL
+
+def schedule(path=None, today=None) -> dict:
+    """
+    (art_no, competitor, canonical url) → (interval days, last observed day)
+    for every product observed in the lookback window.
+    """
+    today = today or datetime.date.today()
+    since = to_day(today.isoformat()) - LOOKBACK_DAYS
+    conn  = sqlite3.connect(path or price_tracker.DB, timeout=30)
+    try:
+        rows = conn.execute(_STATS, (since,)).fetchall()
+    finally:
+        conn.close()
+    return {
+        (art, comp, url): (interval_for(n, changes), last_day)
+        for art, comp, url, n, changes, last_day in rows
+    }
+
+class DueFilter:
+    """is_due(art, comp, url): never seen, or last seen ≥ its interval ago."""
+
+    def __init__(self, path=None, today=None):
+        today         = today or datetime.date.today()
+        self.today    = to_day(today.isoformat())
+        self.schedule = schedule(path, today)
+
+    def is_due(self, art_no, competitor, url) -> bool:
+        entry = self.schedule.get((art_no, competitor, strip_tracking(url)))
+        if entry is None:
+            return True
+        interval, last_day = entry
+        return self.today - last_day >= interval
@@ -0,0 +1,162 @@
+# reparse.py  – re-run the parsers over archived pages, offline
+#
+# While archiving is enabled (run_weekly does, unless --no-archive) every
+# page pipeline.parse() sees is stored in archive/ with an index row: the
+# URL, which parse_<retailer> function got it and what came out (see
+# archive.py).  The index keeps only each URL's latest fetch.
+#
+# When a retailer changes its markup, fix its parse_<retailer>() and
+#
+#   python reparse.py [--retailer walmart] [--workers N] [--save targets.csv]
+#
+# re-parses every indexed fetch across all cores without touching the
+# network, reports which results changed, and with --save writes the new
+# prices for the day each page was fetched, pointing at the page they
+# came from.
+
+import argparse
+import concurrent.futures
+import datetime
+import functools
+import multiprocessing
+import time
+from collections import Counter
+
+import archive
+import instrument
+import pipeline
+from archive import outcome                # re-exported
+
+def _same(a, b) -> bool:
+    return (a is not None and b is not None
+            and round(float(a[0]), 2) == round(float(b[0]), 2)
+            and a[1] == b[1] and str(a[2] or "") == str(b[2] or ""))
+
+# ── bulk re-parse ─────────────────────────────────────────────────────────
+_WORKER_ARCHIVE = None                    # one index connection per process
+
+def _open(root) -> None:
+    global _WORKER_ARCHIVE
+    _WORKER_ARCHIVE = archive.Archive(root)
+
+def _reparse_url(url):
+    """Worker side: first archived page of `url` that parses → its outcome."""
+    from extractors import retailer_module
+
+    error = "no archived page"
+    with instrument.detached() as rec:
+        for retailer, parser, keywords, digest in _WORKER_ARCHIVE.pages(url):
+            fn = getattr(retailer_module(retailer), parser)
+            try:
+                html   = _WORKER_ARCHIVE.text(digest)
+                result = functools.partial(fn, **keywords)(html, url)
+                return outcome(result), None, rec.branch, digest
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+    return None, error, None, None
+
+def reparse(root=archive.ARCHIVE_DIR, retailers=(), workers=pipeline.PARSE_WORKERS) -> list:
+    """
+    Re-parse every indexed fetch.  Returns [(url, retailer, fetched, live,
+    new, new error, branch, page hash)]; `live` / `new` are (price, cur,
+    sku) or None.  Pages are read inside the workers, so only URLs cross
+    process lines.
+    """
+    store = archive.Archive(root)
+    try:
+        todo = store.fetches(retailers)
+    finally:
+        store.close()
+    urls = [t[0] for t in todo]
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_open, initargs=(root,)) as pool:
+            results = list(pool.map(_reparse_url, urls, chunksize=4))
+    else:                                 # in-process: easier to debug a parser
+        _open(root)
+        results = [_reparse_url(url) for url in urls]
+    return [(url, retailer, fetched, live, *res)
+            for (url, retailer, fetched, live, _), res in zip(todo, results)]
+
+def _status(live, new) -> str:
+    if new is None:
+        return "broken" if live is not None else "failed"
+    if live is None:
+        return "fixed"
+    return "same" if _same(live, new) else "changed"
+
+def report(results) -> str:
+    """Per-retailer counts, then one line per fetch whose outcome moved."""
+    by_ret = {}
+    for url, retailer, _, live, new, *_ in results:
+        by_ret.setdefault(retailer, Counter())[_status(live, new)] += 1
+    cols  = ("same", "changed", "fixed", "broken", "failed")
+    lines = [f"  {'retailer':<16}{'pages':>6}" + "".join(f"{c:>8}" for c in cols)]
+    for retailer, counts in by_ret.items():
+        lines.append(f"  {retailer:<16}{sum(counts.values()):>6}"
+                     + "".join(f"{counts[c]:>8}" for c in cols))
+    for url, retailer, _, live, new, error, *_ in results:
+        status = _status(live, new)
+        if status in ("changed", "fixed"):
+            lines.append(f"  {status.upper()} {retailer}: {url} {live} → {new}")
+        elif status == "broken":
+            lines.append(f"  BROKEN {retailer}: {url} {live} → {error}")
+    return "\n".join(lines)
+
+def save(results, targets) -> int:
+    """
+    Write changed / fixed outcomes for every targets.csv row of their
+    product, dated the day the page was fetched.  Returns rows written.
+    """
+    from canonical import product_key
+    from extractors import RETAILERS
+    from price_tracker import close_writer, init_db, writer
+    from run_weekly import group_by_product, read_targets
+
+    rows_for = {}
+    for key, (domain, url, rows) in group_by_product(read_targets(targets)).items():
+        rows_for[key] = rows
+        rows_for.setdefault(url.split("?", 1)[0].split("#", 1)[0], rows)
+
+    init_db()
+    written = 0
+    try:
+        for url, retailer, fetched, live, new, _, _, page_hash in results:
+            if _status(live, new) not in ("changed", "fixed"):
+                continue
+            try:
+                key = product_key(RETAILERS[retailer][1][0], url)
+            except Exception:
+                key = None
+            rows = rows_for.get(key) or rows_for.get(url.split("?", 1)[0].split("#", 1)[0])
+            if not rows:
+                print(f"[SKIP] {url}: not in {targets}")
+                continue
+            price, cur, sku = new
+            day = datetime.date.fromtimestamp(fetched).isoformat()
+            for art, comp, row_url in rows:
+                writer().add(art, comp, row_url, sku, day, price, cur, page_hash)
+                written += 1
+    finally:
+        close_writer()
+    return written
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Re-parse archived pages without the network")
+    ap.add_argument("--root", default=archive.ARCHIVE_DIR)
+    ap.add_argument("--retailer", action="append", default=[],
+                    help="only this extractors module (repeatable)")
+    ap.add_argument("--workers", type=int, default=pipeline.PARSE_WORKERS,
+                    help="parser processes; 1 parses in this process")
+    ap.add_argument("--save", metavar="TARGETS",
+                    help="write changed/fixed prices for this targets CSV's rows")
+    args = ap.parse_args()
+
+    t0      = time.perf_counter()
+    results = reparse(args.root, args.retailer, args.workers)
+    print(f"reparse of {len(results)} archived fetches ({args.root}/), "
+          f"{args.workers} workers, {time.perf_counter() - t0:.1f} s")
+    print(report(results))
+    if args.save:
+        print(f"[REPARSE] {save(results, args.save)} rows written")
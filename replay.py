@@ -0,0 +1,374 @@
+# replay.py  – record live retailer responses once, replay them offline
+#
+# A corpus (replay.sqlite) holds three things:
+#   responses  every sessions.get() answer – _html/_get_json, RedSky, DXP,
+#              Walmart/Wayfair PDPs, short-link hops – keyed by request_key()
+#   pages      driver.page_source of the Selenium retailers, keyed by URL
+#   fetches    each product URL captured, with the (price, currency, sku)
+#              its extractor returned live – the regression baseline
+#
+#   python replay.py capture targets.csv [--per-retailer 5]   # live, once
+#   python bench.py replay                                    # offline
+#
+# In replay mode sessions.get() is served from the corpus, the browser pool
+# hands out ReplayDrivers and helpers' throttle / pause waits are off, so
+# every DOMAIN_EXTRACTOR runs unchanged without touching the network.
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+
+import browser_pool
+import helpers
+import sessions
+
+CORPUS_DB = "replay.sqlite"
+
+# query parameters that change on every call (mybobs' DXP request id …)
+VOLATILE_PARAMS = {"request_id", "_br_uid_2"}
+# never sent while capturing, so the corpus always holds full 200 bodies
+VALIDATORS      = {"if-none-match", "if-modified-since"}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key      TEXT PRIMARY KEY,        -- request_key()
+        url      TEXT NOT NULL,
+        status   INTEGER NOT NULL,
+        headers  TEXT NOT NULL,           -- JSON [[name, value], …]
+        encoding TEXT,
+        body     BLOB NOT NULL,           -- zlib
+        captured REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS pages (
+        url      TEXT PRIMARY KEY,
+        html     BLOB NOT NULL,           -- zlib, UTF-8
+        captured REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS fetches (
+        domain   TEXT NOT NULL,
+        url      TEXT NOT NULL,
+        price    REAL,
+        currency TEXT,
+        sku      TEXT,
+        error    TEXT,                    -- set when the live fetch failed
+        captured REAL NOT NULL,
+        PRIMARY KEY (domain, url)
+    )
+"""
+
+class ReplayMiss(LookupError):
+    """The corpus has no capture for a request or page."""
+
+def request_key(method, url, params=None) -> str:
+    """'GET https://host/path?a=1&b=2' – query + params merged and sorted."""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += list(params.items() if isinstance(params, dict) else params)
+    query = sorted((k, str(v)) for k, v in query if k not in VOLATILE_PARAMS)
+    return (f"{method.upper()} {parts.scheme}://{parts.netloc.lower()}{parts.path}"
+            f"?{urllib.parse.urlencode(query)}")
+
+def normalise(result) -> tuple:
+    """Extractor result → (price, currency, sku), as run_weekly.scrape() reads it."""
+    if len(result) == 3:
+        return tuple(result)
+    price, cur = result
+    return price, cur, ""
+
+# ── stored responses ──────────────────────────────────────────────────────
+class _Headers(dict):
+    """Case-insensitive lookups, like curl_cffi's Headers."""
+
+    def __init__(self, pairs):
+        super().__init__((k.lower(), v) for k, v in pairs)
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+class Replayed:
+    """The parts of a curl_cffi Response the extractors and helpers read."""
+
+    infos = {}
+
+    def __init__(self, url, status, headers, encoding, body):
+        self.url           = url
+        self.status_code   = status
+        self.headers       = _Headers(headers)
+        self.encoding      = encoding
+        self.content       = body
+        self.download_size = len(body)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise ReplayMiss(f"HTTP {self.status_code} captured for {self.url}")
+
+class Corpus:
+    """SQLite-backed capture store; thread-safe."""
+
+    def __init__(self, path=CORPUS_DB):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def put_response(self, key, resp) -> None:
+        row = (key, str(resp.url or ""), resp.status_code,
+               json.dumps([[k, v] for k, v in resp.headers.items()]),
+               resp.encoding, zlib.compress(resp.content, 6), time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?,?)", row)
+
+    def response(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, encoding, body FROM responses "
+                "WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return None
+        url, status, headers, encoding, body = row
+        return Replayed(url, status, json.loads(headers), encoding,
+                        zlib.decompress(body))
+
+    def put_page(self, url, html) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?,?,?)",
+                (url, zlib.compress(html.encode("utf-8"), 6), time.time()))
+
+    def page(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html FROM pages WHERE url=?", (url,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def put_fetch(self, domain, url, result=None, error=None) -> None:
+        price, cur, sku = normalise(result) if result else (None, None, None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetches VALUES (?,?,?,?,?,?,?)",
+                (domain, url, price, cur, None if sku is None else str(sku),
+                 None if error is None else str(error)[:500], time.time()))
+
+    def fetches(self) -> list:
+        """[(domain, url, price, currency, sku, error)] in capture order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT domain, url, price, currency, sku, error FROM fetches "
+                "ORDER BY captured").fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# ── transports (sessions.set_transport) ───────────────────────────────────
+class Recorder:
+    """Live pooled requests, every response saved to the corpus."""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        headers = {k: v for k, v in (headers or {}).items()
+                   if k.lower() not in VALIDATORS}
+        resp = sessions.request(method, url, params=params, headers=headers, **kwargs)
+        self.corpus.put_response(request_key(method, url, params), resp)
+        return resp
+
+class Replayer:
+    """Answers every request from the corpus; a miss raises ReplayMiss."""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def request(self, method, url, params=None, **_):
+        key  = request_key(method, url, params)
+        resp = self.corpus.response(key)
+        if resp is None:
+            raise ReplayMiss(f"not captured: {key}")
+        return resp
+
+# ── browser stand-ins (browser_pool.set_launcher) ─────────────────────────
+class RecordingDriver:
+    """A live WebDriver whose page_source reads are saved per get() URL."""
+
+    def __init__(self, driver, corpus):
+        self.driver  = driver
+        self._corpus = corpus
+        self._url    = None
+
+    def get(self, url):
+        self._url = url
+        return self.driver.get(url)
+
+    @property
+    def page_source(self):
+        html = self.driver.page_source
+        if self._url:
+            self._corpus.put_page(self._url, html)
+        return html
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+class _SwitchTo:
+    def new_window(self, kind=None):
+        pass
+
+    def window(self, handle):
+        pass
+
+class _Element:
+    id = "replay"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+class ReplayDriver:
+    """
+    Enough of a WebDriver for the Selenium extractors: get() loads the
+    captured page_source.  find_element() succeeds when the CSS selector
+    matches that page and otherwise raises TimeoutException straight
+    away, so WebDriverWait fails fast instead of polling to its timeout.
+    """
+
+    current_window_handle = "replay"
+
+    def __init__(self, corpus):
+        self._corpus     = corpus
+        self._soup       = None
+        self.switch_to   = _SwitchTo()
+        self.current_url = None
+        self.page_source = ""
+
+    def get(self, url):
+        html = self._corpus.page(url)
+        if html is None:
+            raise ReplayMiss(f"no captured page for {url}")
+        self.current_url, self.page_source, self._soup = url, html, None
+
+    def find_element(self, by, value):
+        from bs4 import BeautifulSoup
+        from selenium.common.exceptions import TimeoutException
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.page_source, "lxml")
+        if by != "css selector" or self._soup.select_one(value) is None:
+            raise TimeoutException(f"{value!r} not in captured page")
+        return _Element()
+
+    def execute_script(self, script, *args):
+        return "complete" if "readyState" in script else None
+
+    def execute(self, *args, **kwargs):           # ActionChains.perform()
+        return {"value": None}
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+# ── modes ─────────────────────────────────────────────────────────────────
+_CORPUS = None
+
+def capture(path=CORPUS_DB) -> Corpus:
+    """Record every live response / page into the corpus at `path`."""
+    global _CORPUS
+    disable()
+    corpus = _CORPUS = Corpus(path)
+    sessions.set_transport(Recorder(corpus))
+    browser_pool.set_launcher(
+        lambda headless=True: RecordingDriver(
+            browser_pool._launch_chrome(headless=headless), corpus))
+    return corpus
+
+def replay(path=CORPUS_DB) -> Corpus:
+    """Serve requests and browser pages from the corpus; no waits, no network."""
+    global _CORPUS
+    disable()
+    corpus = _CORPUS = Corpus(path)
+    sessions.set_transport(Replayer(corpus))
+    browser_pool.set_launcher(lambda headless=True: ReplayDriver(corpus))
+    helpers.set_waits(False)
+    return corpus
+
+def disable() -> None:
+    """Back to live requests, real Chrome and normal throttling."""
+    global _CORPUS
+    corpus, _CORPUS = _CORPUS, None
+    sessions.set_transport(None)
+    browser_pool.set_launcher(None)
+    helpers.set_waits(True)
+    if corpus is not None:
+        corpus.close()
+
+def _capture_one(corpus, domain, url) -> None:
+    from extractors import DOMAIN_EXTRACTOR
+    try:
+        result = DOMAIN_EXTRACTOR[domain](url)
+    except Exception as e:
+        print(f"[CAPTURE] {domain} FAIL {url}: {e}")
+        corpus.put_fetch(domain, url, error=e)
+        return
+    print(f"[CAPTURE] {domain} {normalise(result)} {url}")
+    corpus.put_fetch(domain, url, result)
+
+def capture_targets(targets="targets.csv", path=CORPUS_DB, per_retailer=None) -> int:
+    """
+    Run the extractors live over `targets` (at most `per_retailer` products
+    per retailer) with capture on; returns the number of products fetched.
+    """
+    from extractors import DOMAIN_EXTRACTOR
+    from run_weekly import group_by_product, read_targets
+    from scheduler import DomainScheduler
+
+    taken     = {}
+    scheduler = DomainScheduler()
+    corpus    = capture(path)
+    try:
+        for domain, url, _ in group_by_product(read_targets(targets)).values():
+            retailer = DOMAIN_EXTRACTOR.module_for(domain)
+            if per_retailer is not None and taken.get(retailer, 0) >= per_retailer:
+                continue
+            taken[retailer] = taken.get(retailer, 0) + 1
+            scheduler.submit(helpers.base_domain(domain), _capture_one,
+                             corpus, domain, url)
+        scheduler.run()
+    finally:
+        browser_pool.shutdown_pool()
+        disable()
+        sessions.close_all()
+    return sum(taken.values())
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Capture retailer responses for offline replay")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("capture", help="fetch targets live and record everything")
+    p.add_argument("targets", nargs="?", default="targets.csv")
+    p.add_argument("--corpus", default=CORPUS_DB)
+    p.add_argument("--per-retailer", type=int, default=None,
+                   help="cap products captured per retailer")
+    args = ap.parse_args()
+    n = capture_targets(args.targets, args.corpus, args.per_retailer)
+    print(f"[CAPTURE] {n} products → {args.corpus}")
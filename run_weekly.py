@@ -1,10 +1,30 @@
+import argparse
+import concurrent.futures
+import contextlib
 import csv
-import time
+import functools
+import logging
+import threading
 import urllib.parse
 
-from helpers       import COMPETITOR_MAP
-from price_tracker import init_db, _save          # <- 6-arg helper lives here
-from extractors    import DOMAIN_EXTRACTOR         # <- URL → (price,cur,sku)
+from helpers       import (COMPETITOR_MAP, base_domain,
+                           enable_async_engine, disable_async_engine)
+from price_tracker import init_db, _save, close_writer, writer  # <- 7-arg _save, buffered writer
+from extractors    import DOMAIN_EXTRACTOR         # <- URL → (price,cur,sku), lazy
+from scheduler     import DomainScheduler          # <- one queue per retailer
+from canonical     import product_key              # <- ASIN/TCIN/… dedup key
+import sessions                                    # <- pooled keep-alive HTTP
+import instrument                                  # <- per-fetch phase timings
+import ratelimit                                   # <- adaptive per-host pacing
+import pipeline                                    # <- parse pages in worker processes
+import archive                                     # <- content-addressed page archive
+import http_cache                                  # <- conditional GET cache
+from browser_pool  import get_pool, shutdown_pool  # <- warm Chrome for Selenium
+from refresh       import DueFilter                # <- incremental: what's due
+from jobqueue      import JobQueue, current_run_id  # <- resumable job states
+
+# retailers whose extractors drive Chrome through browser_pool
+BROWSER_DOMAINS = {"homedepot.com", "ashleyfurniture.com", "bestbuy.com"}
 
 def normalise_header(row):
     """
@@ -16,60 +36,246 @@ def normalise_header(row):
         for k, v in row.items()
     }
 
-# Ensure the SQLite table exists
-init_db()
-
-with open("targets.csv", newline="", encoding="utf-8-sig") as f:
-    reader = csv.DictReader(f)
-    for raw in reader:
-        row = normalise_header(raw)
-
-        # --- tolerant look-ups --------------------------------------------
-        art  = (
-            row.get("art_no")
-            or row.get("art no")
-            or row.get("article")
-            or next(iter(row.values()), None)
-        )
-        comp = row.get("competitor") or row.get("retailer")
-        url  = row.get("link")       or row.get("url")
-
-        if not all([art, comp, url]):
-            print(f"[SKIP] Missing column in row: {row}")
-            continue
-
-        # map 'wal-mart' → 'walmart.com', etc.
-        domain = (
-            COMPETITOR_MAP.get(comp.lower())
-            or urllib.parse.urlparse(url).netloc.lower()
-        )
-        fn = DOMAIN_EXTRACTOR.get(domain)
-        if fn is None:
-            print(f"[SKIP] No extractor for {domain}")
-            continue
-
-        # --- scrape & save -----------------------------------------------
+def read_targets(path):
+    """Yield (art_no, competitor, url, domain) for every usable CSV row."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for raw in reader:
+            row = normalise_header(raw)
+
+            # --- tolerant look-ups --------------------------------------------
+            art  = (
+                row.get("art_no")
+                or row.get("art no")
+                or row.get("article")
+                or next(iter(row.values()), None)
+            )
+            comp = row.get("competitor") or row.get("retailer")
+            url  = row.get("link")       or row.get("url")
+
+            if not all([art, comp, url]):
+                print(f"[SKIP] Missing column in row: {row}")
+                continue
+
+            # map 'wal-mart' → 'walmart.com', etc.
+            domain = (
+                COMPETITOR_MAP.get(comp.lower())
+                or urllib.parse.urlparse(url).netloc.lower()
+            )
+            if domain not in DOMAIN_EXTRACTOR:
+                print(f"[SKIP] No extractor for {domain}")
+                continue
+
+            yield art, comp, url, domain
+
+def group_by_product(targets):
+    """
+    product key → (domain, url to fetch, [(art, comp, url), …]).
+    Rows that point at the same product (same ASIN / TCIN / item id …)
+    share one fetch; the first row's URL is the one requested.
+    """
+    products = {}
+    for art, comp, url, domain in targets:
+        try:
+            key = product_key(domain, url)
+        except Exception:                       # no key → fetch row on its own
+            key = url
+        if key not in products:
+            products[key] = (domain, url, [])
+        products[key][2].append((art, comp, url))
+    return products
+
+def scrape(domain, fetch_url, rows, hold=None):
+    """
+    Fetch one product and persist it for every row that references it.
+    Returns None on success, else the exception that stopped it – or, if
+    the extractor handed its page to the parse pool, a Future of that
+    (only given `hold`, the DomainScheduler.hold of the domain's worker).
+    The fetch is timed phase by phase under an instrument.call(), and the
+    archived page its price came from is noted under an archive.fetch().
+    """
+    with instrument.call(base_domain(domain), fetch_url) as rec, archive.fetch() as page:
         try:
-            result = fn(url)
-            # normalize into (price, cur, sku)
-            if len(result) == 3:
-                price, cur, sku = result
+            fn = DOMAIN_EXTRACTOR[domain]        # first use imports the retailer
+            with instrument.phase("parse"), pipeline.deferred(hold):
+                result = fn(fetch_url)          # whatever the waits don't claim
+        except Exception as e:
+            return _failed(rec, rows, e)
+        if not isinstance(result, concurrent.futures.Future):
+            return _store(rec, page, rows, result)
+        rec.hold()                 # timed until the rows are saved
+    # still parsing: save on the pool's settle thread once the price is in
+    done = concurrent.futures.Future()
+
+    def _settled(future):
+        with instrument.reenter(rec):
+            if future.cancelled():
+                error = _failed(rec, rows, concurrent.futures.CancelledError())
+            elif future.exception() is not None:
+                error = _failed(rec, rows, future.exception())
             else:
-                price, cur       = result
-                sku              = ""      # no SKU returned
+                error = _store(rec, page, rows, future.result())
+        rec.finish()
+        done.set_result(error)
 
-            # Now call _save with exactly 6 args:
-            #   art_no, competitor, url, sku, price, currency
-            _save(art, comp, url, sku, price, cur)
+    result.add_done_callback(_settled)
+    return done
 
-            # Log to stdout
-            out = f"{art} | {comp:<9} → {price:>8} {cur}"
-            if sku:
-                out += f" | SKU: {sku}"
-            print(out)
+def _store(rec, page, rows, result):
+    """Save an extractor result for every row; None, else the error."""
+    try:
+        # normalize into (price, cur, sku)
+        if len(result) == 3:
+            price, cur, sku = result
+        else:
+            price, cur       = result
+            sku              = ""      # no SKU returned
 
-            # gentle pacing
-            time.sleep(2)
+        # inside the try: a DB error fails the job instead of leaving it leased
+        with instrument.phase("db"):
+            for art, comp, url in rows:
+                # Now call _save with exactly 7 args:
+                #   art_no, competitor, url, sku, price, currency, page hash
+                _save(art, comp, url, sku, price, cur, page.page_hash)
 
-        except Exception as e:
-            print(f"[FAIL] {art} | {comp}: {e}")
+                # Log to stdout
+                out = f"{art} | {comp:<9} → {price:>8} {cur}"
+                if sku:
+                    out += f" | SKU: {sku}"
+                print(out)
+    except Exception as e:
+        return _failed(rec, rows, e)
+
+def _failed(rec, rows, e):
+    rec.fail(e)
+    for art, comp, _ in rows:
+        print(f"[FAIL] {art} | {comp}: {e}")
+    return e
+
+def run_job(queue, key, domain, fetch_url, rows, hold=None):
+    """scrape() one queued product, recording the outcome in the job queue."""
+    queue.claim(key)
+    error = scrape(domain, fetch_url, rows, hold)
+    if isinstance(error, concurrent.futures.Future):       # parse handed off
+        error.add_done_callback(lambda f: _record(queue, key, f.result()))
+    else:
+        _record(queue, key, error)
+
+def _record(queue, key, error):
+    if error is None:
+        queue.done(key)            # persisted once the writer commits its rows
+    else:
+        queue.failed(key, error)
+
+def main(path="targets.csv", async_http=False, http_cache_on=True,
+         analytics=False, own_prices=None, incremental=False,
+         run_id=None, resume=True, parse_workers=0, archive_pages=True):
+    # Ensure the SQLite table exists
+    init_db()
+
+    if http_cache_on:              # revalidate PDPs instead of re-downloading
+        http_cache.enable()
+
+    if async_http:                 # _html/_get_json waits move onto one loop
+        enable_async_engine()
+
+    if parse_workers:              # split extractors parse off the I/O threads
+        pipeline.enable_parse_pool(parse_workers)
+
+    if archive_pages:              # every price row points at its page; reparse.py input
+        archive.enable()
+
+    scheduler = DomainScheduler()
+
+    products = group_by_product(read_targets(path))
+    if incremental:                # skip products not due per their history
+        due   = DueFilter()
+        total = len(products)
+        products = {
+            key: group for key, group in products.items()
+            if any(due.is_due(art, comp, url) for art, comp, url in group[2])
+        }
+        print(f"[INCREMENTAL] {len(products)}/{total} products due")
+
+    # --- persistent job states: a restart only picks up unfinished work ------
+    queue = JobQueue(run_id=run_id or current_run_id(daily=incremental))
+    if not resume:
+        queue.reset()
+    queue.enqueue((key, domain, fetch_url, rows)
+                  for key, (domain, fetch_url, rows) in products.items())
+    writer().after_flush.append(queue.checkpoint)
+    jobs = queue.runnable()
+    print(f"[RUN {queue.run_id}] {len(jobs)} jobs to do")
+
+    for key, domain, fetch_url, rows in jobs:
+        # --- queue on the retailer's worker; pacing is per domain ------------
+        scheduler.submit(base_domain(domain), run_job,
+                         queue, key, domain, fetch_url, rows,
+                         functools.partial(scheduler.hold, base_domain(domain)))
+
+    # start Chrome for the Selenium retailers while HTTP domains get going
+    n_browsers = len(BROWSER_DOMAINS & scheduler.pending().keys())
+    if n_browsers:
+        threading.Thread(target=get_pool().warm, args=(n_browsers,),
+                         name="browser-warmup", daemon=True).start()
+
+    try:
+        scheduler.run()
+    finally:
+        pipeline.disable_parse_pool()   # settle handed-off pages while I/O is up
+        shutdown_pool()
+        disable_async_engine()
+        archive.disable()
+        sessions.close_all()
+        http_cache.disable()
+        close_writer()             # flush the last batch of prices
+        queue.checkpoint()         # … then mark their jobs done
+        if archive_pages:          # drop pages past retention
+            with contextlib.closing(archive.Archive()) as store:
+                print(f"[ARCHIVE] {store.prune()} old pages dropped")
+        print(f"[RUN {queue.run_id}] {queue.summary()}")
+        queue.close()
+        print(ratelimit.limiter().report())
+        if instrument.save(queue.run_id):
+            print(instrument.report(queue.run_id))
+
+    if analytics:                  # NumPy only needed when asked for
+        import analytics as price_analytics
+        price_analytics.run(own_prices=own_prices)
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    ap = argparse.ArgumentParser(description="Weekly competitor price scrape")
+    ap.add_argument("targets", nargs="?", default="targets.csv")
+    ap.add_argument("--async-http", action="store_true",
+                    help="serve _html/_get_json from the asyncio engine")
+    ap.add_argument("--parse-workers", type=int, nargs="?", default=0,
+                    const=pipeline.PARSE_WORKERS, metavar="N",
+                    help="parse fetched pages in N worker processes "
+                         f"(default N: {pipeline.PARSE_WORKERS})")
+    ap.add_argument("--no-http-cache", action="store_true",
+                    help="always download full pages (skip If-None-Match)")
+    ap.add_argument("--no-archive", action="store_true",
+                    help=f"don't archive pages in {archive.ARCHIVE_DIR}/ "
+                         "(nothing for reparse.py)")
+    ap.add_argument("--incremental", action="store_true",
+                    help="only scrape products due per refresh.py intervals")
+    ap.add_argument("--run-id",
+                    help="job-queue run to resume (default: ISO week, or date "
+                         "with --incremental)")
+    ap.add_argument("--restart", action="store_true",
+                    help="forget this run's job states and start from scratch")
+    ap.add_argument("--analytics", action="store_true",
+                    help="write this week's price_summary after scraping")
+    ap.add_argument("--own-prices",
+                    help="CSV of art_no,price used for the % gap columns")
+    args = ap.parse_args()
+    main(args.targets, async_http=args.async_http,
+         http_cache_on=not args.no_http_cache,
+         analytics=args.analytics or bool(args.own_prices),
+         own_prices=args.own_prices, incremental=args.incremental,
+         run_id=args.run_id, resume=not args.restart,
+         parse_workers=args.parse_workers, archive_pages=not args.no_archive)
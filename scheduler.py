@@ -0,0 +1,73 @@
+# scheduler.py  – one work queue per retailer domain, domains run in parallel
+
+import threading
+from collections import Counter, OrderedDict, deque
+
+class DomainScheduler:
+    """
+    Fan jobs out to one worker thread per domain.
+
+    Jobs for the same domain run strictly one after another; the requests
+    they make are paced by ratelimit.py, which adapts each host's rate to
+    how it responds.  Different domains never wait on each other, so wall
+    time ≈ the busiest domain.
+    """
+
+    def __init__(self):
+        self._queues = OrderedDict()          # domain → deque[(fn, args)]
+        self._held   = Counter()              # domain → follow-ups still to come
+        self._cond   = threading.Condition()
+
+    def submit(self, domain: str, fn, *args) -> None:
+        """Queue `fn(*args)` on the worker that owns `domain`."""
+        with self._cond:
+            self._queues.setdefault(domain, deque()).append((fn, args))
+            self._cond.notify_all()
+
+    def hold(self, domain: str):
+        """
+        Keep `domain`'s worker up for one follow-up job that another thread
+        hands back later (pipeline.first_price()'s fallback pages).  Returns
+        resume(fn=None, *args): call it once, with the job to run next on
+        that worker, or with no job to just let the worker go.
+        """
+        with self._cond:
+            self._held[domain] += 1
+
+        def resume(fn=None, *args):
+            with self._cond:
+                self._held[domain] -= 1
+                if fn is not None:            # ahead of the domain's other jobs
+                    self._queues.setdefault(domain, deque()).appendleft((fn, args))
+                self._cond.notify_all()
+        return resume
+
+    def pending(self) -> dict:
+        """domain → number of queued jobs (handy for a start-up banner)."""
+        return {dom: len(q) for dom, q in self._queues.items()}
+
+    def _drain(self, domain: str, queue: deque) -> None:
+        while True:
+            with self._cond:
+                while not queue and self._held[domain]:
+                    self._cond.wait()
+                if not queue:
+                    return
+                fn, args = queue.popleft()
+            try:
+                fn(*args)
+            except Exception as e:               # a job must never kill its worker
+                print(f"[FAIL] {domain}: {e}")
+
+    def run(self) -> None:
+        """Start one thread per domain; block until every queue is empty and unheld."""
+        workers = [
+            threading.Thread(target=self._drain, args=(dom, q),
+                             name=f"scrape-{dom}", daemon=True)
+            for dom, q in self._queues.items()
+        ]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        self._queues.clear()
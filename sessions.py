@@ -0,0 +1,140 @@
+# sessions.py  – pooled curl_cffi sessions, one small pool per retailer host
+
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import curl_cffi
+
+import instrument                    # connect / network timings per fetch
+import ratelimit                     # per-host token bucket before each request
+
+POOL_SIZE   = 4      # live sessions per (host, fingerprint); caps parallel use
+MAX_HOSTS   = 32     # LRU bound on how many hosts keep warm connections
+
+# curl timers copied onto every response (resp.infos) for instrument.py
+CURL_INFOS  = (curl_cffi.CurlInfo.CONNECT_TIME, curl_cffi.CurlInfo.APPCONNECT_TIME)
+
+class SessionPool:
+    """
+    Idle `curl_cffi.requests.Session` objects for one host + fingerprint.
+
+    A session keeps its TCP/TLS connection alive between requests (and
+    negotiates HTTP/2 via ALPN when the server offers it, as Chrome does),
+    so every request after the first skips the handshake.  Sessions are not
+    shared between threads: a caller leases one, uses it, hands it back.
+    """
+
+    def __init__(self, impersonate, size=POOL_SIZE):
+        self.impersonate = impersonate
+        self._slots      = threading.BoundedSemaphore(size)
+        self._idle       = deque()
+        self._lock       = threading.Lock()
+        self.closed      = False
+
+    def _new_session(self):
+        return curl_cffi.requests.Session(impersonate=self.impersonate,
+                                          curl_infos=list(CURL_INFOS))
+
+    @contextmanager
+    def lease(self):
+        self._slots.acquire()
+        try:
+            with self._lock:
+                sess = self._idle.pop() if self._idle else None
+            if sess is None:
+                sess = self._new_session()
+            try:
+                yield sess
+            finally:
+                with self._lock:
+                    keep = not self.closed
+                    if keep:
+                        self._idle.append(sess)
+                if not keep:
+                    sess.close()
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close idle sessions now; leased ones are closed when returned."""
+        with self._lock:
+            self.closed, idle = True, list(self._idle)
+            self._idle.clear()
+        for sess in idle:
+            sess.close()
+
+class SessionRegistry:
+    """host → SessionPool, least-recently-used hosts evicted past MAX_HOSTS."""
+
+    def __init__(self, pool_size=POOL_SIZE, max_hosts=MAX_HOSTS):
+        self.pool_size = pool_size
+        self.max_hosts = max_hosts
+        self._pools    = OrderedDict()
+        self._lock     = threading.Lock()
+
+    def pool(self, url: str, impersonate="chrome124") -> SessionPool:
+        key = (urlparse(url).netloc.lower(), impersonate)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = SessionPool(impersonate, self.pool_size)
+            self._pools.move_to_end(key)
+            evicted = []
+            while len(self._pools) > self.max_hosts:
+                evicted.append(self._pools.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+        return pool
+
+    def request(self, method: str, url: str, impersonate="chrome124", **kwargs):
+        limiter = ratelimit.limiter()
+        limiter.wait(url)
+        with instrument.phase("network"):
+            with self.pool(url, impersonate).lease() as sess:
+                resp = sess.request(method, url, **kwargs)
+        account(resp)
+        limiter.feedback(url, resp)
+        return resp
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+
+_REGISTRY  = SessionRegistry()
+_TRANSPORT = None      # replay.py's recording / replaying stand-in, if any
+
+def set_transport(transport) -> None:
+    """
+    Send get() through `transport.request(method, url, impersonate=…, **kw)`
+    instead of the pool (replay.py); None goes back to live requests.
+    """
+    global _TRANSPORT
+    _TRANSPORT = transport
+
+def transport():
+    return _TRANSPORT
+
+def account(resp) -> None:
+    """Report a response's size and handshake time to instrument.py."""
+    infos = getattr(resp, "infos", None) or {}
+    instrument.response(getattr(resp, "download_size", 0) or len(resp.content),
+                        max(infos.values(), default=0.0))
+
+def get(url: str, impersonate="chrome124", **kwargs):
+    """Drop-in for `curl_cffi.requests.get` that reuses a pooled session."""
+    if _TRANSPORT is not None:
+        return _TRANSPORT.request("GET", url, impersonate=impersonate, **kwargs)
+    return _REGISTRY.request("GET", url, impersonate=impersonate, **kwargs)
+
+def request(method: str, url: str, impersonate="chrome124", **kwargs):
+    """A live pooled request, whatever transport is set."""
+    return _REGISTRY.request(method, url, impersonate=impersonate, **kwargs)
+
+def close_all() -> None:
+    """Close every pooled connection (end of run)."""
+    _REGISTRY.close()
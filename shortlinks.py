@@ -0,0 +1,102 @@
+# shortlinks.py  – persistent short-link → final URL cache (a.co/d/…, amzn.to/…)
+#
+# Short links cost an extra redirect round trip per run and hide the ASIN
+# from the URL.  Resolve each one once, remember where it lands, and only
+# re-check after REFRESH_AGE.  Only a redirect chain that ends off the
+# shortener hosts is remembered; a failed fetch, bot check or 4xx is
+# retried on the next run instead of poisoning the key for months.
+
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+import curl_cffi
+
+import http_cache
+import sessions
+from helpers import HEADERS
+from urlnorm import is_short                             # re-exported
+
+REFRESH_AGE = 90 * 24 * 3600          # short links almost never move
+MAX_HOPS    = 5
+
+def _follow(url: str):
+    """
+    Walk Location headers while we're still on a short-link host.  Returns
+    the first URL off the shortener hosts, or None if the chain stopped
+    short of one (request error, 200 interstitial, 403 / 429, too many hops).
+    """
+    for _ in range(MAX_HOPS):
+        try:
+            resp = sessions.get(url, headers=HEADERS, allow_redirects=False, timeout=20)
+        except curl_cffi.requests.RequestsError:
+            return None
+        location = resp.headers.get("Location")
+        if resp.status_code not in (301, 302, 303, 307, 308) or not location:
+            return None
+        url = urllib.parse.urljoin(url, location)
+        if not is_short(url):
+            return url
+    return None
+
+class ShortLinkCache:
+    """SQLite table `short_links` living next to the HTTP cache."""
+
+    def __init__(self, path=None, refresh_age=REFRESH_AGE):
+        self.refresh_age = refresh_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or http_cache.CACHE_DB, timeout=30,
+                                     check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS short_links (
+                short_url   TEXT PRIMARY KEY,
+                final_url   TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def cached(self, url: str):
+        """Final URL from the cache if known and not due a refresh, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, resolved_at FROM short_links WHERE short_url=?",
+                (url,)).fetchone()
+        if row and time.time() - row[1] < self.refresh_age:
+            return row[0]
+        return None
+
+    def resolve(self, url: str) -> str:
+        """
+        Final URL for `url`, following (and caching) redirects if needed;
+        `url` itself, uncached, when it could not be resolved this time.
+        """
+        final = self.cached(url)
+        if final is None:
+            final = _follow(url)
+            if final is None:
+                return url
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO short_links VALUES (?,?,?)",
+                    (url, final, time.time()))
+        return final
+
+_CACHE      = None
+_CACHE_LOCK = threading.Lock()
+
+def _cache() -> ShortLinkCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ShortLinkCache()
+        return _CACHE
+
+def cached(url: str):
+    """Cache-only lookup (no network); None for unknown or non-short URLs."""
+    return _cache().cached(url) if is_short(url) else None
+
+def resolve(url: str) -> str:
+    """`url` itself unless it's a short link, else where it redirects to."""
+    return _cache().resolve(url) if is_short(url) else url
@@ -0,0 +1,45 @@
+# urlnorm.py  – pure URL normalising helpers (stdlib only)
+#
+# Shared by the DB layer (price_tracker, refresh) and the fetch layer
+# (canonical, shortlinks); keep it free of network / project imports so
+# DB-only tools don't pull in curl_cffi.
+
+import urllib.parse
+
+# query parameters that only track the click, never select the product
+TRACKING_PARAMS = {
+    "ref", "ref_", "crid", "dib", "dib_tag", "qid", "sr", "sprefix",
+    "keywords", "content-id", "sp_csd", "cv_ct_cx", "sbo",
+    "gclid", "gclsrc", "gbraid", "wbraid", "fbclid", "msclkid",
+    "athbdg", "adsredirect", "irgwc", "clkid", "afid", "veh",
+    "wmlspartner", "sourceid",
+}
+
+SHORT_HOSTS = {"a.co", "amzn.to", "amzn.eu", "bit.ly", "tinyurl.com"}
+
+def _is_tracking(param: str) -> bool:
+    p = param.lower()
+    return (
+        p in TRACKING_PARAMS
+        or p.startswith(("utm_", "wl", "pd_rd", "pf_rd", "_br_"))
+    )
+
+def strip_tracking(url: str) -> str:
+    """Drop the fragment and click-tracking query params, keep the rest."""
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(k)
+    ]
+    return urllib.parse.urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path,
+        urllib.parse.urlencode(query),
+        "",
+    ))
+
+def is_short(url: str) -> bool:
+    """True for a.co/…, amzn.to/… and other known link shorteners."""
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    return host.removeprefix("www.") in SHORT_HOSTS